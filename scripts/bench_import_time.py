@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the API process (serverless cold start).
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter,
+reports the cumulative import time and the slowest modules, and exits
+non-zero when a budget is exceeded so it can guard against regressions.
+
+Usage:
+    python scripts/bench_import_time.py                     # src.api.server
+    python scripts/bench_import_time.py --max-ms 800 --top 15
+    python scripts/bench_import_time.py --module src.timeline.kg_snapshot
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must never be imported just to serve the timeline API
+FORBIDDEN = ("chromadb", "networkx", "src.timeline.event_data", "src.timeline.fol_evidence")
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module: str, runs: int = 3) -> tuple[float, list[tuple[float, str]]]:
+    """Return (best cumulative ms, [(cumulative ms, module), ...]) for *module*."""
+    best_total = float("inf")
+    best_rows: list[tuple[float, str]] = []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+        )
+        rows = []
+        total = 0.0
+        for line in proc.stderr.splitlines():
+            m = _LINE.match(line)
+            if not m:
+                continue
+            cumulative_ms = int(m.group(2)) / 1000
+            name = m.group(4)
+            rows.append((cumulative_ms, name))
+            if name == module:
+                total = cumulative_ms
+        if total < best_total:
+            best_total, best_rows = total, rows
+    return best_total, best_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="src.api.server")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if import takes longer")
+    args = parser.parse_args()
+
+    total, rows = measure(args.module, args.runs)
+    print(f"import {args.module}: {total:.1f} ms (best of {args.runs})\n")
+    for ms, name in sorted(rows, reverse=True)[: args.top]:
+        print(f"  {ms:9.1f} ms  {name}")
+
+    failed = False
+    imported = {name for _, name in rows}
+    leaked = [m for m in FORBIDDEN if m in imported]
+    if leaked:
+        print(f"\n✗ eagerly imported: {', '.join(leaked)}")
+        failed = True
+    if args.max_ms is not None and total > args.max_ms:
+        print(f"\n✗ over budget: {total:.1f} ms > {args.max_ms:.1f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
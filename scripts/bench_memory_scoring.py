@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Re-ranking benchmark for memory search: per-item scoring vs the batch kernel.
+
+The per-item path is what search() used to do for every result row: parse
+created_at with datetime.fromisoformat, map significance to alpha and call
+compute_combined_score + compute_temporal_weight. The batch path reads the
+precomputed created_at_ts / decay_alpha metadata and scores the whole batch
+with one numpy pass (src.memory.retrieval.score_items).
+
+Usage:
+    python scripts/bench_memory_scoring.py
+    python scripts/bench_memory_scoring.py --rows 20 200 2000 --repeat 200
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.memory.retrieval import score_items  # noqa: E402
+from src.memory.temporal_decay import (  # noqa: E402
+    compute_combined_score,
+    compute_temporal_weight,
+    effective_alpha,
+    to_epoch,
+)
+
+
+def make_rows(n: int, now: datetime, seed: int = 7) -> list[dict]:
+    """Result rows shaped like BrandVectorStore search output."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        created = now - timedelta(days=rng.uniform(0, 1500))
+        significance = rng.choice((0.2, 0.5, 0.5, 0.8, 1.0))
+        rows.append({
+            "id": f"note-{i}",
+            "similarity": rng.random(),
+            "metadata": {
+                "created_at": created.isoformat(),
+                "created_at_ts": to_epoch(created),
+                "significance": significance,
+                "decay_alpha": effective_alpha(significance),
+            },
+        })
+    return rows
+
+
+def score_per_item(rows: list[dict], now: datetime) -> None:
+    for item in rows:
+        created_str = item.get("metadata", {}).get("created_at", "")
+        try:
+            created_at = datetime.fromisoformat(created_str) if created_str else datetime.utcnow()
+        except ValueError:
+            created_at = datetime.utcnow()
+        similarity = item.get("similarity", 0.5)
+        significance = item.get("metadata", {}).get("significance", 0.5)
+        item["combined_score"] = compute_combined_score(similarity, created_at, now=now, significance=significance)
+        item["temporal_weight"] = compute_temporal_weight(created_at, now=now, significance=significance)
+
+
+def time_per_call(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(3):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / repeat)
+    return best * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    now = datetime(2026, 1, 1)
+    now_ts = to_epoch(now)
+    print(f"{'rows':>8} {'per-item µs':>12} {'batch µs':>10} {'speedup':>8} {'max |Δ|':>9}")
+    for n in args.rows:
+        legacy, batch = make_rows(n, now), make_rows(n, now)
+        per_item = time_per_call(lambda: score_per_item(legacy, now), args.repeat)
+        kernel = time_per_call(lambda: score_items(batch, now_ts, with_weight=True), args.repeat)
+        drift = max(abs(a["combined_score"] - b["combined_score"]) for a, b in zip(legacy, batch))
+        print(f"{n:>8} {per_item:>12.1f} {kernel:>10.1f} {per_item / kernel:>7.1f}x {drift:>9.1e}")
+
+
+if __name__ == "__main__":
+    main()
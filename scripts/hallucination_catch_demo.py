@@ -22,8 +22,7 @@ async def main():
     print("=" * 60)
 
     # 1. Setup Memory with seed data
-    print("
-[1/3] Initializing Brand Memory...")
+    print("\n[1/3] Initializing Brand Memory...")
     triplets, brand_notes, _ = load_all()
     memory = BrandMemorySystem()
     for t in triplets:
@@ -34,8 +33,7 @@ async def main():
     # Saero -> Zero sugar soju
 
     # 2. Simulate a Hallucination from Creative Director
-    print("
-[2/3] Simulating 'Creative Director' output with hallucination...")
+    print("\n[2/3] Simulating 'Creative Director' output with hallucination...")
     # The Creative Director accidentally suggests Zero Sugar for Chamisul (which is Saero's identity)
     hallucinated_content = """
     Campaign Idea: Chamisul 'Pure Zero' Series
@@ -48,11 +46,13 @@ async def main():
     print("-" * 40)
 
     # 3. Brand Guard Intervention
-    print("
-[3/3] Running Brand Guard validation...")
+    print("\n[3/3] Running Brand Guard validation...")
 
     # In a real pipeline, the agent would use the tool. We'll simulate the tool's check.
-    from src.agents.brand_guard.tools import check_ingredient_accuracy
+    import src.agents.brand_guard.tools as guard_tools
+    from src.agents.brand_guard.tools import check_ingredient_accuracy, find_concept_owner
+
+    guard_tools._get_memory._instance = memory
 
     # We'll call the tool logic directly to show what it finds in memory
     validation_results = check_ingredient_accuracy(
@@ -61,23 +61,19 @@ async def main():
         claimed_ingredients="Zero sugar, purified water"
     )
 
-    print("
-  >>> Brand Guard Knowledge Retrieval Results:")
+    print("\n  >>> Brand Guard Knowledge Retrieval Results:")
     known = validation_results["known_ingredients"]
     if not known:
         print("    [!] ALERT: No record of 'Zero Sugar' associated with brand 'Chamisul' in Knowledge Graph.")
 
-        # Look up where Zero Sugar actually belongs
-        # We search the whole KG for Zero Sugar
-        all_triplets = []
-        for b in ["chamisul", "chumchurum", "saero"]:
-             all_triplets.extend(memory.graph_store.get_neighbors(b, "Zero Sugar", max_hops=1))
-
-        real_owner = "Saero" # We know this from seed data
-        print(f"    [!] KG CORRECTION: 'Zero Sugar' is a key identity of 'Saero'.")
+        # Look up where Zero Sugar actually belongs: one search across every brand
+        ownership = find_concept_owner("Zero Sugar")
+        real_owner = (ownership["owner"] or "unknown").capitalize()
+        print(f"    [!] KG CORRECTION: 'Zero Sugar' is a key identity of '{real_owner}'.")
+        for match in ownership["top_matches"][:3]:
+            print(f"        [{match['brand']}] {match['fact']}")
 
-    print("
-[CONCLUSION]")
+    print("\n[CONCLUSION]")
     print("The system effectively used the Knowledge Graph to verify that 'Zero Sugar'")
     print("is NOT part of Chamisul's identity, preventing a cross-brand hallucination.")
     print("=" * 60)
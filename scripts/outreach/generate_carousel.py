@@ -13,7 +13,7 @@ import io
 
 from creators import all_creators, Creator
 from brand import BRAND, brand_summary, brand_visual_prompt
-from text_overlay import overlay_text_on_image, create_title_card
+from text_overlay import RenderJob, TextLayer, render_jobs, create_title_card
 from product_reference import get_product_description
 
 OUTPUT_DIR = pathlib.Path(__file__).parent / "output" / "carousel"
@@ -119,13 +119,30 @@ def generate_image(prompt: str, output_path: pathlib.Path) -> pathlib.Path | Non
     return None
 
 
-def generate_carousel(creator: Creator):
-    """Generate all carousel slides for a creator."""
+TEXT_POSITIONS = {
+    "bottom": (60, 900),
+    "center": (60, 460),
+    "top": (60, 60),
+}
+
+
+def prepare_carousel(
+    creator: Creator,
+    extra_formats: tuple[str, ...] = (),
+) -> tuple[list[pathlib.Path], list[RenderJob]]:
+    """Generate the base images of a creator's carousel.
+
+    Returns the slide paths in order and the text-overlay RenderJobs that
+    still have to run before those paths exist, so a caller can render many
+    creators at once with render_jobs(). *extra_formats* (e.g. ("jpeg",
+    "webp")) also writes optimized copies next to each overlaid slide.
+    """
     creator_dir = OUTPUT_DIR / creator.handle
     creator_dir.mkdir(parents=True, exist_ok=True)
 
     slides = build_slide_prompts(creator)
     generated = []
+    jobs: list[RenderJob] = []
 
     for i, slide in enumerate(slides, 1):
         print(f"    Slide {i}/{len(slides)} ({slide['name']})...", end=" ", flush=True)
@@ -141,37 +158,45 @@ def generate_carousel(creator: Creator):
 
         # Add text overlay if specified
         if slide.get("text_overlay"):
-            pos_map = {
-                "bottom": (60, 900),
-                "center": (60, 460),
-                "top": (60, 60),
-            }
-            pos = pos_map.get(slide.get("text_position", "bottom"), (60, 900))
-            overlay_text_on_image(
-                raw_path,
-                slide["text_overlay"],
-                position=pos,
-                font_size=42,
-                max_width=960,
-                output_path=final_path,
-            )
-            print(f"✓ (with text)")
+            pos = TEXT_POSITIONS.get(slide.get("text_position", "bottom"), (60, 900))
+            jobs.append(RenderJob(
+                image=raw_path,
+                layers=[TextLayer(slide["text_overlay"], position=pos, font_size=42, max_width=960)],
+                output=final_path,
+                extra_formats=extra_formats,
+            ))
+            print(f"✓ (text queued)")
         else:
             raw_path.rename(final_path)
             print("✓")
 
         generated.append(final_path)
 
-    return generated
+    return generated, jobs
+
+
+def generate_carousel(creator: Creator, extra_formats: tuple[str, ...] = ()) -> list[pathlib.Path]:
+    """Generate all carousel slides for a creator; returns once every slide is written."""
+    slides, jobs = prepare_carousel(creator, extra_formats)
+    render_jobs(jobs)
+    return slides
 
 
 def main():
     print("Generating carousel images...\n")
+    planned: list[tuple[Creator, list[pathlib.Path]]] = []
+    queue: list[RenderJob] = []
     for creator in all_creators():
         print(f"  @{creator.handle} ({creator.name_kr}):")
-        slides = generate_carousel(creator)
-        print(f"    → {len(slides)} slides generated\n")
+        slides, jobs = prepare_carousel(creator)
+        planned.append((creator, slides))
+        queue.extend(jobs)
+
+    print(f"\nRendering {len(queue)} text overlays across all cores...")
+    render_jobs(queue)
 
+    for creator, slides in planned:
+        print(f"  @{creator.handle}: {len(slides)} slides generated")
     print(f"Done! Carousels saved to {OUTPUT_DIR}/")
 
 
@@ -15,6 +15,11 @@ import sys
 import pathlib
 import io
 import json
+import hashlib
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 from google import genai
 from google.genai import types
@@ -28,6 +33,7 @@ from product_reference import get_product_description
 BASE_DIR = pathlib.Path(__file__).parent
 OUTPUT_DIR = BASE_DIR / "output" / "creator_content"
 REFERENCE_DIR = BASE_DIR / "output" / "reference"
+IMAGE_CACHE_DIR = REFERENCE_DIR / "_cache"
 
 client = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
 
@@ -38,6 +44,7 @@ CH_USER = "default"
 CH_DB = "default"
 
 STORIKA_CDN = "https://cdn.storika.ai"
+DOWNLOAD_WORKERS = 16
 
 GEMINI_MODEL = "gemini-3-flash-preview"
 IMAGEN_MODEL = "imagen-4.0-generate-001"
@@ -47,80 +54,204 @@ IMAGEN_MODEL = "imagen-4.0-generate-001"
 # ClickHouse helpers
 # ---------------------------------------------------------------------------
 
-def query_clickhouse(sql: str) -> list[dict]:
-    """Execute a SELECT against ClickHouse HTTP API."""
+_http: requests.Session | None = None
+
+
+def http_session() -> requests.Session:
+    """Shared pooled HTTP session for ClickHouse queries and image downloads."""
+    global _http
+    if _http is None:
+        _http = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=DOWNLOAD_WORKERS)
+        _http.mount("https://", adapter)
+        _http.mount("http://", adapter)
+        _http.headers["User-Agent"] = "Mozilla/5.0"
+    return _http
+
+
+def _ch_array(values: list[str]) -> str:
+    """Format a list of strings as a ClickHouse Array(String) query parameter."""
+    escaped = (v.replace("\\", "\\\\").replace("'", "\\'") for v in values)
+    return "[" + ",".join(f"'{v}'" for v in escaped) + "]"
+
+
+def query_clickhouse(sql: str, params: dict[str, str] | None = None) -> list[dict]:
+    """Execute a SELECT against ClickHouse HTTP API.
+
+    Values are bound server-side: reference them in *sql* as ``{name:Type}``
+    and pass the formatted value as ``params[name]``.
+    """
     if not CH_HOST or not CH_PASSWORD:
         return []
+    query_params = {"query": sql, "default_format": "JSON", "database": CH_DB}
+    for name, value in (params or {}).items():
+        query_params[f"param_{name}"] = value
     try:
-        r = requests.post(
+        r = http_session().post(
             f"https://{CH_HOST}:8443/",
-            params={"query": sql, "default_format": "JSON", "database": CH_DB},
+            params=query_params,
             auth=(CH_USER, CH_PASSWORD),
             timeout=30,
         )
         if r.status_code == 200:
             return r.json().get("data", [])
+        print(f"    ClickHouse error: HTTP {r.status_code} {r.text[:200]}")
     except Exception as e:
         print(f"    ClickHouse error: {e}")
     return []
 
 
-def fetch_profile_id(handle: str) -> str | None:
+def fetch_profile_ids(handles: list[str]) -> dict[str, str]:
+    """Resolve {handle: profile_id} for all handles in a single query."""
+    if not handles:
+        return {}
     rows = query_clickhouse(
-        f"SELECT profile_id FROM apify_instagram_profiles "
-        f"WHERE username = '{handle}' LIMIT 1"
+        "SELECT username, any(profile_id) AS profile_id "
+        "FROM apify_instagram_profiles "
+        "WHERE username IN {handles:Array(String)} "
+        "GROUP BY username",
+        {"handles": _ch_array(handles)},
     )
-    return rows[0]["profile_id"] if rows else None
+    return {row["username"]: row["profile_id"] for row in rows if row.get("profile_id")}
 
 
-def fetch_top_posts(handle: str, limit: int = 6) -> list[dict]:
-    return query_clickhouse(
-        f"SELECT DISTINCT post_id, short_code, display_url, type, likes_count "
-        f"FROM apify_instagram_posts "
-        f"WHERE owner_username = '{handle}' AND type IN ('Image', 'Sidecar') "
-        f"ORDER BY likes_count DESC LIMIT {limit}"
+def fetch_top_posts_batch(handles: list[str], limit: int = 6) -> dict[str, list[dict]]:
+    """Return {handle: [post, ...]} with each creator's top posts by likes, in one query."""
+    if not handles:
+        return {}
+    rows = query_clickhouse(
+        "SELECT DISTINCT owner_username, post_id, short_code, display_url, type, likes_count "
+        "FROM apify_instagram_posts "
+        "WHERE owner_username IN {handles:Array(String)} AND type IN ('Image', 'Sidecar') "
+        "ORDER BY owner_username, likes_count DESC "
+        "LIMIT {limit:UInt32} BY owner_username",
+        {"handles": _ch_array(handles), "limit": str(limit)},
     )
+    posts: dict[str, list[dict]] = {h: [] for h in handles}
+    for row in rows:
+        posts.setdefault(row["owner_username"], []).append(row)
+    return posts
+
+
+def fetch_profile_id(handle: str) -> str | None:
+    return fetch_profile_ids([handle]).get(handle)
+
+
+def fetch_top_posts(handle: str, limit: int = 6) -> list[dict]:
+    return fetch_top_posts_batch([handle], limit=limit).get(handle, [])
 
 
 # ---------------------------------------------------------------------------
 # Image download + cache
 # ---------------------------------------------------------------------------
 
-def download_image(url: str, output_path: pathlib.Path) -> bool:
+def _cached_blob(url: str) -> pathlib.Path | None:
+    """Return the cached blob previously downloaded from *url*, if any."""
+    ref = IMAGE_CACHE_DIR / "urls" / hashlib.sha256(url.encode()).hexdigest()
     try:
-        r = requests.get(url, timeout=15, headers={"User-Agent": "Mozilla/5.0"})
-        if r.status_code == 200 and len(r.content) > 500:
-            output_path.write_bytes(r.content)
-            return True
-    except Exception:
-        pass
-    return False
+        blob = IMAGE_CACHE_DIR / "blobs" / ref.read_text().strip()
+    except OSError:
+        return None
+    return blob if blob.exists() else None
 
 
-def ensure_reference_images(creator: Creator) -> list[pathlib.Path]:
-    """Get cached reference images, downloading from ClickHouse/CDN if needed."""
-    ref_dir = REFERENCE_DIR / creator.handle
-    ref_dir.mkdir(parents=True, exist_ok=True)
+def _atomic_write(path: pathlib.Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _store_blob(url: str, content: bytes) -> pathlib.Path:
+    """Store *content* under its sha256 and record the url → digest mapping."""
+    digest = hashlib.sha256(content).hexdigest()
+    blob = IMAGE_CACHE_DIR / "blobs" / digest
+    if not blob.exists():
+        _atomic_write(blob, content)
+    _atomic_write(IMAGE_CACHE_DIR / "urls" / hashlib.sha256(url.encode()).hexdigest(), digest.encode())
+    return blob
+
+
+def _materialize(blob: pathlib.Path, output_path: pathlib.Path) -> None:
+    if output_path.exists():
+        output_path.unlink()
+    try:
+        os.link(blob, output_path)
+    except OSError:
+        shutil.copyfile(blob, output_path)
+
 
+def download_image(url: str, output_path: pathlib.Path) -> bool:
+    """Download *url* to *output_path* through the content-addressed cache."""
+    blob = _cached_blob(url)
+    if blob is None:
+        try:
+            r = http_session().get(url, timeout=15)
+        except Exception:
+            return False
+        if r.status_code != 200 or len(r.content) <= 500:
+            return False
+        blob = _store_blob(url, r.content)
+    _materialize(blob, output_path)
+    return True
+
+
+def download_images(jobs: list[tuple[str, pathlib.Path]], max_workers: int = DOWNLOAD_WORKERS) -> int:
+    """Download (url, output_path) pairs concurrently. Returns the number saved."""
+    if not jobs:
+        return 0
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+        return sum(pool.map(lambda job: download_image(*job), jobs))
+
+
+def _valid_image(path: pathlib.Path) -> bool:
+    return path.exists() and path.stat().st_size > 500
+
+
+def prefetch_reference_images(creators: list[Creator]) -> None:
+    """Fetch profile + post references for many creators with batched queries.
+
+    Issues at most one profile query and one post query regardless of the
+    number of creators, then downloads every missing image concurrently.
+    """
+    need_profile: list[str] = []
+    need_posts: list[str] = []
+    for creator in creators:
+        ref_dir = REFERENCE_DIR / creator.handle
+        ref_dir.mkdir(parents=True, exist_ok=True)
+        if not _valid_image(ref_dir / "profile.jpg"):
+            need_profile.append(creator.handle)
+        # Instagram CDN URLs expire, but try anyway
+        if sum(1 for f in ref_dir.glob("post_*.jpg") if f.stat().st_size > 500) < 2:
+            need_posts.append(creator.handle)
+
+    jobs: list[tuple[str, pathlib.Path]] = []
     # Profile pic — Storika CDN is permanent
-    profile_path = ref_dir / "profile.jpg"
-    if not profile_path.exists() or profile_path.stat().st_size < 500:
-        profile_id = fetch_profile_id(creator.handle)
-        if profile_id:
-            download_image(f"{STORIKA_CDN}/profile/{profile_id}.jpeg", profile_path)
-
-    # Post images — Instagram CDN URLs expire, but try anyway
-    cached_posts = [f for f in sorted(ref_dir.glob("post_*.jpg")) if f.stat().st_size > 500]
-    if len(cached_posts) < 2:
-        posts = fetch_top_posts(creator.handle, limit=6)
+    for handle, profile_id in fetch_profile_ids(need_profile).items():
+        jobs.append((f"{STORIKA_CDN}/profile/{profile_id}.jpeg", REFERENCE_DIR / handle / "profile.jpg"))
+    for handle, posts in fetch_top_posts_batch(need_posts, limit=6).items():
         for i, post in enumerate(posts):
-            post_path = ref_dir / f"post_{i}.jpg"
+            post_path = REFERENCE_DIR / handle / f"post_{i}.jpg"
             if not post_path.exists() and post.get("display_url"):
-                download_image(post["display_url"], post_path)
+                jobs.append((post["display_url"], post_path))
+
+    download_images(jobs)
+
+
+def ensure_reference_images(creator: Creator, prefetch: bool = True) -> list[pathlib.Path]:
+    """Get cached reference images, downloading from ClickHouse/CDN if needed.
+
+    Pass ``prefetch=False`` when ``prefetch_reference_images`` already ran for
+    this creator as part of a batch.
+    """
+    ref_dir = REFERENCE_DIR / creator.handle
+    if prefetch:
+        prefetch_reference_images([creator])
 
     # Collect all valid images
     images = []
-    if profile_path.exists() and profile_path.stat().st_size > 500:
+    profile_path = ref_dir / "profile.jpg"
+    if _valid_image(profile_path):
         images.append(profile_path)
     for f in sorted(ref_dir.glob("post_*.jpg")):
         if f.stat().st_size > 500:
@@ -275,7 +406,7 @@ def generate_imagen(prompt: str, output_path: pathlib.Path) -> pathlib.Path | No
 # Main pipeline
 # ---------------------------------------------------------------------------
 
-def generate_creator_content(creator: Creator) -> list[pathlib.Path]:
+def generate_creator_content(creator: Creator, prefetched: bool = False) -> list[pathlib.Path]:
     """Full pipeline for a single creator."""
     creator_dir = OUTPUT_DIR / creator.handle
     creator_dir.mkdir(parents=True, exist_ok=True)
@@ -284,7 +415,7 @@ def generate_creator_content(creator: Creator) -> list[pathlib.Path]:
 
     # Step 1: Get reference images from DB
     print(f"    [DB] Fetching reference images...", end=" ", flush=True)
-    ref_images = ensure_reference_images(creator)
+    ref_images = ensure_reference_images(creator, prefetch=not prefetched)
     if ref_images:
         print(f"✓ ({len(ref_images)} found)")
     else:
@@ -371,8 +502,12 @@ def main():
         results = generate_creator_content(creator)
         print(f"\n  → {len(results)} content pieces generated")
     else:
-        for creator in all_creators():
-            results = generate_creator_content(creator)
+        creators = all_creators()
+        print(f"\n  [DB] Prefetching references for {len(creators)} creators...", end=" ", flush=True)
+        prefetch_reference_images(creators)
+        print("✓")
+        for creator in creators:
+            results = generate_creator_content(creator, prefetched=True)
             print(f"    → {len(results)} content pieces\n")
 
     print(f"\nDone! Content saved to {OUTPUT_DIR}/")
@@ -12,6 +12,7 @@ import os
 import io
 import pathlib
 import json
+import subprocess
 import time
 from google import genai
 from google.genai import types
@@ -20,6 +21,7 @@ from PIL import Image
 from creators import all_creators, Creator
 from brand import BRAND, brand_visual_prompt
 from product_reference import get_product_description
+from text_overlay import CaptionSpec, overlay_captions_batch
 
 BASE_DIR = pathlib.Path(__file__).parent
 OUTPUT_DIR = BASE_DIR / "output" / "video"
@@ -239,6 +241,15 @@ def generate_video(prompt: str, image_path: pathlib.Path, output_path: pathlib.P
     return None
 
 
+def build_video_captions(creator: Creator) -> list[CaptionSpec]:
+    """Timed captions burned into the finished clip in a single encode."""
+    return [
+        CaptionSpec(f"@{creator.handle}", position="top", start_time=0.0, duration=2.5, font_size=44),
+        CaptionSpec("깨끗한 한 잔, 참이슬", position="center", start_time=2.5, duration=3.0, font_size=56),
+        CaptionSpec("#참이슬 #광고", position="bottom", start_time=5.5, font_size=40, style="minimal"),
+    ]
+
+
 def _create_placeholder(prompt: str, image_path: pathlib.Path, output_path: pathlib.Path):
     """Create a text placeholder when video API is unavailable."""
     desc_path = output_path.with_suffix(".txt")
@@ -298,9 +309,21 @@ def main():
     print("  Step 2: Veo 3.1 (image-to-video animation)")
     print("=" * 60)
 
+    caption_jobs = []
     for creator in all_creators():
         print(f"\n  @{creator.handle} ({creator.name_kr}):")
-        generate_creator_video(creator)
+        result = generate_creator_video(creator)
+        if result and result.suffix == ".mp4":
+            captioned = result.with_name(f"{result.stem}_captioned.mp4")
+            caption_jobs.append((result, build_video_captions(creator), captioned))
+
+    if caption_jobs:
+        print(f"\n  [FFmpeg] Burning captions into {len(caption_jobs)} videos...", end=" ", flush=True)
+        try:
+            overlay_captions_batch(caption_jobs, max_workers=2)
+            print("✓")
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"FAILED ({e})")
 
     print(f"\nDone! Videos saved to {OUTPUT_DIR}/")
 
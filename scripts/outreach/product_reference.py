@@ -8,12 +8,19 @@ that can be injected into Imagen 4 and Veo 3.1 prompts for accurate product depi
 import os
 import pathlib
 import json
+import hashlib
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from google import genai
 from google.genai import types
 
 BASE_DIR = pathlib.Path(__file__).parent
 PRODUCTS_DIR = BASE_DIR / "assets" / "products"
-CACHE_PATH = PRODUCTS_DIR / "_analysis_cache.json"
+CACHE_DB_PATH = PRODUCTS_DIR / "_analysis_cache.sqlite3"
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp"}
 
 client = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
 GEMINI_MODEL = "gemini-3-flash-preview"
@@ -32,38 +39,74 @@ Provide a JSON response with these fields:
 
 Return ONLY valid JSON, no markdown fences."""
 
-# In-memory cache for the session
-_cache: dict[str, dict] = {}
-
-
-def _load_cache() -> dict[str, dict]:
-    """Load cached analysis from disk."""
-    global _cache
-    if _cache:
-        return _cache
-    if CACHE_PATH.exists():
-        try:
-            _cache = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
-            _cache = {}
-    return _cache
-
-
-def _save_cache():
-    """Persist cache to disk."""
-    CACHE_PATH.write_text(
-        json.dumps(_cache, ensure_ascii=False, indent=2), encoding="utf-8"
+# Analyses are keyed by the sha256 of the image bytes, so replacing a bottle
+# image under the same filename triggers a fresh analysis. SQLite gives us
+# atomic commits and cross-process locking for parallel generator scripts.
+# The old filename-keyed _analysis_cache.json is not imported: its entries
+# cannot be tied to the bytes currently on disk, so images are re-analyzed.
+_cache: dict[str, dict] = {}  # digest → analysis (in-memory, per session)
+_digests: dict[tuple[str, int, int], str] = {}  # (path, mtime_ns, size) → digest
+_db_lock = threading.Lock()
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(CACHE_DB_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS analysis ("
+        " digest TEXT PRIMARY KEY, filename TEXT, result TEXT NOT NULL, created_at REAL NOT NULL)"
     )
-
-
-def analyze_product_image(image_path: pathlib.Path) -> dict:
-    """Use Gemini 3 Flash to analyze a product bottle image and return structured description."""
-    cache = _load_cache()
-    cache_key = image_path.name
-
-    if cache_key in cache:
-        return cache[cache_key]
-
+    return conn
+
+
+def _image_digest(image_path: pathlib.Path) -> str:
+    """sha256 of the image content, memoized on (path, mtime, size)."""
+    st = image_path.stat()
+    key = (str(image_path.resolve()), st.st_mtime_ns, st.st_size)
+    if key not in _digests:
+        _digests[key] = hashlib.sha256(image_path.read_bytes()).hexdigest()
+    return _digests[key]
+
+
+def _lookup(digests: list[str]) -> dict[str, dict]:
+    """Return cached analyses for *digests* (memory first, then SQLite)."""
+    found = {d: _cache[d] for d in digests if d in _cache}
+    missing = [d for d in digests if d not in found]
+    if missing:
+        with _db_lock:
+            conn = _connect()
+            try:
+                placeholders = ",".join("?" * len(missing))
+                rows = conn.execute(
+                    f"SELECT digest, result FROM analysis WHERE digest IN ({placeholders})", missing
+                ).fetchall()
+            finally:
+                conn.close()
+        for digest, result in rows:
+            _cache[digest] = found[digest] = json.loads(result)
+    return found
+
+
+def _store(entries: list[tuple[str, str, dict]]) -> None:
+    """Persist (digest, filename, analysis) rows in a single transaction."""
+    if not entries:
+        return
+    with _db_lock:
+        conn = _connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO analysis VALUES (?, ?, ?, ?)",
+                    [(d, name, json.dumps(r, ensure_ascii=False), time.time()) for d, name, r in entries],
+                )
+        finally:
+            conn.close()
+    for digest, _, result in entries:
+        _cache[digest] = result
+
+
+def _request_analysis(image_path: pathlib.Path) -> dict:
+    """Call Gemini 3 Flash on a single product image (no caching)."""
     img_bytes = image_path.read_bytes()
     mime = "image/jpeg" if image_path.suffix in (".jpg", ".jpeg") else "image/png"
 
@@ -80,20 +123,63 @@ def analyze_product_image(image_path: pathlib.Path) -> dict:
     )
 
     try:
-        result = json.loads(response.text)
+        return json.loads(response.text)
     except (json.JSONDecodeError, AttributeError):
         text = response.text or ""
         start = text.find("{")
         end = text.rfind("}") + 1
         if start >= 0 and end > start:
-            result = json.loads(text[start:end])
-        else:
-            result = {"prompt_description": "a premium Korean alcohol bottle"}
+            return json.loads(text[start:end])
+        return {"prompt_description": "a premium Korean alcohol bottle"}
+
+
+def analyze_product_image(image_path: pathlib.Path) -> dict:
+    """Use Gemini 3 Flash to analyze a product bottle image and return structured description."""
+    return warm_cache([image_path], max_workers=1)[image_path]
 
-    # Cache the result
-    _cache[cache_key] = result
-    _save_cache()
-    return result
+
+def warm_cache(image_paths: list[pathlib.Path], max_workers: int = 4) -> dict[pathlib.Path, dict]:
+    """Ensure every image has a cached analysis, analyzing misses concurrently.
+
+    Returns {image_path: analysis}. Identical images (same content hash) are
+    analyzed once; all new results are committed in one transaction.
+    """
+    digests = {path: _image_digest(path) for path in image_paths}
+    cached = _lookup(sorted(set(digests.values())))
+
+    todo: dict[str, pathlib.Path] = {}
+    for path, digest in digests.items():
+        if digest not in cached:
+            todo.setdefault(digest, path)
+
+    if todo:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(todo)))) as pool:
+            results = list(pool.map(_request_analysis, todo.values()))
+        entries = [(d, p.name, r) for (d, p), r in zip(todo.items(), results)]
+        _store(entries)
+        cached.update({d: r for d, _, r in entries})
+
+    return {path: cached[digest] for path, digest in digests.items()}
+
+
+def list_product_images() -> list[pathlib.Path]:
+    """All product images in assets/products (files starting with '_' are skipped)."""
+    return sorted(
+        f for f in PRODUCTS_DIR.iterdir()
+        if f.is_file() and not f.name.startswith("_") and f.suffix.lower() in IMAGE_SUFFIXES
+    )
+
+
+def analyze_all_products(max_workers: int = 4) -> dict[pathlib.Path, dict]:
+    """Analyze every image in assets/products concurrently (cached by content hash)."""
+    return warm_cache(list_product_images(), max_workers=max_workers)
+
+
+_PRODUCT_FILES = {
+    "boksoondoga": PRODUCTS_DIR / "boksoondoga.png",
+    "soju": PRODUCTS_DIR / "soju.jpeg",
+    "johnnie_walker": PRODUCTS_DIR / "johnnie_walker.jpeg",
+}
 
 
 def get_product_description(product_key: str) -> str:
@@ -105,13 +191,7 @@ def get_product_description(product_key: str) -> str:
     Returns:
         Detailed product description string for use in image/video generation prompts.
     """
-    file_map = {
-        "boksoondoga": PRODUCTS_DIR / "boksoondoga.png",
-        "soju": PRODUCTS_DIR / "soju.jpeg",
-        "johnnie_walker": PRODUCTS_DIR / "johnnie_walker.jpeg",
-    }
-
-    image_path = file_map.get(product_key)
+    image_path = _PRODUCT_FILES.get(product_key)
     if not image_path or not image_path.exists():
         # Fallback to generic description
         fallback = {
@@ -127,6 +207,7 @@ def get_product_description(product_key: str) -> str:
 
 def get_all_product_descriptions() -> dict[str, str]:
     """Analyze all product images and return descriptions keyed by product name."""
+    warm_cache([p for p in _PRODUCT_FILES.values() if p.exists()])
     return {
         key: get_product_description(key)
         for key in ("boksoondoga", "soju", "johnnie_walker")
@@ -135,14 +216,8 @@ def get_all_product_descriptions() -> dict[str, str]:
 
 if __name__ == "__main__":
     print("Analyzing product images with Gemini 3 Flash...\n")
-    for key in ("boksoondoga", "soju", "johnnie_walker"):
-        path = PRODUCTS_DIR / ("boksoondoga.png" if key == "boksoondoga"
-                               else f"{key}.jpeg")
-        if path.exists():
-            print(f"  {key}:")
-            analysis = analyze_product_image(path)
-            for k, v in analysis.items():
-                print(f"    {k}: {v}")
-            print()
-        else:
-            print(f"  {key}: image not found at {path}")
+    for path, analysis in analyze_all_products().items():
+        print(f"  {path.stem}:")
+        for k, v in analysis.items():
+            print(f"    {k}: {v}")
+        print()
@@ -1,11 +1,21 @@
 """
 Shared utility for adding Korean text overlays on images and video.
 - overlay_text_on_image(): Pillow-based text rendering
+- render_jobs(): batch text rendering across a process pool
 - overlay_text_on_video(): FFmpeg drawtext filter
+- overlay_captions_on_video(): many timed captions in a single FFmpeg encode
 """
 
+import os
 import pathlib
 import subprocess
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
 from PIL import Image, ImageDraw, ImageFont
 
 FONT_DIR = pathlib.Path(__file__).parent / "assets" / "fonts"
@@ -14,8 +24,9 @@ REGULAR_FONT = FONT_DIR / "Pretendard-Regular.otf"
 SEMIBOLD_FONT = FONT_DIR / "Pretendard-SemiBold.otf"
 
 
+@lru_cache(maxsize=64)
 def get_font(size: int = 48, weight: str = "bold") -> ImageFont.FreeTypeFont:
-    """Load Pretendard font at given size."""
+    """Load Pretendard font at given size (cached per weight/size)."""
     font_map = {"bold": DEFAULT_FONT, "regular": REGULAR_FONT, "semibold": SEMIBOLD_FONT}
     font_path = font_map.get(weight, DEFAULT_FONT)
     return ImageFont.truetype(str(font_path), size)
@@ -48,81 +59,197 @@ def overlay_text_on_image(
         max_width: If set, wraps text to fit within this pixel width
     """
     img_path = pathlib.Path(img_path)
-    img = Image.open(img_path).convert("RGBA")
-    overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
-    font = get_font(font_size, font_weight)
-
-    # Simple word wrapping for Korean text
-    if max_width:
-        lines = _wrap_text(draw, text, font, max_width)
-        text = "\n".join(lines)
-
-    draw.text(
-        position,
-        text,
-        font=font,
-        fill=color,
-        stroke_fill=stroke_color,
+    if output_path is None:
+        output_path = img_path.parent / f"{img_path.stem}_text{img_path.suffix}"
+    layer = TextLayer(
+        text=text,
+        position=position,
+        font_size=font_size,
+        font_weight=font_weight,
+        color=color,
+        stroke_color=stroke_color,
         stroke_width=stroke_width,
+        max_width=max_width,
     )
+    img = Image.open(img_path).convert("RGBA")
+    return _save_outputs(_render_layers(img, [layer]), pathlib.Path(output_path))[0]
 
-    result = Image.alpha_composite(img, overlay)
-    if output_path is None:
-        output_path = img_path.parent / f"{img_path.stem}_text{img_path.suffix}"
-    output_path = pathlib.Path(output_path)
-    result.save(output_path)
-    return output_path
 
+# ---------------------------------------------------------------------------
+# Batch rendering
+# ---------------------------------------------------------------------------
+
+@dataclass
+class TextLayer:
+    """One block of text drawn onto an image (same options as overlay_text_on_image)."""
+
+    text: str
+    position: tuple[int, int] = (50, 50)
+    font_size: int = 48
+    font_weight: str = "bold"
+    color: str = "#FFFFFF"
+    stroke_color: str = "#000000"
+    stroke_width: int = 2
+    max_width: int | None = None
+
+
+@dataclass
+class RenderJob:
+    """Render *layers* onto *image* and save to *output*.
+
+    *extra_formats* writes optimized siblings next to the main output,
+    e.g. ("jpeg", "webp") → slide.jpg + slide.webp alongside slide.png.
+    """
+
+    image: pathlib.Path
+    layers: list[TextLayer]
+    output: pathlib.Path
+    extra_formats: tuple[str, ...] = ()
+
+
+_FORMAT_OPTIONS = {
+    "png": (".png", {"optimize": True}),
+    "jpeg": (".jpg", {"quality": 88, "optimize": True, "progressive": True}),
+    "webp": (".webp", {"quality": 85, "method": 4}),
+}
+
+
+def _render_layers(base: Image.Image, layers: list[TextLayer]) -> Image.Image:
+    """Composite text layers onto a copy of an RGBA image.
+
+    Each layer is drawn on an overlay sized to its own bounding box rather
+    than the whole frame, then alpha-composited in place.
+    """
+    img = base.copy()
+    for layer in layers:
+        font = get_font(layer.font_size, layer.font_weight)
+        text = "\n".join(_wrap_text(layer.text, font, layer.max_width)) if layer.max_width else layer.text
+        probe = ImageDraw.Draw(img)
+        left, top, right, bottom = probe.textbbox(
+            layer.position, text, font=font, stroke_width=layer.stroke_width
+        )
+        left, top = max(int(left), 0), max(int(top), 0)
+        right, bottom = min(int(right) + 1, img.width), min(int(bottom) + 1, img.height)
+        if right <= left or bottom <= top:
+            continue
+        overlay = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+        ImageDraw.Draw(overlay).text(
+            (layer.position[0] - left, layer.position[1] - top),
+            text,
+            font=font,
+            fill=layer.color,
+            stroke_fill=layer.stroke_color,
+            stroke_width=layer.stroke_width,
+        )
+        img.alpha_composite(overlay, dest=(left, top))
+    return img
+
+
+def _save_outputs(img: Image.Image, output: pathlib.Path, extra_formats: tuple[str, ...] = ()) -> list[pathlib.Path]:
+    """Save *img* to *output* plus any optimized sibling formats."""
+    img.save(output)
+    saved = [output]
+    for fmt in extra_formats:
+        suffix, options = _FORMAT_OPTIONS[fmt]
+        path = output.with_suffix(suffix)
+        if path == output:
+            continue
+        (img.convert("RGB") if fmt == "jpeg" else img).save(path, fmt.upper(), **options)
+        saved.append(path)
+    return saved
+
+
+def _render_group(jobs: list[RenderJob]) -> list[pathlib.Path]:
+    """Render every job sharing one base image, decoding that image once."""
+    with Image.open(jobs[0].image) as src:
+        base = src.convert("RGBA")
+    saved: list[pathlib.Path] = []
+    for job in jobs:
+        saved.extend(_save_outputs(_render_layers(base, job.layers), job.output, job.extra_formats))
+    return saved
+
+
+def render_jobs(jobs: list[RenderJob], max_workers: int | None = None) -> list[pathlib.Path]:
+    """Render a manifest of overlay jobs across a process pool.
+
+    Jobs are grouped by base image so each image is decoded once no matter
+    how many outputs use it. Returns every written path.
+    """
+    groups: dict[pathlib.Path, list[RenderJob]] = defaultdict(list)
+    for job in jobs:
+        groups[pathlib.Path(job.image)].append(job)
+    if not groups:
+        return []
 
-def _wrap_text(draw: ImageDraw.Draw, text: str, font: ImageFont.FreeTypeFont, max_width: int) -> list[str]:
-    """Wrap text (including Korean) to fit within max_width pixels."""
+    workers = min(max_workers or os.cpu_count() or 1, len(groups))
+    if workers == 1:
+        return [p for group in groups.values() for p in _render_group(group)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_render_group, groups.values())
+        return [p for saved in results for p in saved]
+
+
+@lru_cache(maxsize=16384)
+def _advance(font: ImageFont.FreeTypeFont, char: str) -> float:
+    """Horizontal advance of a single glyph (fonts are cached, so identity is stable)."""
+    return font.getlength(char)
+
+
+def _wrap_text(text: str, font: ImageFont.FreeTypeFont, max_width: int) -> list[str]:
+    """Wrap text (including Korean) to fit within max_width pixels.
+
+    Breaks per character like before, but measures each glyph advance once
+    and binary-searches the prefix sums for each break instead of
+    re-measuring the growing line. Summed advances ignore kerning, so each
+    chosen break is then checked against the measured line and nudged.
+    Explicit newlines are hard breaks; blank lines are kept.
+    """
     lines = []
-    current_line = ""
-    for char in text:
-        test_line = current_line + char
-        bbox = draw.textbbox((0, 0), test_line, font=font)
-        if bbox[2] - bbox[0] > max_width and current_line:
-            lines.append(current_line)
-            current_line = char
-        else:
-            current_line = test_line
-    if current_line:
-        lines.append(current_line)
+    for paragraph in text.split("\n"):
+        if not paragraph:
+            lines.append("")
+            continue
+        prefix = [0.0, *accumulate(_advance(font, ch) for ch in paragraph)]
+        start = 0
+        while start < len(paragraph):
+            # Farthest end whose width fits; always take at least one char.
+            end = bisect_right(prefix, prefix[start] + max_width, lo=start + 1) - 1
+            end = max(end, start + 1)
+            while end > start + 1 and font.getlength(paragraph[start:end]) > max_width:
+                end -= 1
+            while end < len(paragraph) and font.getlength(paragraph[start:end + 1]) <= max_width:
+                end += 1
+            lines.append(paragraph[start:end])
+            start = end
     return lines
 
 
-def overlay_text_on_video(
-    video_path: str | pathlib.Path,
-    text: str,
-    output_path: str | pathlib.Path | None = None,
-    font_size: int = 48,
-    color: str = "white",
-    position: str = "center",
-    start_time: float = 0.0,
-    duration: float | None = None,
-    style: str = "tiktok",
-) -> pathlib.Path:
-    """Add text overlay to video using FFmpeg drawtext.
+@dataclass
+class CaptionSpec:
+    """One timed caption for overlay_captions_on_video()."""
 
-    Args:
-        video_path: Input video path
-        text: Text to overlay
-        output_path: Where to save (defaults to {input}_text.mp4)
-        font_size: Font size
-        color: FFmpeg color name or hex
-        position: "center", "top", "bottom", or custom "x=100:y=200"
-        start_time: When text appears (seconds)
-        duration: How long text shows (None = entire video)
-        style: "tiktok" for bold with shadow, "minimal" for clean
-    """
-    video_path = pathlib.Path(video_path)
-    if output_path is None:
-        output_path = video_path.parent / f"{video_path.stem}_text{video_path.suffix}"
-    output_path = pathlib.Path(output_path)
+    text: str
+    position: str = "center"
+    start_time: float = 0.0
+    duration: float | None = None
+    font_size: int = 48
+    color: str = "white"
+    style: str = "tiktok"
 
+
+# libx264 settings only (no GPU encoders), so output is the same on any host.
+ENCODE_PRESETS: dict[str, list[str]] = {
+    "fast": ["-c:v", "libx264", "-preset", "veryfast", "-crf", "23"],
+    "balanced": ["-c:v", "libx264", "-preset", "medium", "-crf", "20"],
+    "quality": ["-c:v", "libx264", "-preset", "slow", "-crf", "18"],
+}
+
+
+def _drawtext_filter(caption: CaptionSpec) -> str:
+    """Build a single FFmpeg drawtext filter for *caption*."""
     font_path = str(DEFAULT_FONT).replace(":", "\\:")
-    escaped_text = text.replace("'", "'\\''").replace(":", "\\:")
+    escaped_text = caption.text.replace("'", "'\\''").replace(":", "\\:")
 
     # Position mapping
     pos_map = {
@@ -130,42 +257,128 @@ def overlay_text_on_video(
         "top": "x=(w-text_w)/2:y=80",
         "bottom": "x=(w-text_w)/2:y=h-text_h-120",
     }
-    pos = pos_map.get(position, position)
+    pos = pos_map.get(caption.position, caption.position)
 
     # Style-specific filter
-    if style == "tiktok":
+    if caption.style == "tiktok":
         drawtext = (
             f"drawtext=fontfile='{font_path}':text='{escaped_text}':"
-            f"fontsize={font_size}:fontcolor={color}:{pos}:"
+            f"fontsize={caption.font_size}:fontcolor={caption.color}:{pos}:"
             f"borderw=3:bordercolor=black:shadowcolor=black@0.5:shadowx=2:shadowy=2"
         )
     else:
         drawtext = (
             f"drawtext=fontfile='{font_path}':text='{escaped_text}':"
-            f"fontsize={font_size}:fontcolor={color}:{pos}"
+            f"fontsize={caption.font_size}:fontcolor={caption.color}:{pos}"
         )
 
     # Time constraints
-    if start_time > 0 or duration:
+    if caption.start_time > 0 or caption.duration:
         enable_parts = []
-        if start_time > 0:
-            enable_parts.append(f"gte(t,{start_time})")
-        if duration:
-            enable_parts.append(f"lte(t,{start_time + duration})")
+        if caption.start_time > 0:
+            enable_parts.append(f"gte(t,{caption.start_time})")
+        if caption.duration:
+            enable_parts.append(f"lte(t,{caption.start_time + caption.duration})")
         enable = "*".join(enable_parts)
         drawtext += f":enable='{enable}'"
 
-    cmd = [
-        "ffmpeg", "-y", "-i", str(video_path),
-        "-vf", drawtext,
-        "-codec:a", "copy",
-        str(output_path),
-    ]
+    return drawtext
+
+
+def overlay_captions_on_video(
+    video_path: str | pathlib.Path,
+    captions: list[CaptionSpec],
+    output_path: str | pathlib.Path | None = None,
+    preset: str | None = "fast",
+    threads: int | None = None,
+) -> pathlib.Path:
+    """Burn all *captions* into a video with one chained filter graph and a single encode.
+
+    Args:
+        video_path: Input video path
+        captions: Timed captions; drawn in order, so later ones sit on top
+        output_path: Where to save (defaults to {input}_text.mp4)
+        preset: Key of ENCODE_PRESETS, or None for FFmpeg's default encoder settings
+        threads: Encoder thread cap (used when several encodes run at once)
+    """
+    video_path = pathlib.Path(video_path)
+    if output_path is None:
+        output_path = video_path.parent / f"{video_path.stem}_text{video_path.suffix}"
+    output_path = pathlib.Path(output_path)
+
+    cmd = ["ffmpeg", "-y", "-i", str(video_path)]
+    if captions:
+        cmd += ["-vf", ",".join(_drawtext_filter(c) for c in captions)]
+    if preset:
+        cmd += ENCODE_PRESETS[preset] + ["-pix_fmt", "yuv420p", "-movflags", "+faststart"]
+    if threads:
+        cmd += ["-threads", str(threads)]
+    cmd += ["-codec:a", "copy", str(output_path)]
 
     subprocess.run(cmd, check=True, capture_output=True)
     return output_path
 
 
+def overlay_captions_batch(
+    jobs: list[tuple[pathlib.Path, list[CaptionSpec], pathlib.Path | None]],
+    max_workers: int = 2,
+    preset: str | None = "fast",
+) -> list[pathlib.Path]:
+    """Run overlay_captions_on_video() for many (video, captions, output) jobs.
+
+    At most *max_workers* FFmpeg processes run at once and the CPU is split
+    between them, so a large batch does not oversubscribe the machine.
+    """
+    if not jobs:
+        return []
+    workers = max(1, min(max_workers, len(jobs)))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(overlay_captions_on_video, video, captions, output, preset, threads)
+            for video, captions, output in jobs
+        ]
+        return [f.result() for f in futures]
+
+
+def overlay_text_on_video(
+    video_path: str | pathlib.Path,
+    text: str,
+    output_path: str | pathlib.Path | None = None,
+    font_size: int = 48,
+    color: str = "white",
+    position: str = "center",
+    start_time: float = 0.0,
+    duration: float | None = None,
+    style: str = "tiktok",
+) -> pathlib.Path:
+    """Add text overlay to video using FFmpeg drawtext.
+
+    For several captions use overlay_captions_on_video(), which encodes once.
+
+    Args:
+        video_path: Input video path
+        text: Text to overlay
+        output_path: Where to save (defaults to {input}_text.mp4)
+        font_size: Font size
+        color: FFmpeg color name or hex
+        position: "center", "top", "bottom", or custom "x=100:y=200"
+        start_time: When text appears (seconds)
+        duration: How long text shows (None = entire video)
+        style: "tiktok" for bold with shadow, "minimal" for clean
+    """
+    caption = CaptionSpec(
+        text=text,
+        position=position,
+        start_time=start_time,
+        duration=duration,
+        font_size=font_size,
+        color=color,
+        style=style,
+    )
+    return overlay_captions_on_video(video_path, [caption], output_path, preset=None)
+
+
 def create_title_card(
     text: str,
     width: int = 1080,
@@ -193,7 +406,44 @@ def create_title_card(
     return output_path
 
 
+def benchmark_wrap(repeat: int = 20, font_size: int = 42, max_width: int = 960) -> dict[str, float]:
+    """Compare the wrapper against the old per-character textbbox loop."""
+    caption = (
+        "제주의 깨끗한 물과 직접 재배한 쌀로 빚은 복순도가 손막걸리, "
+        "자연 발효의 섬세한 기포가 살아있는 프리미엄 스파클링 막걸리를 지금 만나보세요. "
+    ) * 8
+    font = get_font(font_size, "bold")
+    draw = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+
+    def textbbox_wrap() -> list[str]:
+        lines, current_line = [], ""
+        for char in caption:
+            test_line = current_line + char
+            bbox = draw.textbbox((0, 0), test_line, font=font)
+            if bbox[2] - bbox[0] > max_width and current_line:
+                lines.append(current_line)
+                current_line = char
+            else:
+                current_line = test_line
+        return lines + [current_line] if current_line else lines
+
+    timings = {}
+    for name, fn in (("textbbox", textbbox_wrap), ("prefix_sum", lambda: _wrap_text(caption, font, max_width))):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        timings[name] = (time.perf_counter() - t0) / repeat * 1000
+    return timings
+
+
 if __name__ == "__main__":
+    import sys
+
+    if "--bench" in sys.argv:
+        for name, ms in benchmark_wrap().items():
+            print(f"  {name:>10}: {ms:8.2f} ms / caption")
+        sys.exit()
+
     # Quick test
     card = create_title_card(
         "복순도가 × 크리에이터",
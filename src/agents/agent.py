@@ -13,6 +13,8 @@ from src.agents.brand_guard.agent import create_brand_guard
 from src.agents.creative_director.agent import content_pipeline
 
 from .root_tools import (
+    record_model_response,
+    record_user_message,
     set_active_brand_tool,
     get_memory_context_tool,
     save_to_memory_tool,
@@ -54,4 +56,7 @@ root_agent = LlmAgent(
         get_brand_stats_tool,
     ],
     sub_agents=[trend_pipeline, content_pipeline, create_brand_guard("standalone_brand_guard")],
+    # Feed the conversation into the SessionManager so its rolling summary is maintained
+    before_agent_callback=record_user_message,
+    after_model_callback=record_model_response,
 )
@@ -2,7 +2,12 @@
 
 from google.adk.agents import LlmAgent
 
-from .tools import check_brand_alignment_tool, check_ingredient_accuracy_tool, verify_creator_brand_fit_tool
+from .tools import (
+    check_brand_alignment_tool,
+    check_ingredient_accuracy_tool,
+    find_concept_owner_tool,
+    verify_creator_brand_fit_tool,
+)
 
 _BRAND_GUARD_INSTRUCTION = (
     "You are the Brand Guard for Korean Liquor brands. Your role is to ensure all models (Celebrities & Creators) "
@@ -22,6 +27,8 @@ _BRAND_GUARD_INSTRUCTION = (
     "### Execution Guidelines:\n"
     "- If a model is proposed, call `verify_creator_brand_fit` (for both types, mapping celebrity data to the tool's structure).\n"
     "- Provide a detailed score breakdown (Affinity, Visual, Risk).\n"
+    "- If content attributes a product concept or claim to a brand, call `find_concept_owner` to confirm "
+    "the concept actually belongs to that brand and not a sibling brand.\n"
     "- Use PASS/FAIL clearly. Be ruthless in protecting the brand's premium image."
 )
 
@@ -32,7 +39,12 @@ def create_brand_guard(name: str = "brand_guard") -> LlmAgent:
         name=name,
         model="gemini-3-flash-preview",
         instruction=_BRAND_GUARD_INSTRUCTION,
-        tools=[check_brand_alignment_tool, check_ingredient_accuracy_tool, verify_creator_brand_fit_tool],
+        tools=[
+            check_brand_alignment_tool,
+            check_ingredient_accuracy_tool,
+            find_concept_owner_tool,
+            verify_creator_brand_fit_tool,
+        ],
         description="Strictly validates celebrities and creators against brand identity and history",
     )
 
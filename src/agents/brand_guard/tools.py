@@ -2,11 +2,23 @@
 
 from __future__ import annotations
 
+import re
+
 from google.adk.tools import FunctionTool
 
+from src.config import VALID_BRAND_NAMESPACES
 from src.memory.memory_system import BrandMemorySystem
 
 
+# Predicates stating that a brand does NOT have something ("does_not_use",
+# "NO_SUGAR", "AVOIDS") must not count as evidence of ownership.
+_NEGATED_PREDICATE = re.compile(r"(^|_)(not|no|never|without|lacks?|avoids?)(_|$)", re.IGNORECASE)
+
+
+def _is_negated(predicate: str | None) -> bool:
+    return bool(predicate) and bool(_NEGATED_PREDICATE.search(predicate.replace(" ", "_")))
+
+
 def _get_memory() -> BrandMemorySystem:
     if not hasattr(_get_memory, "_instance"):
         _get_memory._instance = BrandMemorySystem()
@@ -94,6 +106,52 @@ def check_ingredient_accuracy(brand_namespace: str, product_name: str, claimed_i
     }
 
 
+def find_concept_owner(concept: str) -> dict:
+    """Find which brand a product concept, ingredient or claim belongs to.
+
+    Use this to catch cross-brand mix-ups (e.g. "Zero Sugar" attributed to
+    the wrong brand).
+
+    Args:
+        concept: The concept to look up (e.g. "Zero Sugar", "bamboo charcoal").
+
+    Returns:
+        Dict with the owning brand, graph facts per brand and the top matching facts.
+    """
+    memory = _get_memory()
+    brands = sorted(VALID_BRAND_NAMESPACES)
+
+    # One multi-brand vector pass plus direct graph lookups
+    matches = memory.search_many([concept], brands, k=10, kind="triplets")[0]
+    graph_facts = memory.graph_store.get_neighbors_many(brands, concept, max_hops=1)
+
+    # Rank brands by their best affirmative vector match; brands with a
+    # direct affirmative graph fact about the concept take precedence.
+    best: dict[str, float] = {}
+    for m in matches:
+        if not _is_negated(m.get("metadata", {}).get("predicate")):
+            best[m["brand"]] = max(best.get(m["brand"], 0.0), m.get("combined_score", 0.0))
+    direct = {
+        brand: sum(not _is_negated(t.predicate) for t in facts)
+        for brand, facts in graph_facts.items()
+    }
+    candidates = [b for b, n in direct.items() if n] or list(best)
+    owner = max(candidates, key=lambda b: (best.get(b, 0.0), direct.get(b, 0))) if candidates else None
+
+    return {
+        "concept": concept,
+        "owner": owner,
+        "graph_facts": {
+            brand: [{"subject": t.subject, "predicate": t.predicate, "object": t.object} for t in facts]
+            for brand, facts in graph_facts.items()
+        },
+        "top_matches": [
+            {"brand": m["brand"], "fact": m.get("document", ""), "score": m.get("combined_score", 0)}
+            for m in matches[:5]
+        ],
+    }
+
+
 def verify_creator_brand_fit(brand_namespace: str, creator_data: dict) -> dict:
     """Strictly verify creator-brand fit using a composite score and risk check.
 
@@ -164,4 +222,5 @@ def verify_creator_brand_fit(brand_namespace: str, creator_data: dict) -> dict:
 
 check_brand_alignment_tool = FunctionTool(check_brand_alignment)
 check_ingredient_accuracy_tool = FunctionTool(check_ingredient_accuracy)
+find_concept_owner_tool = FunctionTool(find_concept_owner)
 verify_creator_brand_fit_tool = FunctionTool(verify_creator_brand_fit)
@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
-from google.adk.tools import FunctionTool
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_response import LlmResponse
+from google.adk.tools import FunctionTool, ToolContext
 
 from src.memory.memory_system import BrandMemorySystem
-from src.memory.session_manager import SessionManager
+from src.memory.semantic_cache import SemanticCache
+from src.memory.session_manager import DEFAULT_USER, SessionManager
 from src.config import VALID_BRAND_NAMESPACES
 
-# Shared instances
+# Shared instances (one SessionManager, sessions keyed per conversation)
 _memory: BrandMemorySystem | None = None
 _session: SessionManager | None = None
+_context_cache = SemanticCache()  # get_memory_context results, keyed on the store's write_version
 
 
 def _get_memory() -> BrandMemorySystem:
@@ -27,13 +31,27 @@ def _get_session() -> SessionManager:
     return _session
 
 
+def _conversation(tool_context: CallbackContext | None) -> tuple[str, str | None]:
+    """(user id, session id) of the calling ADK conversation; defaults outside a runner."""
+    session = getattr(getattr(tool_context, "_invocation_context", None), "session", None)
+    if session is None:
+        return DEFAULT_USER, None
+    return session.user_id, session.id
+
+
+def get_memory_system() -> BrandMemorySystem:
+    """The memory system the root tools read and write."""
+    return _get_memory()
+
+
 def set_memory_system(memory: BrandMemorySystem) -> None:
     """Allow external code to inject a pre-loaded memory system."""
     global _memory
     _memory = memory
+    _context_cache.clear()
 
 
-def set_active_brand(brand_namespace: str) -> dict:
+def set_active_brand(brand_namespace: str, tool_context: ToolContext | None = None) -> dict:
     """Set the active brand for the current session.
 
     Args:
@@ -46,8 +64,8 @@ def set_active_brand(brand_namespace: str) -> dict:
     if brand not in VALID_BRAND_NAMESPACES:
         return {"error": f"Invalid brand. Choose from: {', '.join(VALID_BRAND_NAMESPACES)}"}
 
-    session = _get_session()
-    session.active_brand = brand
+    user_id, session_id = _conversation(tool_context)
+    _get_session().set_active_brand(brand, user_id=user_id, session_id=session_id)
     memory = _get_memory()
     stats = memory.stats(brand)
 
@@ -58,7 +76,7 @@ def set_active_brand(brand_namespace: str) -> dict:
     }
 
 
-def get_memory_context(query: str, brand_namespace: str = "") -> dict:
+def get_memory_context(query: str, brand_namespace: str = "", tool_context: ToolContext | None = None) -> dict:
     """Retrieve relevant memory context for a query.
 
     Args:
@@ -68,14 +86,21 @@ def get_memory_context(query: str, brand_namespace: str = "") -> dict:
     Returns:
         Memory context with notes, triplets, and industry data.
     """
-    session = _get_session()
-    brand = brand_namespace.lower() if brand_namespace else (session.active_brand or "chamisul")
+    user_id, session_id = _conversation(tool_context)
+    active = _get_session().get_active_brand(user_id=user_id, session_id=session_id)
+    brand = brand_namespace.lower() if brand_namespace else (active or "chamisul")
 
     if brand not in VALID_BRAND_NAMESPACES:
         return {"error": f"Invalid brand. Choose from: {', '.join(VALID_BRAND_NAMESPACES)}"}
 
     memory = _get_memory()
-    context = memory.build_context_injection(query, brand)
+    embedding = memory.vector_store.embed([query])[0]
+    version = memory.vector_store.write_version(brand)
+    context = _context_cache.lookup(brand, embedding, version=version)
+    if context is None:
+        generation = _context_cache.generation(brand)
+        context = memory.build_context_injection(embedding, brand)
+        _context_cache.store(brand, embedding, context, generation=generation, version=version)
 
     return {
         "brand": brand,
@@ -112,6 +137,7 @@ def save_to_memory(
         category=category,
         tags=tag_list,
     )
+    _context_cache.invalidate(brand)
 
     return {
         "status": "saved",
@@ -139,6 +165,31 @@ def get_brand_stats(brand_namespace: str = "") -> dict:
     return {brand: memory.stats(brand) for brand in VALID_BRAND_NAMESPACES}
 
 
+# ── Conversation callbacks ────────────────────────────────────
+
+def _text(content) -> str:
+    parts = getattr(content, "parts", None) or []
+    return "\n".join(p.text for p in parts if getattr(p, "text", None))
+
+
+async def record_user_message(callback_context: CallbackContext) -> None:
+    """before_agent_callback: buffer the user's turn in the session (and roll its summary)."""
+    text = _text(callback_context.user_content)
+    if text:
+        user_id, session_id = _conversation(callback_context)
+        await _get_session().record_message("user", text, user_id=user_id, session_id=session_id)
+    return None
+
+
+async def record_model_response(callback_context: CallbackContext, llm_response: LlmResponse) -> None:
+    """after_model_callback: buffer the agent's final (non-partial) text replies."""
+    text = _text(llm_response.content)
+    if text and not llm_response.partial:
+        user_id, session_id = _conversation(callback_context)
+        await _get_session().record_message("assistant", text, user_id=user_id, session_id=session_id)
+    return None
+
+
 set_active_brand_tool = FunctionTool(set_active_brand)
 get_memory_context_tool = FunctionTool(get_memory_context)
 save_to_memory_tool = FunctionTool(save_to_memory)
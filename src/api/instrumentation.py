@@ -0,0 +1,105 @@
+"""Request metrics middleware, /metrics endpoint and an opt-in sampling profiler.
+
+MetricsMiddleware is plain ASGI (no body buffering), so streaming responses
+keep streaming. It records latency and sent bytes per route template
+(``/api/kg/snapshot``, not the concrete URL) to keep label cardinality
+bounded. The histograms live in the process that served the request:
+with several uvicorn workers each ``/metrics`` scrape reports only the
+worker that answered it, so scrape every worker (or run one) for totals.
+
+``GET /debug/profile?seconds=5`` samples every thread's Python stack and
+returns collapsed stacks ("folded" format) for flamegraph.pl, speedscope or
+inferno. It is disabled unless ENABLE_PROFILER is truthy ("1", "true").
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import env_flag
+from src.metrics import REQUEST_LATENCY, RESPONSE_SIZE, render_prometheus
+
+router = APIRouter(tags=["instrumentation"])
+
+_profile_lock = threading.Lock()
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            label = getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.observe(time.perf_counter() - start, scope["method"], label, str(status))
+            RESPONSE_SIZE.observe(size, scope["method"], label)
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus text for this worker process only (see module docstring)."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+def _sample_stacks(seconds: float, interval: float) -> Counter[str]:
+    """Collapsed stacks of all other threads, sampled every *interval* seconds."""
+    own = threading.get_ident()
+    stacks: Counter[str] = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            stacks[";".join(reversed(names))] += 1
+        time.sleep(interval)
+    return stacks
+
+
+@router.get("/debug/profile", include_in_schema=False)
+def profile(
+    seconds: float = Query(5.0, gt=0, le=60),
+    interval: float = Query(0.005, ge=0.001, le=1.0),
+):
+    """Sample the running process and return folded stacks for a flamegraph."""
+    if not env_flag("ENABLE_PROFILER"):
+        raise HTTPException(status_code=404, detail="Profiler disabled (set ENABLE_PROFILER=1)")
+    if not _profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    try:
+        stacks = _sample_stacks(seconds, interval)
+    finally:
+        _profile_lock.release()
+    body = "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+    return PlainTextResponse(body + "\n")
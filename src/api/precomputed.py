@@ -0,0 +1,118 @@
+"""Precomputed, compressed JSON bodies for immutable API payloads.
+
+Timeline data never changes while the process runs, so each filter variant
+is serialized once with orjson, compressed once (gzip, plus brotli when the
+``brotli`` package is installed), and served with a strong ETag.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+from collections.abc import Callable, Hashable, Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+
+if TYPE_CHECKING:
+    from .shared_store import SharedBodyStore
+
+try:  # optional: brotli is only used when available
+    import brotli
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+
+@dataclass(frozen=True)
+class PrecomputedBody:
+    """A serialized JSON payload with its compressed encodings and ETag.
+
+    Bodies loaded from a SharedBodyStore are memoryviews into the mapped file.
+    """
+
+    identity: bytes | memoryview
+    gzip: bytes | memoryview
+    br: bytes | memoryview | None
+    etag: str
+
+    @classmethod
+    def from_payload(cls, payload: Any) -> PrecomputedBody:
+        raw = orjson.dumps(payload)
+        return cls(
+            identity=raw,
+            gzip=gzip.compress(raw, compresslevel=9, mtime=0),
+            br=brotli.compress(raw, quality=11) if brotli else None,
+            etag=f'"{hashlib.sha256(raw).hexdigest()[:32]}"',
+        )
+
+    def encoded(self, accept_encoding: str) -> tuple[bytes | memoryview, str | None]:
+        """Pick the smallest encoding the client accepts."""
+        accepted = {
+            token.split(";")[0].strip().lower()
+            for token in accept_encoding.split(",")
+            if token.strip() and not token.replace(" ", "").endswith(";q=0")
+        }
+        if self.br is not None and "br" in accepted:
+            return self.br, "br"
+        if "gzip" in accepted:
+            return self.gzip, "gzip"
+        return self.identity, None
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def precomputed_response(request: Request, body: PrecomputedBody) -> Response:
+    """Serve *body*, honouring If-None-Match and Accept-Encoding."""
+    headers = {"ETag": body.etag, "Vary": "Accept-Encoding"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, body.etag):
+        return Response(status_code=304, headers=headers)
+
+    content, encoding = body.encoded(request.headers.get("accept-encoding", ""))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+class PrecomputedCache:
+    """Memoizes PrecomputedBody per variant key.
+
+    Callers must normalise keys to a finite set (e.g. map unknown filter
+    values to a sentinel) so the cache stays bounded. With a shared store
+    attached, bodies found there are served from the mapped file instead of
+    being built in this process.
+    """
+
+    def __init__(self) -> None:
+        self._bodies: dict[Hashable, PrecomputedBody] = {}
+        self._store: SharedBodyStore | None = None
+
+    def attach(self, store: SharedBodyStore | None) -> None:
+        self._store = store
+        self._bodies.clear()
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> PrecomputedBody:
+        body = self._bodies.get(key)
+        if body is None:
+            if self._store is not None:
+                body = self._store.get(key)
+            if body is None:
+                body = PrecomputedBody.from_payload(build())
+            self._bodies[key] = body
+        return body
+
+    def items(self) -> Iterator[tuple[Hashable, PrecomputedBody]]:
+        return iter(list(self._bodies.items()))
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+    def clear(self) -> None:
+        self._bodies.clear()
@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from datetime import datetime
 
-from fastapi import APIRouter, Query
+import orjson
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 
-from src.timeline.kg_snapshot import build_kg_snapshot, TIMELINE_ALPHA
+from src.metrics import stage
+from src.timeline.kg_snapshot import build_kg_snapshot, iter_kg_snapshot, TIMELINE_ALPHA
+from src.timeline.registry import get_yearly_snapshots
 
 router = APIRouter(prefix="/api/kg", tags=["kg"])
 
@@ -23,4 +28,79 @@ def kg_snapshot(
     target = datetime.fromisoformat(date)
     brand_filter = brand if brand != "all" else None
     industry_filter = industry if industry != "all" else None
-    return build_kg_snapshot(target, brand_filter=brand_filter, alpha=alpha, include_fol=include_fol, industry_filter=industry_filter)
+    snapshot = build_kg_snapshot(target, brand_filter=brand_filter, alpha=alpha, include_fol=include_fol, industry_filter=industry_filter)
+    with stage("kg_snapshot.encode"):
+        body = orjson.dumps(snapshot)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/snapshots")
+def kg_snapshots(
+    year_from: int = Query(..., alias="from", description="First year, e.g. 1990"),
+    year_to: int = Query(..., alias="to", description="Last year (inclusive), e.g. 2010"),
+    brand: str = Query("all", description="Brand filter: chamisul, chumchurum, saero, or all"),
+    alpha: float = Query(TIMELINE_ALPHA, description="Temporal decay alpha"),
+    industry: str = Query("all", description="Industry filter: soju, whisky, or all"),
+):
+    """Return end-of-year KG snapshots for a whole year range in one response.
+
+    Node/edge attributes are sent once as columns; each frame lists the row
+    indexes active that year with their temporal weights.
+    """
+    if year_from > year_to:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    payload = get_yearly_snapshots().range_payload(year_from, year_to, alpha, industry, brand)
+    return Response(content=orjson.dumps(payload), media_type="application/json")
+
+
+# Records per write; keeps chunks large enough for efficient transfer while
+# the first bytes still go out before the whole graph is serialized.
+_STREAM_BATCH = 256
+
+
+# Identity keys survive any projection, so projected records still link up.
+_IDENTITY_KEYS = {"id", "source", "target"}
+
+
+def _ndjson_lines(records: Iterator[tuple[str, dict]], fields: set[str] | None) -> Iterator[bytes]:
+    keep = fields | _IDENTITY_KEYS if fields is not None else None
+    batch: list[bytes] = []
+    for kind, record in records:
+        if keep is not None and kind != "stats":
+            record = {k: v for k, v in record.items() if k in keep}
+        batch.append(orjson.dumps({"kind": kind, **record}))
+        if len(batch) >= _STREAM_BATCH:
+            yield b"\n".join(batch) + b"\n"
+            batch = []
+    if batch:
+        yield b"\n".join(batch) + b"\n"
+
+
+@router.get("/snapshot/stream")
+def kg_snapshot_stream(
+    date: str = Query(..., description="ISO date string, e.g. 2023-06-15"),
+    brand: str = Query("all", description="Brand filter: chamisul, chumchurum, saero, or all"),
+    alpha: float = Query(TIMELINE_ALPHA, description="Temporal decay alpha"),
+    include_fol: bool = Query(False, description="Include FOL evidence layer"),
+    industry: str = Query("all", description="Industry filter: soju, whisky, or all"),
+    fields: str | None = Query(None, description="Comma-separated record fields to keep, e.g. id,label,temporal_weight"),
+):
+    """Stream a KG snapshot as NDJSON, one record per line.
+
+    Each line has a "kind" (node, edge, fol_node, fol_edge, fol_inference);
+    the last line is the "stats" record, which also carries current_event.
+    fields projects node/edge/FOL records; "kind" and the identity keys
+    ("id" for nodes, "source"/"target" for edges) are always kept.
+    """
+    target = datetime.fromisoformat(date)
+    brand_filter = brand if brand != "all" else None
+    industry_filter = industry if industry != "all" else None
+    projection = {f.strip() for f in fields.split(",") if f.strip()} if fields else None
+    records = iter_kg_snapshot(
+        target,
+        brand_filter=brand_filter,
+        alpha=alpha,
+        include_fol=include_fol,
+        industry_filter=industry_filter,
+    )
+    return StreamingResponse(_ndjson_lines(records, projection), media_type="application/x-ndjson")
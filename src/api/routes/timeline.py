@@ -1,63 +1,141 @@
-"""Timeline API routes."""
+"""Timeline API routes.
+
+Events, models and range are immutable for the lifetime of the process, so
+every filter variant is serialized and compressed once (see
+src.api.precomputed) and served with ETag / 304 support.
+"""
 
 from __future__ import annotations
 
-from fastapi import APIRouter
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Request
 
-from src.timeline.event_data import TIMELINE_EVENTS
-from src.timeline.event_data_whisky import WHISKY_TIMELINE_EVENTS
+from src.api.precomputed import PrecomputedCache, precomputed_response
 from src.timeline.kg_snapshot import _serialize_event, compute_live_recommendation
-from src.timeline.model_gallery import MODEL_GALLERY, serialize_model
+from src.timeline.model_gallery import serialize_model
+from src.timeline.registry import get_all_events, get_event_facets, get_model_index
 
 router = APIRouter(prefix="/api/timeline", tags=["timeline"])
 
-ALL_EVENTS = TIMELINE_EVENTS + WHISKY_TIMELINE_EVENTS
+_ALL = "all"
+_UNKNOWN = "__unknown__"
 
-_WHISKY_PRODUCT_TYPES = {"scotch_whisky"}
+_cache = PrecomputedCache()
 
 
-@router.get("/events")
-def list_events(brand: str | None = None, industry: str | None = None):
-    """Return all timeline events, optionally filtered by brand and/or industry."""
-    events = ALL_EVENTS
-    if industry and industry != "all":
+def _norm(value: str | None, known: set[str]) -> str:
+    """Map a filter value to "all", a known value, or the unknown sentinel."""
+    if not value or value == _ALL:
+        return _ALL
+    return value if value in known else _UNKNOWN
+
+
+def _event_industries() -> set[str]:
+    return get_event_facets()["industries"]
+
+
+def _event_brands() -> set[str]:
+    return get_event_facets()["brands"]
+
+
+def _filter_events(industry: str, brand: str) -> list:
+    events = get_all_events()
+    if industry != _ALL:
         events = [e for e in events if e.industry == industry]
-    if brand and brand != "all":
+    if brand != _ALL:
         events = [e for e in events if e.brand == brand or e.brand == "multi"]
-    return [_serialize_event(e) for e in events]
+    return events
 
 
-@router.get("/models")
-def list_models(brand: str | None = None, product_type: str | None = None, industry: str | None = None):
-    """Return model gallery entries, optionally filtered by brand, product_type, and/or industry."""
-    models = MODEL_GALLERY
-    if industry and industry != "all":
-        if industry == "whisky":
-            models = [m for m in models if m.product_type in _WHISKY_PRODUCT_TYPES]
-        else:
-            models = [m for m in models if m.product_type not in _WHISKY_PRODUCT_TYPES]
-    if brand and brand != "all":
-        models = [m for m in models if m.brand == brand]
-    if product_type and product_type != "all":
-        models = [m for m in models if m.product_type == product_type]
+def _build_models(industry: str, brand: str, product_type: str) -> list[dict[str, Any]]:
+    models = get_model_index().query(brand=brand, product_type=product_type, industry=industry)
     return [serialize_model(m) for m in models]
 
 
-@router.get("/range")
-def timeline_range(industry: str | None = None):
-    """Return the date range of available events."""
-    events = ALL_EVENTS
-    if industry and industry != "all":
-        events = [e for e in events if e.industry == industry]
+def _build_range(industry: str) -> dict[str, Any]:
+    events = _filter_events(industry, _ALL)
     dates = [e.date for e in events]
     return {
-        "min_date": min(dates).isoformat(),
-        "max_date": max(dates).isoformat(),
+        "min_date": min(dates).isoformat() if dates else None,
+        "max_date": max(dates).isoformat() if dates else None,
         "total_events": len(events),
         "brands": sorted({e.brand for e in events}),
     }
 
 
+def _events_body(industry: str | None, brand: str | None):
+    key = ("events", _norm(industry, _event_industries()), _norm(brand, _event_brands()))
+    return _cache.get(key, lambda: [_serialize_event(e) for e in _filter_events(*key[1:])])
+
+
+def _models_body(industry: str | None, brand: str | None, product_type: str | None):
+    # Model industry filtering is "whisky" vs everything else, so any value is valid.
+    industry_key = industry if industry and industry != _ALL else _ALL
+    if industry_key not in (_ALL, "whisky"):
+        industry_key = "non_whisky"
+    key = (
+        "models",
+        industry_key,
+        _norm(brand, get_model_index().brands),
+        _norm(product_type, get_model_index().product_types),
+    )
+    return _cache.get(key, lambda: _build_models(*key[1:]))
+
+
+def _range_body(industry: str | None):
+    key = ("range", _norm(industry, _event_industries()))
+    return _cache.get(key, lambda: _build_range(key[1]))
+
+
+def attach_shared_store(store) -> None:
+    """Serve variants from a SharedBodyStore (None detaches)."""
+    _cache.attach(store)
+
+
+def warm_timeline_cache() -> int:
+    """Serialize every known filter variant up front. Returns the variant count."""
+    industries = [None, *sorted(_event_industries())]
+    for industry in industries:
+        _range_body(industry)
+        for brand in [None, *sorted(_event_brands())]:
+            _events_body(industry, brand)
+    model_brands = [None, *sorted(get_model_index().brands)]
+    model_types = [None, *sorted(get_model_index().product_types)]
+    for industry in (None, "whisky", "soju"):
+        # Single-filter variants; rarer brand × product_type combos build lazily.
+        for brand in model_brands:
+            _models_body(industry, brand, None)
+        for product_type in model_types:
+            _models_body(industry, None, product_type)
+    return len(_cache)
+
+
+@router.get("/events")
+def list_events(request: Request, brand: str | None = None, industry: str | None = None):
+    """Return all timeline events, optionally filtered by brand and/or industry."""
+    return precomputed_response(request, _events_body(industry, brand))
+
+
+@router.get("/models")
+def list_models(
+    request: Request,
+    brand: str | None = None,
+    product_type: str | None = None,
+    industry: str | None = None,
+):
+    """Return model gallery entries, optionally filtered by brand, product_type, and/or industry."""
+    return precomputed_response(request, _models_body(industry, brand, product_type))
+
+
+@router.get("/range")
+def timeline_range(request: Request, industry: str | None = None):
+    """Return the date range of available events (404 for an unknown industry)."""
+    if _norm(industry, _event_industries()) == _UNKNOWN:
+        raise HTTPException(status_code=404, detail=f"Unknown industry '{industry}'")
+    return precomputed_response(request, _range_body(industry))
+
+
 @router.get("/live-recommendation")
 def live_recommendation(industry: str | None = None, brand: str | None = None):
     """Return composite ideal ambassador recommendation using temporal decay."""
@@ -2,15 +2,71 @@
 
 from __future__ import annotations
 
+import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from src.config import (
+    COLD_TIERING_ENABLED,
+    MEMORY_CONSOLIDATION_ENABLED,
+    MEMORY_CONSOLIDATION_INTERVAL_SECONDS,
+    TIMELINE_WARM_CACHE,
+)
+
+from .instrumentation import MetricsMiddleware, router as instrumentation_router
 from .routes import timeline, kg, media
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    store_path = os.getenv("TIMELINE_SHARED_STORE")
+    if store_path and Path(store_path).is_file():
+        # Multi-worker deployments map one prebuilt file (src.api.shared_store):
+        # timeline bodies, datasets and yearly KG checkpoints
+        from src.timeline import registry
+
+        from .shared_store import SharedBodyStore
+
+        store = SharedBodyStore(store_path)
+        registry.attach_shared_store(store)
+        timeline.attach_shared_store(store)
+    elif TIMELINE_WARM_CACHE:
+        # Opt-in: serialize + compress the static timeline payloads before the
+        # first request. By default variants build lazily, keeping startup cheap.
+        timeline.warm_timeline_cache()
+
+    worker = _start_consolidation() if MEMORY_CONSOLIDATION_ENABLED else None
+    try:
+        yield
+    finally:
+        if worker is not None:
+            await worker.stop()
+
+
+def _start_consolidation():
+    """Run ConsolidationWorker passes (and cold-tier sweeps) over the agents' memory while the app is up."""
+    from src.agents.root_tools import get_memory_system
+    from src.memory.consolidation import ConsolidationWorker
+    from src.memory.tiering import TieringPolicy
+
+    memory = get_memory_system()
+    worker = ConsolidationWorker(
+        memory,
+        interval_seconds=MEMORY_CONSOLIDATION_INTERVAL_SECONDS,
+        tiering=TieringPolicy() if COLD_TIERING_ENABLED else None,
+        # One consolidating process per store, however many uvicorn workers run
+        lock_path=Path(memory.vector_store.persist_dir) / "consolidation.lock",
+    )
+    worker.start()
+    return worker
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Soju Wars: 100-Year Brand Evolution",
     version="1.0.0",
     description="Timeline-based visualization of Korean soju brand wars + influencer evolution (1924-2026)",
@@ -24,11 +80,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency / payload-size histograms, exposed on /metrics
+app.add_middleware(MetricsMiddleware)
+
 # API routes
+app.include_router(instrumentation_router)
 app.include_router(timeline.router)
 app.include_router(kg.router)
 app.include_router(media.router)
 
+
 # Generated videos directory (must mount before "/" catch-all)
 _video_dir = Path(__file__).parent.parent.parent / "generated_videos"
 _video_dir.mkdir(exist_ok=True)
@@ -41,7 +102,6 @@ app.mount("/images", StaticFiles(directory=str(_img_dir)), name="images")
 
 # Static files — legacy Vanilla JS SPA (disabled when using Next.js frontend)
 # To re-enable: set SERVE_LEGACY_SPA=1
-import os as _os
 _web_dir = Path(__file__).parent.parent / "web"
-if _web_dir.is_dir() and _os.getenv("SERVE_LEGACY_SPA"):
+if _web_dir.is_dir() and os.getenv("SERVE_LEGACY_SPA"):
     app.mount("/", StaticFiles(directory=str(_web_dir), html=True), name="static")
@@ -0,0 +1,209 @@
+"""Memory-mapped store of precomputed API bodies and timeline tables, shared by every worker.
+
+Each uvicorn worker would otherwise build its own copy of the timeline
+datasets, the yearly KG checkpoints and every serialized timeline variant.
+Instead, all of it is written once to a flat binary file and each worker
+maps it read-only. Response bodies and the yearly checkpoint tables are
+used straight from the map, so the OS page cache holds one copy for all
+workers; the record datasets are decoded from it once per worker (see
+src.timeline.registry), which is still much cheaper than building them.
+
+File layout (little-endian):
+
+    magic  b"PCSTORE2"           8 bytes
+    index_offset, index_length   2 × u64
+    blob data                    bodies and table columns back to back (8-byte aligned)
+    index                        JSON {"bodies": {key: [etag, span, span, span | null]},
+                                       "tables": {name: {column: [kind, span, span?]}},
+                                       "meta": {...}}
+
+Tables are flat columnar sections: fixed-width columns ("u32", "i64",
+"f64") are read as zero-copy memoryview casts; variable-width columns
+("str", "bytes") are a u64 offsets array plus one data blob, decoded per
+element on access. src.timeline.registry serves its datasets from these
+tables when a store is attached (see registry.shared_tables).
+
+Build it after the data changes and point the server at it:
+
+    python -m src.api.shared_store build [path]
+    TIMELINE_SHARED_STORE=path uvicorn src.api.server:app --workers 4
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Hashable, Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from .precomputed import PrecomputedBody
+
+MAGIC = b"PCSTORE2"
+_HEADER = struct.Struct("<8sQQ")
+DEFAULT_STORE_PATH = Path(__file__).resolve().parent.parent / "timeline" / "data" / "timeline_bodies.bin"
+
+
+_FIXED_WIDTH = {"u32": "I", "i64": "q", "f64": "d"}  # column kind → array typecode
+
+Column = tuple[str, Sequence[Any]]  # (kind, values)
+
+
+def _encode_key(key: Hashable) -> str:
+    if isinstance(key, tuple):
+        return "\x1f".join(str(part) for part in key)
+    return str(key)
+
+
+def write_store(
+    path: str | Path,
+    bodies: Iterable[tuple[Hashable, PrecomputedBody]],
+    tables: Mapping[str, Mapping[str, Column]] | None = None,
+    meta: dict[str, Any] | None = None,
+) -> Path:
+    """Write (key, body) pairs, columnar *tables* and JSON *meta* to *path* atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    index: dict[str, Any] = {"bodies": {}, "tables": {}, "meta": meta or {}}
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, 0, 0))
+        offset = _HEADER.size
+
+        def put(blob: bytes | memoryview | None) -> list[int] | None:
+            nonlocal offset
+            if blob is None:
+                return None
+            pad = -offset % 8  # keep fixed-width columns castable
+            f.write(b"\0" * pad)
+            offset += pad
+            f.write(blob)
+            span = [offset, len(blob)]
+            offset += len(blob)
+            return span
+
+        for key, body in bodies:
+            index["bodies"][_encode_key(key)] = [body.etag, put(body.identity), put(body.gzip), put(body.br)]
+
+        for name, columns in (tables or {}).items():
+            entry = index["tables"][name] = {}
+            for column, (kind, values) in columns.items():
+                if kind in _FIXED_WIDTH:
+                    entry[column] = [kind, put(array(_FIXED_WIDTH[kind], values).tobytes())]
+                    continue
+                blobs = [v.encode("utf-8") for v in values] if kind == "str" else [bytes(v) for v in values]
+                offsets = array("q", [0])
+                for blob in blobs:
+                    offsets.append(offsets[-1] + len(blob))
+                entry[column] = [kind, put(offsets.tobytes()), put(b"".join(blobs))]
+
+        pad = -offset % 8
+        f.write(b"\0" * pad)
+        offset += pad
+        raw_index = orjson.dumps(index)
+        f.write(raw_index)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, offset, len(raw_index)))
+    os.replace(tmp, path)
+    return path
+
+
+class VarColumn(Sequence):
+    """A "str" or "bytes" column: elements are decoded from the map on access."""
+
+    def __init__(self, offsets: memoryview, data: memoryview, text: bool) -> None:
+        self._offsets = offsets
+        self._data = data
+        self._text = text
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        raw = self._data[self._offsets[i]:self._offsets[i + 1]]
+        return str(raw, "utf-8") if self._text else raw
+
+
+class SharedBodyStore:
+    """Read-only view of a store file; bodies are zero-copy memoryviews."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, index_length = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{self.path} is not a precomputed body store")
+        self._view = memoryview(self._map)
+        index = orjson.loads(self._view[index_offset:index_offset + index_length])
+        self._index: dict[str, list] = index["bodies"]
+        self._tables: dict[str, dict[str, list]] = index["tables"]
+        self.meta: dict[str, Any] = index["meta"]
+
+    def _slice(self, span: list[int] | None) -> memoryview | None:
+        if span is None:
+            return None
+        offset, length = span
+        return self._view[offset:offset + length]
+
+    def table(self, name: str) -> dict[str, Sequence[Any]]:
+        """Columns of table *name*: memoryview casts or VarColumns over the map."""
+        columns: dict[str, Sequence[Any]] = {}
+        for column, (kind, *spans) in self._tables[name].items():
+            if kind in _FIXED_WIDTH:
+                columns[column] = self._slice(spans[0]).cast(_FIXED_WIDTH[kind])
+            else:
+                columns[column] = VarColumn(self._slice(spans[0]).cast("q"), self._slice(spans[1]), kind == "str")
+        return columns
+
+    def has_table(self, name: str) -> bool:
+        return name in self._tables
+
+    def get(self, key: Hashable) -> PrecomputedBody | None:
+        entry = self._index.get(_encode_key(key))
+        if entry is None:
+            return None
+        etag, identity, gz, br = entry
+        return PrecomputedBody(
+            identity=self._slice(identity),
+            gzip=self._slice(gz),
+            br=self._slice(br),
+            etag=etag,
+        )
+
+    def __contains__(self, key: Hashable) -> bool:
+        return _encode_key(key) in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+def build_timeline_store(path: str | Path = DEFAULT_STORE_PATH) -> Path:
+    """Warm every timeline variant and write them, plus the timeline tables, to *path*."""
+    from src.timeline import registry
+
+    from .routes import timeline
+
+    timeline.warm_timeline_cache()
+    tables, meta = registry.shared_tables()
+    return write_store(path, timeline._cache.items(), tables, meta)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "build":
+        out = build_timeline_store(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_STORE_PATH)
+        print(f"Wrote timeline shared store to {out}")
+    else:
+        print("usage: python -m src.api.shared_store build [path]")
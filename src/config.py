@@ -3,6 +3,15 @@
 import os
 from pathlib import Path
 
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Boolean env var: "1"/"true"/"yes"/"on" enable, anything else ("0", "false") disables."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 # Project root
 PROJECT_ROOT = Path(__file__).parent.parent
 
@@ -16,18 +25,39 @@ GEMINI_MODEL = "gemini-3-flash-preview"
 VEO_MODEL = "veo-3.1-generate-preview"
 IMAGEN_MODEL = "imagen-4.0-generate-001"
 
+# Serialize every timeline filter variant at API startup instead of on first
+# request (off by default so a cold start stays lazy; src.api.routes.timeline)
+TIMELINE_WARM_CACHE = env_flag("TIMELINE_WARM_CACHE")
+
 # ChromaDB
 CHROMA_PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", str(PROJECT_ROOT / "chroma_data"))
 
 # Temporal decay
 TEMPORAL_DECAY_ALPHA = float(os.getenv("TEMPORAL_DECAY_ALPHA", "0.02"))
 
+# Notes below this temporal weight move to the cold tier (src.memory.tiering)
+COLD_TIER_WEIGHT_THRESHOLD = float(os.getenv("COLD_TIER_WEIGHT_THRESHOLD", "0.01"))
+
+# Background note consolidation (src.memory.consolidation), started by the API server
+MEMORY_CONSOLIDATION_ENABLED = env_flag("MEMORY_CONSOLIDATION_ENABLED")
+MEMORY_CONSOLIDATION_INTERVAL_SECONDS = float(os.getenv("MEMORY_CONSOLIDATION_INTERVAL_SECONDS", "300"))
+# Each worker pass first sweeps decayed notes to the cold tier (src.memory.tiering)
+COLD_TIERING_ENABLED = env_flag("COLD_TIERING_ENABLED", default=True)
+
 # Memory search
 SIMILARITY_WEIGHT = 0.6
 TEMPORAL_WEIGHT = 0.4
 DEFAULT_SEARCH_K = 10
 DEFAULT_TRIPLET_K = 20
 
+# Estimated-token budget for build_context_injection (src.memory.context_packer)
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1200"))
+
+# get_memory_context semantic cache (src.memory.semantic_cache)
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "256"))
+SEMANTIC_CACHE_BUCKET_SECONDS = float(os.getenv("SEMANTIC_CACHE_BUCKET_SECONDS", "3600"))
+
 # Brand namespaces
 VALID_BRAND_NAMESPACES = {"chamisul", "chumchurum", "saero"}
 
@@ -1,6 +1,25 @@
-from .schema import MemoryNote, KGTriplet, SessionSummary
-from .temporal_decay import compute_temporal_weight, compute_combined_score
-from .vector_store import BrandVectorStore
-from .graph_store import BrandGraphStore
-from .memory_system import BrandMemorySystem
-from .session_manager import SessionManager
+"""Memory package. Submodules load lazily so importing e.g. temporal_decay
+does not pull in ChromaDB."""
+
+_EXPORTS = {
+    "MemoryNote": ".schema",
+    "KGTriplet": ".schema",
+    "SessionSummary": ".schema",
+    "compute_temporal_weight": ".temporal_decay",
+    "compute_combined_score": ".temporal_decay",
+    "BrandVectorStore": ".vector_store",
+    "BrandGraphStore": ".graph_store",
+    "BrandMemorySystem": ".memory_system",
+    "SessionManager": ".session_manager",
+    "SqliteSessionStore": ".session_manager",
+    "ConsolidationWorker": ".consolidation",
+    "SemanticCache": ".semantic_cache",
+}
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        from importlib import import_module
+
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
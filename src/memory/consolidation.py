@@ -0,0 +1,294 @@
+"""Background consolidation of near-duplicate memory notes.
+
+Each pass of ConsolidationWorker:
+
+1. Clusters notes it has not seen yet, incrementally: a note joins the most
+   similar existing cluster of its category when the cosine similarity to
+   the cluster centroid reaches ``similarity_threshold``, otherwise it
+   starts a new cluster. Cluster state persists across passes, so each pass
+   only embeds-and-compares the new rows.
+2. Summarizes clusters that reached ``min_cluster_size`` into one
+   ``[CONSOLIDATED]`` note (significance = max of its members).
+3. Moves the merged originals out of ``{brand}_notes`` into
+   ``{brand}_notes_archive`` with ``consolidated_into`` set, so the hot
+   collection (and every ANN query over it) shrinks as the store ages.
+
+The summary is dated like its newest member, not "now", so it decays like
+the facts it stands for. Archived originals get ``superseded_at_ts`` (the
+summary's created_at); as-of searches read the archive for dates before
+it, so "what did we know then" still sees the originals.
+
+Chroma reads, clustering and archiving run in a worker thread
+(asyncio.to_thread), so a pass never blocks the event loop it was started
+on. Given a ``lock_path``, the worker only runs passes while it holds an
+exclusive lock on that file: with several server processes one of them
+consolidates and the others stand by, taking over if it exits.
+
+Given a TieringPolicy, each pass first demotes decayed notes to the cold
+tier (src.memory.tiering), so they are neither clustered nor queried hot.
+
+Work per pass is bounded by a ConsolidationBudget (CPU seconds spent
+clustering, notes clustered, LLM calls); whatever is left over is picked
+up by the next pass.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+try:
+    import fcntl
+except ImportError:  # not POSIX: no cross-process coordination
+    fcntl = None
+
+from src.config import VALID_BRAND_NAMESPACES
+from src.metrics import stage
+from .schema import MemoryNote
+from .temporal_decay import to_epoch
+
+if TYPE_CHECKING:
+    from .memory_system import BrandMemorySystem
+    from .tiering import TieringPolicy
+
+Summarizer = Callable[[str, str, list[str]], Awaitable[str]]
+
+CONSOLIDATED_PREFIX = "[CONSOLIDATED] "
+
+
+def archive_collection(brand_namespace: str) -> str:
+    return f"{brand_namespace}_notes_archive"
+
+
+@dataclass
+class ConsolidationBudget:
+    """Upper bounds for one pass."""
+    max_cpu_seconds: float = 2.0  # CPU time spent clustering
+    max_notes: int = 500  # new notes clustered
+    max_llm_calls: int = 3  # summaries written
+
+    @classmethod
+    def unbounded(cls) -> ConsolidationBudget:
+        """No limits: one pass covers every note (manual, on-demand runs)."""
+        return cls(max_cpu_seconds=math.inf, max_notes=sys.maxsize, max_llm_calls=sys.maxsize)
+
+
+@dataclass
+class _Cluster:
+    category: str
+    centroid: Any  # numpy sum of member unit vectors
+    members: list[str] = field(default_factory=list)
+    consolidated_size: int = 1  # member count when last summarized (1 → never)
+
+
+class ConsolidationWorker:
+    """Incremental cluster → summarize → archive loop over brand note collections."""
+
+    def __init__(
+        self,
+        memory: BrandMemorySystem,
+        brands: list[str] | None = None,
+        categories: list[str] | None = None,
+        summarize: Summarizer | None = None,
+        similarity_threshold: float = 0.9,
+        min_cluster_size: int = 3,
+        budget: ConsolidationBudget | None = None,
+        interval_seconds: float = 300.0,
+        tiering: TieringPolicy | None = None,
+        lock_path: str | Path | None = None,
+    ) -> None:
+        self.memory = memory
+        self.brands = brands or sorted(VALID_BRAND_NAMESPACES)
+        self.categories = set(categories) if categories else None
+        self.summarize = summarize
+        self.similarity_threshold = similarity_threshold
+        self.min_cluster_size = min_cluster_size
+        self.budget = budget or ConsolidationBudget()
+        self.interval_seconds = interval_seconds
+        self.tiering = tiering
+        self._clusters: dict[str, list[_Cluster]] = {}
+        self._seen: dict[str, set[str]] = {}
+        self.lock_path = Path(lock_path) if lock_path is not None else None
+        self._lock_fd: int | None = None
+        self._task: asyncio.Task | None = None
+        self.last_error: BaseException | None = None
+
+    # ── Passes ────────────────────────────────────────────────
+
+    async def run_once(self) -> list[MemoryNote]:
+        """One budgeted pass over every brand. Returns the consolidated notes written."""
+        if not self._acquire_lock():
+            return []  # another process is consolidating this store
+        cpu_left = self.budget.max_cpu_seconds
+        notes_left = self.budget.max_notes
+        llm_left = self.budget.max_llm_calls
+        written: list[MemoryNote] = []
+        with stage("memory.consolidate"):
+            for brand in self.brands:
+                if self.tiering is not None:
+                    await asyncio.to_thread(self.tiering.sweep, self.memory.vector_store, brand)
+                processed, cpu_used = await asyncio.to_thread(self._cluster_new, brand, notes_left, cpu_left)
+                notes_left -= processed
+                cpu_left -= cpu_used
+                for cluster in self._ready(brand):
+                    if llm_left <= 0:
+                        break
+                    llm_left -= 1
+                    note = await self._consolidate(brand, cluster)
+                    if note is not None:
+                        written.append(note)
+        return written
+
+    def _cluster_new(self, brand: str, limit: int, cpu_seconds: float) -> tuple[int, float]:
+        """Assign up to *limit* unseen notes to clusters within *cpu_seconds* of this thread's CPU.
+
+        Returns (notes processed, CPU seconds used).
+        """
+        import numpy as np
+
+        started = time.thread_time()
+        collection = f"{brand}_notes"
+        seen = self._seen.setdefault(brand, set())
+        clusters = self._clusters.setdefault(brand, [])
+        pending = [i for i in self.memory.vector_store.recency_index(collection).ids() if i not in seen]
+        processed = 0
+        for start in range(0, min(len(pending), limit), 64):
+            if time.thread_time() - started >= cpu_seconds:
+                break
+            batch = pending[start:min(start + 64, limit)]
+            for row in self.memory.vector_store.get_rows(collection, batch, embeddings=True):
+                seen.add(row["id"])
+                processed += 1
+                category = row["metadata"].get("category", "")
+                if self.categories is not None and category not in self.categories:
+                    continue
+                vec = np.asarray(row["embedding"], dtype=np.float64)
+                vec /= np.linalg.norm(vec) or 1.0
+                best, best_sim = None, self.similarity_threshold
+                for cluster in clusters:
+                    if cluster.category != category:
+                        continue
+                    sim = float(vec @ cluster.centroid) / (np.linalg.norm(cluster.centroid) or 1.0)
+                    if sim >= best_sim:
+                        best, best_sim = cluster, sim
+                if best is None:
+                    clusters.append(_Cluster(category, vec.copy(), [row["id"]]))
+                else:
+                    best.centroid += vec
+                    best.members.append(row["id"])
+        return processed, time.thread_time() - started
+
+    def _ready(self, brand: str) -> list[_Cluster]:
+        """Clusters that grew past the size threshold since they were last summarized."""
+        return [
+            c for c in self._clusters.get(brand, [])
+            if len(c.members) >= self.min_cluster_size and len(c.members) > c.consolidated_size
+        ]
+
+    async def _consolidate(self, brand: str, cluster: _Cluster) -> MemoryNote | None:
+        collection = f"{brand}_notes"
+        rows = await asyncio.to_thread(self.memory.vector_store.get_rows, collection, cluster.members)
+        if len(rows) < 2:
+            cluster.members = [row["id"] for row in rows]
+            cluster.consolidated_size = max(len(rows), 1)
+            return None
+
+        summarize = self.summarize
+        if summarize is None:
+            from src.llm.gemini_client import summarize_memories as summarize
+
+        texts = [row["document"].removeprefix(CONSOLIDATED_PREFIX) for row in rows]
+        summary = await summarize(brand, cluster.category, texts)
+        note = await asyncio.to_thread(self._archive, brand, cluster.category, summary, rows)
+
+        # The summary stands in for its members from now on.
+        self._seen.setdefault(brand, set()).add(note.id)
+        cluster.members = [note.id]
+        cluster.consolidated_size = 1
+        return note
+
+    def _archive(self, brand: str, category: str, summary: str, rows: list[dict[str, Any]]) -> MemoryNote:
+        """Write the summary (dated like its newest member) and archive the originals."""
+        created = [row["metadata"].get("created_at") for row in rows]
+        note = MemoryNote(
+            content=f"{CONSOLIDATED_PREFIX}{summary}",
+            brand_namespace=brand,
+            category=category,
+            tags=["consolidated", "core_knowledge"],
+            connections=[row["id"] for row in rows],
+            significance=max(row["metadata"].get("significance", 0.5) for row in rows),
+        )
+        if all(created):
+            note.created_at = max(datetime.fromisoformat(c) for c in created)
+        self.memory._notes_cache[note.id] = note
+        self.memory.vector_store.add_note(note)
+
+        originals = [row["id"] for row in rows]
+        self.memory.vector_store.move_rows(
+            f"{brand}_notes",
+            archive_collection(brand),
+            originals,
+            metadata={
+                "consolidated_into": note.id,
+                "archived_at": datetime.utcnow().isoformat(),
+                "superseded_at_ts": to_epoch(note.created_at),
+            },
+        )
+        for doc_id in originals:
+            self.memory._notes_cache.pop(doc_id, None)
+        return note
+
+    # ── Cross-process lock ────────────────────────────────────
+
+    def _acquire_lock(self) -> bool:
+        """Hold the lock_path lock (kept until stop()). True when this process may consolidate."""
+        if self.lock_path is None or fcntl is None or self._lock_fd is not None:
+            return True
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    def _release_lock(self) -> None:
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)  # closing drops the flock
+            self._lock_fd = None
+
+    # ── Background loop ───────────────────────────────────────
+
+    def start(self) -> asyncio.Task:
+        """Run passes every interval_seconds on the current event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._release_lock()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:  # keep the worker alive; surface via last_error
+                self.last_error = e
+            await asyncio.sleep(self.interval_seconds)
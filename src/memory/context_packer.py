@@ -0,0 +1,96 @@
+"""Token-budgeted assembly of the memory context injected into agent prompts.
+
+build_context_injection gathers candidates from four sources (brand notes,
+vector triplet hits, graph expansions, shared notes). pack_context then:
+
+1. drops duplicates across sources — the same triplet id (a vector hit that
+   graph expansion also returns; it stays under the earlier section, so a
+   direct hit is always filed as a fact, with the better of its scores) or
+   the same normalized text;
+2. walks the rest by combined score, best first, and keeps every entry whose
+   line (plus its section header, the first time a section is used) still
+   fits in ``token_budget``;
+3. renders the kept entries grouped by section, best first within a section.
+
+Token counts are estimates (src.memory.tokens).
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+
+from .tokens import estimate_tokens
+
+NOTES = "Brand Memory Notes"
+FACTS = "Knowledge Graph Facts"
+EXPANSION = "Related Knowledge (Graph Expansion)"
+INDUSTRY = "Industry Context"
+SECTIONS = (NOTES, FACTS, EXPANSION, INDUSTRY)
+
+EMPTY_CONTEXT = "No relevant memory found."
+
+
+@dataclass
+class ContextItem:
+    section: str
+    text: str
+    score: float
+    triplet_id: str | None = None
+
+    @property
+    def line(self) -> str:
+        if self.section == NOTES:
+            return f"- [{self.score:.2f}] {self.text}"
+        return f"- {self.text}"
+
+
+def text_hash(text: str) -> str:
+    """Hash of the case- and whitespace-normalized text."""
+    return hashlib.sha1(" ".join(text.split()).casefold().encode("utf-8")).hexdigest()
+
+
+def _merge_triplets(items: list[ContextItem]) -> list[ContextItem]:
+    """One item per triplet id: the earliest section's, with the best score of the group."""
+    merged: dict[str, ContextItem] = {}
+    out: list[ContextItem] = []
+    for item in items:
+        if item.triplet_id is None:
+            out.append(item)
+            continue
+        kept = merged.get(item.triplet_id)
+        if kept is None:
+            merged[item.triplet_id] = item
+        else:
+            first = min(kept, item, key=lambda i: SECTIONS.index(i.section))
+            merged[item.triplet_id] = ContextItem(first.section, first.text, max(kept.score, item.score), item.triplet_id)
+    return out + list(merged.values())
+
+
+def pack_context(items: list[ContextItem], token_budget: int) -> str:
+    """Dedupe *items* and greedily fill *token_budget* by score."""
+    items = _merge_triplets(items)
+    seen_text: set[str] = set()
+    chosen: dict[str, list[ContextItem]] = {}
+    used = 0
+    for item in sorted(items, key=lambda i: (i.score, -SECTIONS.index(i.section)), reverse=True):
+        if not item.text.strip():
+            continue
+        key = text_hash(item.text)
+        if key in seen_text:
+            continue
+        cost = estimate_tokens(f"\n{item.line}")
+        if item.section not in chosen:
+            cost += estimate_tokens(f"\n## {item.section}")
+        if used + cost > token_budget:
+            continue
+        used += cost
+        seen_text.add(key)
+        chosen.setdefault(item.section, []).append(item)
+
+    parts: list[str] = []
+    for section in SECTIONS:
+        if section in chosen:
+            parts.append(f"\n## {section}" if parts else f"## {section}")
+            parts.extend(item.line for item in chosen[section])
+    return "\n".join(parts) if parts else EMPTY_CONTEXT
@@ -83,6 +83,19 @@ class BrandGraphStore:
 
         return results
 
+    def get_neighbors_many(
+        self,
+        brand_namespaces: list[str],
+        entity: str,
+        max_hops: int = 1,
+    ) -> dict[str, list[KGTriplet]]:
+        """get_neighbors for one entity in several brand graphs; brands without it are omitted."""
+        found: dict[str, list[KGTriplet]] = {}
+        for brand in brand_namespaces:
+            if entity in self._graphs.get(brand, ()):
+                found[brand] = self.get_neighbors(brand, entity, max_hops=max_hops)
+        return found
+
     def find_paths(
         self,
         brand_namespace: str,
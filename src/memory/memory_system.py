@@ -9,14 +9,20 @@ Combines:
 
 from __future__ import annotations
 
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
 
 from .schema import MemoryNote, KGTriplet, BrandNamespace
-from .vector_store import BrandVectorStore
+from .context_packer import EXPANSION, FACTS, INDUSTRY, NOTES, ContextItem, pack_context
+from .consolidation import archive_collection
+from .retrieval import score_items, threshold_top_k_many
+from .vector_store import BrandVectorStore, Query, notes_collection
 from .graph_store import BrandGraphStore
-from .temporal_decay import compute_combined_score, compute_temporal_weight
-from src.config import DEFAULT_SEARCH_K, DEFAULT_TRIPLET_K
+from .temporal_decay import to_epoch
+from src.config import CONTEXT_TOKEN_BUDGET, DEFAULT_SEARCH_K, DEFAULT_TRIPLET_K
+from src.metrics import stage
 
 
 class BrandMemorySystem:
@@ -107,71 +113,185 @@ class BrandMemorySystem:
 
     def search(
         self,
-        query: str,
+        query: Query,
         brand_namespace: BrandNamespace,
         k: int = DEFAULT_SEARCH_K,
         category_filter: str | None = None,
         now: datetime | None = None,
+        as_of: datetime | None = None,
     ) -> list[dict[str, Any]]:
-        """Search notes with vector similarity + temporal decay re-ranking."""
-        raw_results = self.vector_store.search_notes(
-            brand_namespace=brand_namespace,
-            query=query,
-            k=k * 2,  # fetch more for re-ranking
-            category_filter=category_filter,
-        )
+        """Search notes by combined similarity + temporal decay score.
 
-        # Re-rank with temporal decay
-        scored: list[dict[str, Any]] = []
-        for item in raw_results:
-            created_str = item.get("metadata", {}).get("created_at", "")
-            try:
-                created_at = datetime.fromisoformat(created_str) if created_str else datetime.utcnow()
-            except ValueError:
-                created_at = datetime.utcnow()
-
-            similarity = item.get("similarity", 0.5)
-            significance = item.get("metadata", {}).get("significance", 0.5)
-            combined = compute_combined_score(similarity, created_at, now=now, significance=significance)
-            item["combined_score"] = combined
-            item["temporal_weight"] = compute_temporal_weight(created_at, now=now, significance=significance)
-            scored.append(item)
-
-        scored.sort(key=lambda x: x["combined_score"], reverse=True)
-
-        # Update access counts
-        for item in scored[:k]:
-            note = self._notes_cache.get(item["id"])
-            if note:
-                note.access_count += 1
+        The top-k is exact: the similarity stream is merged with the
+        collection's recency index until no unseen note can rank higher
+        (see src.memory.retrieval).
 
-        return scored[:k]
+        as_of answers "what did we know then": notes created after it are
+        filtered out inside the vector query and decay is measured from it.
+        """
+        with stage("memory.search.query"):
+            top = self._top_k("notes", query, brand_namespace, k, category_filter, now, as_of)
+        self._count_access(top)
+        return top
 
     def get_weighted_triplets(
         self,
-        query: str,
+        query: Query,
         brand_namespace: BrandNamespace,
         k: int = DEFAULT_TRIPLET_K,
         now: datetime | None = None,
+        as_of: datetime | None = None,
     ) -> list[dict[str, Any]]:
-        """Search KG triplets with EWA temporal weighting."""
-        raw = self.vector_store.search_triplets(brand_namespace, query, k=k * 2)
+        """Search KG triplets with EWA temporal weighting (exact top-k and as_of: see search)."""
+        return self._top_k("triplets", query, brand_namespace, k, None, now, as_of)
 
-        scored: list[dict[str, Any]] = []
-        for item in raw:
-            created_str = item.get("metadata", {}).get("created_at", "")
-            try:
-                created_at = datetime.fromisoformat(created_str) if created_str else datetime.utcnow()
-            except ValueError:
-                created_at = datetime.utcnow()
+    def search_many(
+        self,
+        queries: list[str],
+        brands: Sequence[BrandNamespace],
+        k: int = DEFAULT_SEARCH_K,
+        kind: str = "notes",
+        category_filter: str | None = None,
+        now: datetime | None = None,
+        as_of: datetime | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """search() (kind="notes") or get_weighted_triplets() (kind="triplets")
+        for several queries across several brands in one call.
+
+        Queries are embedded once. Each brand runs the threshold top-k for
+        all queries together, so every round is one multi-query Chroma call
+        per collection; brands run concurrently. Returns one list per query:
+        the top k across all brands by combined score, each item tagged with
+        its "brand".
+        """
+        if not queries or not brands:
+            return [[] for _ in queries]
+        embeddings = self.vector_store.embed(queries)
+
+        def run(brand: str) -> list[list[dict[str, Any]]]:
+            per_query = self._top_k_many(kind, embeddings, brand, k, category_filter, now, as_of)
+            return [[{**item, "brand": brand} for item in top] for top in per_query]
+
+        with stage("memory.search_many"), ThreadPoolExecutor(max_workers=min(len(brands), 8)) as pool:
+            per_brand = list(pool.map(run, brands))
+
+        merged: list[list[dict[str, Any]]] = []
+        for i in range(len(queries)):
+            items = [item for per_query in per_brand for item in per_query[i]]
+            items.sort(key=lambda x: x["combined_score"], reverse=True)
+            merged.append(items[:k])
+            if kind == "notes":
+                self._count_access(merged[i])
+        return merged
+
+    def _top_k(
+        self,
+        kind: str,
+        query: Query,
+        brand_namespace: str,
+        k: int,
+        category_filter: str | None,
+        now: datetime | None,
+        as_of: datetime | None,
+    ) -> list[dict[str, Any]]:
+        """Exact top-k of one brand's {kind} collection by combined score."""
+        return self._top_k_many(kind, [query], brand_namespace, k, category_filter, now, as_of)[0]
 
-            similarity = item.get("similarity", 0.5)
-            combined = compute_combined_score(similarity, created_at, now=now)
-            item["combined_score"] = combined
-            scored.append(item)
+    def _top_k_many(
+        self,
+        kind: str,
+        queries: Sequence[Query],
+        brand_namespace: str,
+        k: int,
+        category_filter: str | None,
+        now: datetime | None,
+        as_of: datetime | None,
+    ) -> list[list[dict[str, Any]]]:
+        """_top_k for several queries over the same collection(s), batched.
+
+        As-of note searches also cover the cold tier (src.memory.tiering)
+        and the consolidation archive: an archived note is eligible while
+        the as-of date is before its consolidated summary existed
+        (superseded_at_ts, see src.memory.consolidation).
+        """
+        if as_of is not None:
+            now = as_of
+        now_ts = to_epoch(now or datetime.utcnow())
+        if kind != "notes":
+            category_filter = None  # triplets carry no category
+
+        if kind != "notes":
+            tiers = [(f"{brand_namespace}_{kind}", None)]
+        elif as_of is None:
+            tiers = [(notes_collection(brand_namespace), None)]
+        else:
+            tiers = [
+                (notes_collection(brand_namespace), None),
+                (notes_collection(brand_namespace, cold=True), None),
+                (archive_collection(brand_namespace), {"superseded_at_ts": {"$gt": to_epoch(as_of)}}),
+            ]
+        top: list[list[dict[str, Any]]] = [[] for _ in queries]
+        for tier, (collection, extra) in enumerate(tiers):
+            total = self.vector_store.count(collection)
+            if tier and total == 0:
+                continue
+            where = self.vector_store.where_clause(collection, category_filter, as_of, extra)
+
+            def search(m: int, active: list[int], collection: str = collection, where: dict | None = where):
+                return self.vector_store.query_many(collection, [queries[q] for q in active], k=m, where=where)
+
+            def fetch_ids(ids: list[list[str]], active: list[int], collection: str = collection, where: dict | None = where):
+                # Recency-stream ids are filtered by the same clause as the similarity stream.
+                return self.vector_store.query_ids_many(collection, [queries[q] for q in active], ids, where=where)
+
+            recent = self.vector_store.recency_index(collection).stream(
+                now_ts,
+                as_of_ts=to_epoch(as_of) if as_of is not None else None,
+                category=category_filter,
+            )
+            per_query = threshold_top_k_many(
+                k,
+                len(queries),
+                fetch_similar=lambda n, active, search=search, total=total: self._fetch_eligible(
+                    lambda m: search(m, active), want=n, total=total,
+                ),
+                recent=recent,
+                fetch_ids=fetch_ids,
+                score=lambda items: score_items(items, now_ts, with_weight=kind == "notes"),
+                first_depth=k * 2,
+            )
+            for acc, items in zip(top, per_query):
+                acc.extend(items)
+        if len(tiers) > 1:
+            for acc in top:
+                acc.sort(key=lambda x: x["combined_score"], reverse=True)
+        return [acc[:k] for acc in top]
+
+    def _count_access(self, items: list[dict[str, Any]]) -> None:
+        for item in items:
+            note = self._notes_cache.get(item["id"])
+            if note:
+                note.access_count += 1
 
-        scored.sort(key=lambda x: x["combined_score"], reverse=True)
-        return scored[:k]
+    @staticmethod
+    def _fetch_eligible(
+        fetch: Callable[[int], list[list[dict[str, Any]]]],
+        want: int,
+        total: int,
+    ) -> list[list[dict[str, Any]]]:
+        """Call fetch(n) (one row list per query), doubling n until every
+        query gets *want* rows back or *total* is reached.
+
+        Filtered HNSW queries can return fewer rows than requested when the
+        filter is selective; widening keeps as-of results from running short.
+        Without a filter this is a single fetch.
+        """
+        n = want
+        while True:
+            batches = fetch(n)
+            if all(len(rows) >= want for rows in batches) or n >= total:
+                return batches
+            n *= 2
 
     def expand_with_graph(
         self,
@@ -192,57 +312,59 @@ class BrandMemorySystem:
 
     def build_context_injection(
         self,
-        query: str,
+        query: Query,
         brand_namespace: BrandNamespace,
         now: datetime | None = None,
+        token_budget: int = CONTEXT_TOKEN_BUDGET,
     ) -> str:
-        """Build a memory context string for agent prompt injection."""
+        """Build a memory context string for agent prompt injection.
+
+        Candidates from notes, triplets, graph expansion and shared notes
+        are deduplicated and packed into *token_budget* by combined score
+        (see src.memory.context_packer). *query* may be a precomputed
+        embedding.
+        """
+        now_ts = to_epoch(now or datetime.utcnow())
+
         # 1. Search notes
-        notes = self.search(query, brand_namespace, k=5, now=now)
+        notes = self.search(query, brand_namespace, k=10, now=now)
 
         # 2. Search triplets
-        triplets = self.get_weighted_triplets(query, brand_namespace, k=10, now=now)
+        triplets = self.get_weighted_triplets(query, brand_namespace, k=20, now=now)
 
-        # 3. Extract entities from top triplets for graph expansion
-        entities = set()
+        # 3. Extract entities from top triplets for graph expansion;
+        #    an entity inherits the best similarity among its anchor triplets
+        anchor_similarity: dict[str, float] = {}
         for t in triplets[:5]:
             meta = t.get("metadata", {})
-            if meta.get("subject"):
-                entities.add(meta["subject"])
-            if meta.get("object"):
-                entities.add(meta["object"])
-
-        # 4. Graph expansion
-        expanded = self.expand_with_graph(brand_namespace, list(entities), max_hops=1)
+            for entity in (meta.get("subject"), meta.get("object")):
+                if entity:
+                    anchor_similarity[entity] = max(anchor_similarity.get(entity, 0.0), t.get("similarity", 0.0))
+
+        # 4. Graph expansion, scored like a vector hit with the inherited similarity
+        expanded = [
+            {
+                "id": t.id,
+                "document": t.text,
+                "similarity": max(anchor_similarity.get(t.subject, 0.0), anchor_similarity.get(t.object, 0.0)),
+                "metadata": {"created_at_ts": to_epoch(t.created_at)},
+            }
+            for t in self.expand_with_graph(brand_namespace, list(anchor_similarity), max_hops=1)
+        ]
+        score_items(expanded, now_ts)
 
         # 5. Also search shared notes
-        shared = self.vector_store.search_shared_notes(query, k=3)
-
-        # Build context string
-        parts: list[str] = []
-
-        if notes:
-            parts.append("## Brand Memory Notes")
-            for n in notes:
-                score = n.get("combined_score", 0)
-                parts.append(f"- [{score:.2f}] {n.get('document', '')}")
-
-        if triplets:
-            parts.append("\n## Knowledge Graph Facts")
-            for t in triplets[:10]:
-                parts.append(f"- {t.get('document', '')}")
-
-        if expanded:
-            parts.append("\n## Related Knowledge (Graph Expansion)")
-            for t in expanded[:5]:
-                parts.append(f"- {t.text}")
-
-        if shared:
-            parts.append("\n## Industry Context")
-            for s in shared:
-                parts.append(f"- {s.get('document', '')}")
-
-        return "\n".join(parts) if parts else "No relevant memory found."
+        shared = self.vector_store.search_shared_notes(query, k=5)
+        score_items(shared, now_ts)
+
+        items = (
+            [ContextItem(NOTES, n.get("document", ""), n.get("combined_score", 0.0)) for n in notes]
+            + [ContextItem(FACTS, t.get("document", ""), t.get("combined_score", 0.0), t["id"]) for t in triplets]
+            + [ContextItem(EXPANSION, t["document"], t["combined_score"], t["id"]) for t in expanded]
+            + [ContextItem(INDUSTRY, s.get("document", ""), s.get("combined_score", 0.0)) for s in shared]
+        )
+        with stage("memory.context.pack"):
+            return pack_context(items, token_budget)
 
     # ── Stats ─────────────────────────────────────────────────
 
@@ -256,29 +378,20 @@ class BrandMemorySystem:
             "graph_triplets": self.graph_store.triplet_count(brand_namespace),
         }
 
-    async def consolidate_memories(self, brand_namespace: BrandNamespace, category: str) -> MemoryNote | None:
-        """Find redundant notes in a category and consolidate them into a single high-weight note."""
-        from src.llm.gemini_client import summarize_memories
-
-        # 1. Fetch all notes for this brand/category
-        notes = [
-            n for n in self._notes_cache.values()
-            if n.brand_namespace == brand_namespace and n.category == category
-        ]
-
-        if len(notes) < 3:
-            return None
-
-        # 2. Use Gemini to create a consolidated summary
-        note_texts = [n.content for n in notes]
-        summary_content = await summarize_memories(brand_namespace, category, note_texts)
-
-        # 3. Add the new consolidated note
-        consolidated_note = await self.add_note_enriched(
-            content=f"[CONSOLIDATED] {summary_content}",
-            brand_namespace=brand_namespace,
-            category=category,
-            tags=["consolidated", "core_knowledge"],
+    async def consolidate_memories(self, brand_namespace: BrandNamespace, category: str) -> list[MemoryNote]:
+        """Merge near-duplicate notes in a category into consolidated notes.
+
+        Runs one ConsolidationWorker pass (see src.memory.consolidation)
+        without a budget, so the whole category is covered however large
+        the brand is: the merged originals are moved to the brand's archive
+        collection. Returns every consolidated note written.
+        """
+        from .consolidation import ConsolidationBudget, ConsolidationWorker
+
+        worker = ConsolidationWorker(
+            self,
+            brands=[brand_namespace],
+            categories=[category],
+            budget=ConsolidationBudget.unbounded(),
         )
-
-        return consolidated_note
+        return await worker.run_once()
@@ -0,0 +1,265 @@
+"""Exact top-k retrieval under the combined similarity + temporal score.
+
+Fagin's threshold algorithm over two sorted streams of one collection:
+  - similarity: Chroma nearest neighbours, fetched as doubling prefixes
+  - recency: a RecencyIndex, yielding ids in descending temporal weight
+
+Every id seen on either stream is scored exactly (a restricted Chroma query
+supplies the similarity of recency-only ids). Once the k-th best score
+reaches
+
+    sim_weight * (last similarity seen) + temp_weight * (last weight seen)
+
+no unseen item can beat it and the top-k is final. A recent, moderately
+similar note is therefore found even when it sits far down the similarity
+ranking, without guessing an over-fetch factor.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import math
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime
+from typing import Any
+
+from src.config import SIMILARITY_WEIGHT, TEMPORAL_WEIGHT
+from .temporal_decay import effective_alpha, score_batch, to_epoch
+
+
+def decay_params(meta: dict[str, Any] | None) -> tuple[float | None, float]:
+    """(created_at epoch seconds, effective alpha) of a row.
+
+    Reads the precomputed created_at_ts / decay_alpha metadata and falls
+    back to parsing created_at and mapping significance for older rows.
+    The timestamp is None when created_at is missing or malformed.
+    """
+    meta = meta or {}
+    alpha = meta.get("decay_alpha")
+    if alpha is None:
+        alpha = effective_alpha(meta.get("significance", 0.5))
+    ts = meta.get("created_at_ts")
+    if ts is None and meta.get("created_at"):
+        try:
+            ts = to_epoch(datetime.fromisoformat(meta["created_at"]))
+        except ValueError:
+            ts = None
+    return ts, alpha
+
+
+def score_items(items: list[dict[str, Any]], now_ts: float, with_weight: bool = False) -> None:
+    """Set combined_score (and temporal_weight) on a result batch in place.
+
+    Undated rows count as just created.
+    """
+    if not items:
+        return
+    params = [decay_params(item.get("metadata")) for item in items]
+    combined, weights = score_batch(
+        [item.get("similarity", 0.5) for item in items],
+        [now_ts if ts is None else ts for ts, _ in params],
+        [alpha for _, alpha in params],
+        now_ts,
+    )
+    for item, score in zip(items, combined.tolist()):
+        item["combined_score"] = score
+    if with_weight:
+        for item, weight in zip(items, weights.tolist()):
+            item["temporal_weight"] = weight
+
+
+class RecencyIndex:
+    """In-memory (created_at, decay rate) index over one collection.
+
+    Rows are grouped by effective alpha; within a group temporal weight is
+    monotone in created_at, so a heap over the group heads yields ids in
+    exact descending weight for any ``now``.
+    """
+
+    def __init__(self) -> None:
+        self._rows: dict[str, tuple[float, float, str | None]] = {}  # id → (ts, alpha, category)
+        self._groups: dict[float, tuple[list[float], list[str]]] | None = None
+
+    @classmethod
+    def from_rows(cls, ids: Iterable[str], metadatas: Iterable[dict[str, Any] | None]) -> RecencyIndex:
+        index = cls()
+        for doc_id, meta in zip(ids, metadatas):
+            index.upsert(doc_id, meta)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._rows
+
+    def ids(self) -> list[str]:
+        return list(self._rows)
+
+    def upsert(self, doc_id: str, meta: dict[str, Any] | None) -> None:
+        ts, alpha = decay_params(meta)
+        # Undated rows sort as newest (weight 1.0) and are never as-of eligible.
+        self._rows[doc_id] = (math.inf if ts is None else ts, alpha, (meta or {}).get("category"))
+        self._groups = None
+
+    def remove(self, doc_id: str) -> None:
+        if self._rows.pop(doc_id, None) is not None:
+            self._groups = None
+
+    def _sorted_groups(self) -> dict[float, tuple[list[float], list[str]]]:
+        """alpha → (negated ts ascending, ids), i.e. newest first."""
+        if self._groups is None:
+            groups: dict[float, list[tuple[float, str]]] = {}
+            for doc_id, (ts, alpha, _) in self._rows.items():
+                groups.setdefault(alpha, []).append((-ts, doc_id))
+            self._groups = {}
+            for alpha, entries in groups.items():
+                entries.sort()
+                self._groups[alpha] = ([e[0] for e in entries], [e[1] for e in entries])
+        return self._groups
+
+    def decayed(self, now_ts: float, threshold: float) -> list[str]:
+        """Ids whose temporal weight at *now_ts* is below *threshold* (oldest per group)."""
+        if threshold <= 0:
+            return []  # weights are never negative
+        found: list[str] = []
+        for alpha, (neg_ts, ids) in self._sorted_groups().items():
+            if alpha <= 0:
+                continue
+            # w < threshold  ⇔  age > ln(1/threshold) / alpha days
+            cutoff_ts = now_ts - math.log(1.0 / threshold) / alpha * 86400
+            found.extend(ids[bisect.bisect_right(neg_ts, -cutoff_ts):])
+        return found
+
+    def stream(
+        self,
+        now_ts: float,
+        as_of_ts: float | None = None,
+        category: str | None = None,
+    ) -> Iterator[tuple[str, float]]:
+        """(id, temporal weight) in descending weight at epoch *now_ts*.
+
+        as_of_ts skips rows created after it (and undated rows); category
+        skips rows of other categories.
+        """
+        groups = self._sorted_groups()
+        rows = self._rows
+        heap: list[tuple[float, float, int]] = []
+
+        def push(alpha: float, pos: int) -> None:
+            neg_ts, ids = groups[alpha]
+            while pos < len(ids) and category is not None and rows[ids[pos]][2] != category:
+                pos += 1
+            if pos < len(ids):
+                age_days = max(now_ts + neg_ts[pos], 0.0) / 86400
+                heapq.heappush(heap, (-math.exp(-alpha * age_days), alpha, pos))
+
+        for alpha, (neg_ts, _) in groups.items():
+            # Newest first: skip everything created after as_of.
+            push(alpha, 0 if as_of_ts is None else bisect.bisect_left(neg_ts, -as_of_ts))
+
+        while heap:
+            neg_weight, alpha, pos = heapq.heappop(heap)
+            yield groups[alpha][1][pos], -neg_weight
+            push(alpha, pos + 1)
+
+
+def threshold_top_k(
+    k: int,
+    fetch_similar: Callable[[int], list[dict[str, Any]]],
+    recent: Iterable[tuple[str, float]],
+    fetch_ids: Callable[[list[str]], list[dict[str, Any]]],
+    score: Callable[[list[dict[str, Any]]], None],
+    first_depth: int | None = None,
+    sim_weight: float = SIMILARITY_WEIGHT,
+    temp_weight: float = TEMPORAL_WEIGHT,
+) -> list[dict[str, Any]]:
+    """Top-k items by ``combined_score``, exact with respect to both streams.
+
+    fetch_similar(n) must return the n most similar eligible items (fewer
+    only when the collection has no more); recent yields eligible ids in
+    descending temporal weight; fetch_ids returns items with similarity for
+    the given ids; score sets ``combined_score`` on a batch of items.
+    Both streams are read to the same depth, doubling from first_depth.
+    """
+    return threshold_top_k_many(
+        k,
+        1,
+        fetch_similar=lambda n, active: [fetch_similar(n)],
+        recent=recent,
+        fetch_ids=lambda ids, active: [fetch_ids(ids[0])],
+        score=score,
+        first_depth=first_depth,
+        sim_weight=sim_weight,
+        temp_weight=temp_weight,
+    )[0]
+
+
+def threshold_top_k_many(
+    k: int,
+    queries: int,
+    fetch_similar: Callable[[int, list[int]], list[list[dict[str, Any]]]],
+    recent: Iterable[tuple[str, float]],
+    fetch_ids: Callable[[list[list[str]], list[int]], list[list[dict[str, Any]]]],
+    score: Callable[[list[dict[str, Any]]], None],
+    first_depth: int | None = None,
+    sim_weight: float = SIMILARITY_WEIGHT,
+    temp_weight: float = TEMPORAL_WEIGHT,
+) -> list[list[dict[str, Any]]]:
+    """threshold_top_k for several queries over one collection, in lockstep.
+
+    Each round makes one fetch_similar(n, active) and at most one
+    fetch_ids(ids_per_query, active) call for all queries still running
+    (*active* holds their indexes; both return one list per active query),
+    so a batch costs the same number of collection round-trips as a single
+    query. The recency stream does not depend on the query and is read
+    once for all of them.
+    """
+    if k <= 0:
+        return [[] for _ in range(queries)]
+    recent = iter(recent)
+    read: list[tuple[str, float]] = []  # recency stream consumed so far
+    recent_done = False
+    seen: list[dict[str, dict[str, Any]]] = [{} for _ in range(queries)]
+    results: list[list[dict[str, Any]]] = [[] for _ in range(queries)]
+    active = list(range(queries))
+    n = max(first_depth or k, 1)
+    while active:
+        similar = fetch_similar(n, active)
+        depth = len(read)
+        while not recent_done and len(read) < n:
+            nxt = next(recent, None)
+            if nxt is None:
+                recent_done = True
+            else:
+                read.append(nxt)
+        new_recent = [doc_id for doc_id, _ in read[depth:]]
+        last_weight = read[-1][1] if len(read) > depth else 0.0
+
+        fresh: list[dict[str, dict[str, Any]]] = []
+        missing: list[list[str]] = []
+        for q, rows in zip(active, similar):
+            found = {item["id"]: item for item in rows if item["id"] not in seen[q]}
+            fresh.append(found)
+            missing.append([d for d in new_recent if d not in seen[q] and d not in found])
+        if any(missing):
+            for found, rows in zip(fresh, fetch_ids(missing, active)):
+                found.update((item["id"], item) for item in rows)
+        score([item for found in fresh for item in found.values()])
+
+        still: list[int] = []
+        for q, rows, found in zip(active, similar, fresh):
+            seen[q].update(found)
+            ranked = sorted(seen[q].values(), key=lambda x: x["combined_score"], reverse=True)
+            if len(rows) < n or recent_done:
+                results[q] = ranked[:k]
+                continue
+            bound = sim_weight * rows[-1].get("similarity", 0.0) + temp_weight * last_weight
+            if len(ranked) >= k and ranked[k - 1]["combined_score"] >= bound:
+                results[q] = ranked[:k]
+            else:
+                still.append(q)
+        active = still
+        n *= 2
+    return results
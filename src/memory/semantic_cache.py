@@ -0,0 +1,139 @@
+"""Semantic cache for assembled memory contexts.
+
+Agents call get_memory_context repeatedly with near-identical queries
+inside one conversation. SemanticCache keeps recent (query embedding →
+context) pairs per (brand, time bucket) and answers a lookup when the new
+query's cosine similarity to a cached one reaches ``threshold``.
+
+- The time bucket (``bucket_seconds``) bounds staleness: temporal decay
+  moves combined scores as time passes, so a cached context is only reused
+  within the bucket it was built in.
+- At most ``max_entries`` contexts are kept, evicting the least recently
+  used.
+- ``version`` ties an entry to the state of the memory it was built from:
+  pass the store's write_version(brand) (src.memory.vector_store), taken
+  before the read, to both store() and lookup(). Any write or move through
+  any store on the same data — another agent's memory instance, the
+  consolidation worker, a cold-tier sweep — changes the version, so the
+  entry stops matching immediately instead of at the end of its bucket.
+- invalidate(brand) drops every entry of a brand explicitly. A context
+  built from a read that started before the invalidation is not stored
+  (pass the generation() taken before the read).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from src.config import (
+    SEMANTIC_CACHE_BUCKET_SECONDS,
+    SEMANTIC_CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_THRESHOLD,
+)
+from .temporal_decay import to_epoch
+
+
+@dataclass
+class _Entry:
+    brand: str
+    bucket: int
+    embedding: Any  # unit numpy vector
+    context: str
+    version: Hashable = None
+
+
+class SemanticCache:
+    """LRU cache of contexts keyed by (brand, time bucket) and query similarity."""
+
+    def __init__(
+        self,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+        bucket_seconds: float = SEMANTIC_CACHE_BUCKET_SECONDS,
+    ) -> None:
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.bucket_seconds = bucket_seconds
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._generation: dict[str, int] = {}  # brand → invalidation count
+        self._next_key = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _bucket(self, now: datetime | None) -> int:
+        return int(to_epoch(now or datetime.utcnow()) // self.bucket_seconds)
+
+    @staticmethod
+    def _unit(embedding: Sequence[float]) -> Any:
+        import numpy as np
+
+        vec = np.asarray(embedding, dtype=np.float64)
+        return vec / (np.linalg.norm(vec) or 1.0)
+
+    def lookup(
+        self,
+        brand: str,
+        embedding: Sequence[float],
+        now: datetime | None = None,
+        version: Hashable = None,
+    ) -> str | None:
+        """Cached context of the most similar query at or above the threshold, built at *version*."""
+        vec = self._unit(embedding)
+        bucket = self._bucket(now)
+        with self._lock:
+            best_key, best_sim = None, self.threshold
+            for key, entry in self._entries.items():
+                if entry.brand != brand or entry.bucket != bucket or entry.version != version:
+                    continue
+                sim = float(vec @ entry.embedding)
+                if sim >= best_sim:
+                    best_key, best_sim = key, sim
+            if best_key is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key].context
+
+    def generation(self, brand: str) -> int:
+        return self._generation.get(brand, 0)
+
+    def store(
+        self,
+        brand: str,
+        embedding: Sequence[float],
+        context: str,
+        now: datetime | None = None,
+        generation: int | None = None,
+        version: Hashable = None,
+    ) -> None:
+        entry = _Entry(brand, self._bucket(now), self._unit(embedding), context, version)
+        with self._lock:
+            if generation is not None and generation != self._generation.get(brand, 0):
+                return  # brand was written to while the context was being built
+            self._entries[self._next_key] = entry
+            self._next_key += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, brand: str) -> int:
+        """Drop every cached context of *brand*. Returns how many were dropped."""
+        with self._lock:
+            self._generation[brand] = self._generation.get(brand, 0) + 1
+            stale = [key for key, entry in self._entries.items() if entry.brand == brand]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,114 +1,426 @@
-"""Session management — tracks conversation context and generates summaries."""
+"""Session management — tracks conversation context and generates summaries.
+
+Sessions are keyed by session id and grouped per user, so concurrent
+conversations do not share an active brand or message history:
+
+  - messages live in a per-session ring buffer (``window`` most recent)
+  - each user has an index of recent session ids in created_at order, so
+    building session context never sorts all sessions
+  - hot sessions are cached in memory (LRU, ``max_cached``) on top of a
+    pluggable SessionStore; SqliteSessionStore persists them locally.
+    Starting a session and changing its brand write through; message
+    buffers are saved on summarize, end_session, eviction and flush
+  - summaries are rolling: summarize_session folds only the messages added
+    since the last fold into the existing summary state, and
+    maybe_summarize does so once they exceed ``summary_token_threshold``;
+    record_message (the root agent's callbacks) runs it on every message
+
+Every method takes ``user_id`` (and optionally ``session_id``); the
+defaults keep the original single-user API working.
+"""
 
 from __future__ import annotations
 
+import json
+import sqlite3
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from pathlib import Path
 
 from .schema import SessionSummary, BrandNamespace
+from .tokens import estimate_tokens
+
+DEFAULT_USER = "default"
+
+
+@dataclass
+class SessionState:
+    """One conversation: its summary record plus the recent message window."""
+    summary: SessionSummary
+    user_id: str = DEFAULT_USER
+    messages: deque = field(default_factory=deque)
+    pending: int = 0  # messages not yet folded into the summary
+    pending_tokens: int = 0
+    summarizing: bool = False  # a fold is awaiting the LLM (not persisted)
+
+    def to_dict(self) -> dict:
+        return {
+            "user_id": self.user_id,
+            "summary": self.summary.to_dict(),
+            "messages": list(self.messages),
+            "pending": self.pending,
+            "pending_tokens": self.pending_tokens,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, window: int) -> SessionState:
+        summary = dict(data["summary"])
+        summary["created_at"] = datetime.fromisoformat(summary["created_at"])
+        return cls(
+            SessionSummary(**summary),
+            data["user_id"],
+            deque(data["messages"], maxlen=window),
+            data.get("pending", 0),
+            data.get("pending_tokens", 0),
+        )
+
+
+# ── Persistence ───────────────────────────────────────────────
+
+class SessionStore:
+    """Persistence backend for SessionManager. This base class keeps nothing."""
+
+    def load(self, session_id: str) -> dict | None:
+        return None
+
+    def save(self, state: SessionState) -> None:
+        pass
+
+    def recent_ids(self, user_id: str, limit: int) -> list[str]:
+        """A user's session ids, oldest first, at most the newest *limit*."""
+        return []
+
+
+class SqliteSessionStore(SessionStore):
+    """Sessions in one sqlite table, indexed by (user_id, created_at)."""
+
+    def __init__(self, path: str | Path) -> None:
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " session_id TEXT PRIMARY KEY, user_id TEXT NOT NULL,"
+                " created_at TEXT NOT NULL, state TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS sessions_user_created ON sessions (user_id, created_at)"
+            )
+
+    def load(self, session_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute("SELECT state FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return json.loads(row[0]) if row else None
 
+    def save(self, state: SessionState) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, user_id, created_at, state) VALUES (?, ?, ?, ?)",
+                (
+                    state.summary.session_id,
+                    state.user_id,
+                    state.summary.created_at.isoformat(),
+                    json.dumps(state.to_dict(), ensure_ascii=False),
+                ),
+            )
+
+    def recent_ids(self, user_id: str, limit: int) -> list[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT session_id FROM sessions WHERE user_id = ? ORDER BY created_at DESC LIMIT ?",
+                (user_id, limit),
+            ).fetchall()
+        return [r[0] for r in reversed(rows)]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+# ── Manager ───────────────────────────────────────────────────
 
 class SessionManager:
     """Manages conversation sessions and context injection."""
 
-    def __init__(self) -> None:
-        self._sessions: dict[str, SessionSummary] = {}
-        self._active_session_id: str | None = None
-        self._active_brand: BrandNamespace | None = None
-        self._message_buffer: list[dict[str, str]] = []
+    def __init__(
+        self,
+        store: SessionStore | None = None,
+        window: int = 50,
+        max_cached: int = 1024,
+        recent_per_user: int = 16,
+        summary_token_threshold: int = 1000,
+        generate: Callable[..., Awaitable[str]] | None = None,
+    ) -> None:
+        self._store = store or SessionStore()
+        self._summary_token_threshold = summary_token_threshold
+        self._generate = generate  # None → src.llm.gemini_client.generate_text
+        self._window = window
+        self._max_cached = max_cached
+        self._recent_per_user = recent_per_user
+        self._cache: OrderedDict[str, SessionState] = OrderedDict()  # session_id → state, LRU order
+        self._recent: dict[str, deque[str]] = {}  # user_id → session ids, oldest first
+        self._active: dict[str, str] = {}  # user_id → active session id
+        self._lock = threading.RLock()
+
+    # ── Lookup ────────────────────────────────────────────────
+
+    def _state(self, session_id: str) -> SessionState | None:
+        state = self._cache.get(session_id)
+        if state is not None:
+            self._cache.move_to_end(session_id)
+            return state
+        data = self._store.load(session_id)
+        if data is None:
+            return None
+        state = SessionState.from_dict(data, self._window)
+        self._remember(state)
+        return state
+
+    def _remember(self, state: SessionState) -> None:
+        self._cache[state.summary.session_id] = state
+        self._cache.move_to_end(state.summary.session_id)
+        while len(self._cache) > self._max_cached:
+            _, evicted = self._cache.popitem(last=False)
+            self._store.save(evicted)
+
+    def _recent_ids(self, user_id: str) -> deque[str]:
+        if user_id not in self._recent:
+            self._recent[user_id] = deque(
+                self._store.recent_ids(user_id, self._recent_per_user), maxlen=self._recent_per_user,
+            )
+        return self._recent[user_id]
+
+    def _current(self, user_id: str, session_id: str | None) -> SessionState | None:
+        sid = session_id or self._active.get(user_id)
+        return self._state(sid) if sid else None
+
+    # ── Active brand ──────────────────────────────────────────
+
+    def get_active_brand(self, user_id: str = DEFAULT_USER, session_id: str | None = None) -> BrandNamespace | None:
+        with self._lock:
+            state = self._current(user_id, session_id)
+            return state.summary.brand_namespace if state else None
+
+    def set_active_brand(
+        self,
+        brand: BrandNamespace | None,
+        user_id: str = DEFAULT_USER,
+        session_id: str | None = None,
+    ) -> None:
+        """Set the brand of the user's current (or the given) session, starting one if needed."""
+        with self._lock:
+            state = self._current(user_id, session_id)
+            if state is None:
+                self.start_session(brand, user_id=user_id, session_id=session_id)
+            else:
+                state.summary.brand_namespace = brand
+                self._active[user_id] = state.summary.session_id
+                self._store.save(state)
 
     @property
     def active_brand(self) -> BrandNamespace | None:
-        return self._active_brand
+        return self.get_active_brand()
 
     @active_brand.setter
     def active_brand(self, brand: BrandNamespace | None) -> None:
-        self._active_brand = brand
-
-    def start_session(self, brand_namespace: BrandNamespace | None = None) -> str:
-        """Start a new session, returns session_id."""
-        session = SessionSummary(brand_namespace=brand_namespace)
-        self._sessions[session.session_id] = session
-        self._active_session_id = session.session_id
-        self._active_brand = brand_namespace
-        self._message_buffer = []
-        return session.session_id
-
-    def add_message(self, role: str, content: str) -> None:
-        """Buffer a message in the current session."""
-        self._message_buffer.append({
-            "role": role,
-            "content": content,
-            "timestamp": datetime.utcnow().isoformat(),
-        })
-
-    def get_current_session(self) -> SessionSummary | None:
-        if self._active_session_id:
-            return self._sessions.get(self._active_session_id)
-        return None
+        self.set_active_brand(brand)
 
-    async def summarize_session(self) -> SessionSummary | None:
-        """Summarize the current session using Gemini."""
-        if not self._active_session_id or not self._message_buffer:
-            return None
+    # ── Sessions ──────────────────────────────────────────────
 
-        from src.llm.gemini_client import generate_text
+    def start_session(
+        self,
+        brand_namespace: BrandNamespace | None = None,
+        user_id: str = DEFAULT_USER,
+        session_id: str | None = None,
+    ) -> str:
+        """Start a new session (optionally with a caller-chosen id), returns session_id."""
+        with self._lock:
+            summary = SessionSummary(brand_namespace=brand_namespace)
+            if session_id:
+                summary.session_id = session_id
+            state = SessionState(summary, user_id, deque(maxlen=self._window))
+            self._remember(state)
+            recent = self._recent_ids(user_id)
+            if summary.session_id in recent:
+                recent.remove(summary.session_id)
+            recent.append(summary.session_id)
+            self._active[user_id] = summary.session_id
+            self._store.save(state)  # listed in recent_ids even if the process restarts
+            return summary.session_id
 
-        messages_text = "\n".join(
-            f"[{m['role']}]: {m['content']}" for m in self._message_buffer[-20:]
-        )
+    def add_message(
+        self,
+        role: str,
+        content: str,
+        user_id: str = DEFAULT_USER,
+        session_id: str | None = None,
+    ) -> None:
+        """Buffer a message in the user's current (or the given) session."""
+        with self._lock:
+            state = self._current(user_id, session_id)
+            if state is None:
+                return
+            if len(state.messages) == state.messages.maxlen and state.pending == len(state.messages):
+                # The oldest unfolded message leaves the window without being summarized.
+                state.pending -= 1
+                state.pending_tokens = max(state.pending_tokens - estimate_tokens(state.messages[0]["content"]), 0)
+            state.messages.append({
+                "role": role,
+                "content": content,
+                "timestamp": datetime.utcnow().isoformat(),
+            })
+            state.pending += 1
+            state.pending_tokens += estimate_tokens(content)
+
+    async def record_message(
+        self,
+        role: str,
+        content: str,
+        user_id: str = DEFAULT_USER,
+        session_id: str | None = None,
+    ) -> SessionSummary | None:
+        """add_message for a live conversation, then maybe_summarize.
+
+        Starts the session when *session_id* is not known yet. Returns the
+        summary when this message triggered a fold.
+        """
+        with self._lock:
+            if self._current(user_id, session_id) is None:
+                if session_id is None:
+                    return None
+                self.start_session(user_id=user_id, session_id=session_id)
+            self.add_message(role, content, user_id=user_id, session_id=session_id)
+        return await self.maybe_summarize(user_id, session_id)
+
+    def get_current_session(self, user_id: str = DEFAULT_USER) -> SessionSummary | None:
+        with self._lock:
+            state = self._current(user_id, None)
+            return state.summary if state else None
+
+    def get_messages(self, user_id: str = DEFAULT_USER, session_id: str | None = None) -> list[dict[str, str]]:
+        with self._lock:
+            state = self._current(user_id, session_id)
+            return list(state.messages) if state else []
+
+    async def summarize_session(
+        self,
+        user_id: str = DEFAULT_USER,
+        session_id: str | None = None,
+    ) -> SessionSummary | None:
+        """Fold messages added since the last fold into the session summary.
+
+        Only the new messages and the current summary state are sent to the
+        LLM, so prompt size does not grow with the conversation and early
+        context is carried forward instead of overwritten.
+
+        At most one fold per session is in flight: a call made while another
+        is awaiting the LLM returns the current summary and leaves the new
+        messages pending for the next fold.
+        """
+        with self._lock:
+            state = self._current(user_id, session_id)
+            if state is None or not state.messages:
+                return None
+            session = state.summary
+            if state.pending == 0 or state.summarizing:
+                return session
+            state.summarizing = True
+            new_messages = list(state.messages)[-state.pending:]
+            folded, folded_tokens = len(new_messages), state.pending_tokens
+            current = (session.summary, list(session.key_decisions), list(session.topics_discussed))
+
+        try:
+            return await self._fold(state, new_messages, folded, folded_tokens, current)
+        finally:
+            state.summarizing = False
+
+    async def _fold(
+        self,
+        state: SessionState,
+        new_messages: list[dict],
+        folded: int,
+        folded_tokens: int,
+        current: tuple[str, list[str], list[str]],
+    ) -> SessionSummary:
+        """Summarize one snapshot of pending messages and merge the result under the lock."""
+        generate = self._generate
+        if generate is None:
+            from src.llm.gemini_client import generate_text as generate
+
+        summary_text, decisions, topics = current
+        messages_text = "\n".join(f"[{m['role']}]: {m['content']}" for m in new_messages)
 
         prompt = (
-            "Summarize the following Korean liquor brand conversation. "
-            "Extract: 1) A brief summary (2-3 sentences), "
-            "2) Key decisions made, 3) Topics discussed.\n\n"
+            "You maintain a running summary of a Korean liquor brand conversation. "
+            "Update it with the new messages below: keep earlier facts, decisions and "
+            "topics that still apply, add new ones, and drop anything the new messages "
+            "reverse. The summary stays brief (2-3 sentences).\n\n"
             "Format your response as:\n"
             "SUMMARY: <summary>\n"
             "DECISIONS: <comma-separated decisions>\n"
             "TOPICS: <comma-separated topics>\n\n"
-            f"Conversation:\n{messages_text}"
+            "Current state:\n"
+            f"SUMMARY: {summary_text or '(none yet)'}\n"
+            f"DECISIONS: {', '.join(decisions)}\n"
+            f"TOPICS: {', '.join(topics)}\n\n"
+            f"New messages:\n{messages_text}"
         )
 
-        result = await generate_text(prompt, temperature=0.3)
-
-        session = self._sessions[self._active_session_id]
-        for line in result.split("\n"):
-            line = line.strip()
-            if line.startswith("SUMMARY:"):
-                session.summary = line[len("SUMMARY:"):].strip()
-            elif line.startswith("DECISIONS:"):
-                session.key_decisions = [
-                    d.strip() for d in line[len("DECISIONS:"):].split(",") if d.strip()
-                ]
-            elif line.startswith("TOPICS:"):
-                session.topics_discussed = [
-                    t.strip() for t in line[len("TOPICS:"):].split(",") if t.strip()
-                ]
-
-        return session
-
-    def get_session_context(self) -> str:
-        """Build context from recent sessions for prompt injection."""
-        recent = sorted(
-            self._sessions.values(),
-            key=lambda s: s.created_at,
-            reverse=True,
-        )[:3]
+        result = await generate(prompt, temperature=0.3)
+
+        with self._lock:
+            session = state.summary
+            for line in result.split("\n"):
+                line = line.strip()
+                if line.startswith("SUMMARY:"):
+                    session.summary = line[len("SUMMARY:"):].strip()
+                elif line.startswith("DECISIONS:"):
+                    session.key_decisions = [
+                        d.strip() for d in line[len("DECISIONS:"):].split(",") if d.strip()
+                    ]
+                elif line.startswith("TOPICS:"):
+                    session.topics_discussed = [
+                        t.strip() for t in line[len("TOPICS:"):].split(",") if t.strip()
+                    ]
+
+            # Messages that arrived while the LLM call was in flight stay pending.
+            state.pending = max(state.pending - folded, 0)
+            state.pending_tokens = max(state.pending_tokens - folded_tokens, 0)
+            self._store.save(state)
+            return session
+
+    async def maybe_summarize(
+        self,
+        user_id: str = DEFAULT_USER,
+        session_id: str | None = None,
+    ) -> SessionSummary | None:
+        """summarize_session once the unfolded messages exceed the token threshold."""
+        state = self._current(user_id, session_id)
+        if state is None or state.pending_tokens < self._summary_token_threshold:
+            return None
+        return await self.summarize_session(user_id, session_id)
+
+    def get_session_context(self, user_id: str = DEFAULT_USER) -> str:
+        """Build context from the user's recent sessions for prompt injection."""
+        with self._lock:
+            recent = [s for s in (self._state(sid) for sid in reversed(self._recent_ids(user_id))) if s][:3]
 
         if not recent:
             return ""
 
         parts = ["## Recent Session Context"]
-        for s in recent:
+        for state in recent:
+            s = state.summary
             if s.summary:
                 parts.append(f"- Session {s.session_id[:8]}: {s.summary}")
                 if s.key_decisions:
                     parts.append(f"  Decisions: {', '.join(s.key_decisions)}")
         return "\n".join(parts)
 
-    def end_session(self) -> str | None:
-        """End the current session and return the session_id."""
-        sid = self._active_session_id
-        self._active_session_id = None
-        self._message_buffer = []
-        return sid
+    def end_session(self, user_id: str = DEFAULT_USER) -> str | None:
+        """End the user's current session, persist it and return the session_id."""
+        with self._lock:
+            sid = self._active.pop(user_id, None)
+            state = self._state(sid) if sid else None
+            if state is not None:
+                state.messages.clear()  # ended sessions keep only their summary
+                self._store.save(state)
+            return sid
+
+    def flush(self) -> None:
+        """Persist every cached session."""
+        with self._lock:
+            for state in self._cache.values():
+                self._store.save(state)
@@ -12,11 +12,30 @@ w_i = e^(-α · x_i)
 from __future__ import annotations
 
 import math
-from datetime import datetime, timedelta
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import Any
 
 from src.config import TEMPORAL_DECAY_ALPHA, SIMILARITY_WEIGHT, TEMPORAL_WEIGHT
 
 
+def to_epoch(dt: datetime) -> float:
+    """Epoch seconds. Naive datetimes are UTC (see MemoryNote)."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def effective_alpha(significance: float = 0.5, alpha: float = TEMPORAL_DECAY_ALPHA) -> float:
+    """Decay rate after the significance adjustment, piecewise linear:
+
+    0.0 → 2.0·α, 0.5 → α, 1.0 → 0.1·α
+    """
+    if significance >= 0.5:
+        return alpha * (1.0 - (significance - 0.5) * 1.8)
+    return alpha * (2.0 - significance * 2.0)
+
+
 def compute_temporal_weight(
     created_at: datetime,
     now: datetime | None = None,
@@ -33,25 +52,8 @@ def compute_temporal_weight(
     """
     if now is None:
         now = datetime.utcnow()
-    
-    # Adjust alpha based on significance
-    # If sig=1.0, adj_alpha = alpha * 0.1
-    # If sig=0.5, adj_alpha = alpha * 1.0
-    # If sig=0.0, adj_alpha = alpha * 2.0
-    adj_alpha = alpha * (2.0 - 1.8 * significance) if significance > 0.5 else alpha * (2.0 - 2.0 * significance + 1.0)
-    # Simpler linear mapping for hackathon clarity:
-    # 0.0 -> 2.0*alpha
-    # 0.5 -> 1.0*alpha
-    # 1.0 -> 0.1*alpha
-    if significance >= 0.5:
-        # Map [0.5, 1.0] to [1.0, 0.1]
-        adj_alpha = alpha * (1.0 - (significance - 0.5) * 1.8)
-    else:
-        # Map [0.0, 0.5] to [2.0, 1.0]
-        adj_alpha = alpha * (2.0 - significance * 2.0)
-
     delta_days = max((now - created_at).total_seconds() / 86400, 0.0)
-    return math.exp(-adj_alpha * delta_days)
+    return math.exp(-effective_alpha(significance, alpha) * delta_days)
 
 
 def compute_combined_score(
@@ -74,3 +76,23 @@ def compute_combined_score(
 def half_life_days(alpha: float = TEMPORAL_DECAY_ALPHA) -> float:
     """Return the number of days until weight drops to 0.5."""
     return math.log(2) / alpha
+
+
+def score_batch(
+    similarity: Sequence[float],
+    created_ts: Sequence[float],
+    alpha_eff: Sequence[float],
+    now_ts: float,
+    sim_weight: float = SIMILARITY_WEIGHT,
+    temp_weight: float = TEMPORAL_WEIGHT,
+) -> tuple[Any, Any]:
+    """compute_combined_score over a whole result batch in one numpy pass.
+
+    Takes epoch seconds and effective alphas (as stored in row metadata)
+    instead of datetimes; returns (combined scores, temporal weights).
+    """
+    import numpy as np
+
+    age_days = np.maximum(now_ts - np.asarray(created_ts, dtype=np.float64), 0.0) / 86400
+    weights = np.exp(-np.asarray(alpha_eff, dtype=np.float64) * age_days)
+    return sim_weight * np.asarray(similarity, dtype=np.float64) + temp_weight * weights, weights
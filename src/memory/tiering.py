@@ -0,0 +1,65 @@
+"""Hot/cold tiering of brand notes by temporal weight.
+
+With the default alpha a significance-0.5 note decays below weight 0.01 in
+about 230 days, yet it stays in ``{brand}_notes`` and every ANN query keeps
+paying for it. TieringPolicy.sweep moves such notes to
+``{brand}_notes_cold`` (embeddings kept, ``tiered_at`` added). Notes at or
+above ``pinned_significance`` (foundational, 1.0 by default) always stay
+hot.
+
+Present-time searches only read the hot tier. As-of searches
+(BrandMemorySystem.search(as_of=...)) read both tiers, since a note that
+is cold today may have been fresh at the as-of date. restore() moves notes
+back explicitly, clearing ``tiered_at`` and setting ``restored_at``; a
+restored note is pinned hot and later sweeps leave it alone.
+ConsolidationWorker runs a sweep per brand on each pass when given a
+policy (the API server's worker does, see COLD_TIERING_ENABLED).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from src.config import COLD_TIER_WEIGHT_THRESHOLD
+from .temporal_decay import compute_temporal_weight, to_epoch
+from .vector_store import BrandVectorStore, notes_collection
+
+
+@dataclass
+class TieringPolicy:
+    weight_threshold: float = COLD_TIER_WEIGHT_THRESHOLD
+    pinned_significance: float = 1.0
+
+    def sweep(self, store: BrandVectorStore, brand_namespace: str, now: datetime | None = None) -> list[str]:
+        """Demote hot notes whose weight fell below the threshold. Returns the moved ids."""
+        now = now or datetime.utcnow()
+        hot = notes_collection(brand_namespace)
+        candidates = store.recency_index(hot).decayed(to_epoch(now), self.weight_threshold)
+        demote: list[str] = []
+        for row in store.get_rows(hot, candidates):
+            meta = row["metadata"]
+            significance = meta.get("significance", 0.5)
+            if significance >= self.pinned_significance or "restored_at" in meta:
+                continue
+            created_at = datetime.fromisoformat(meta["created_at"])
+            if compute_temporal_weight(created_at, now=now, significance=significance) < self.weight_threshold:
+                demote.append(row["id"])
+        store.move_rows(hot, notes_collection(brand_namespace, cold=True), demote, metadata={"tiered_at": now.isoformat()})
+        return demote
+
+    @staticmethod
+    def restore(
+        store: BrandVectorStore,
+        brand_namespace: str,
+        ids: list[str],
+        now: datetime | None = None,
+    ) -> int:
+        """Move cold notes back to the hot tier and pin them there. Returns how many were moved."""
+        return store.move_rows(
+            notes_collection(brand_namespace, cold=True),
+            notes_collection(brand_namespace),
+            ids,
+            metadata={"restored_at": (now or datetime.utcnow()).isoformat()},
+            drop_metadata=("tiered_at",),
+        )
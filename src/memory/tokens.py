@@ -0,0 +1,8 @@
+"""Cheap token estimates for prompt budgeting (no tokenizer dependency)."""
+
+from __future__ import annotations
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly 4 UTF-8 bytes per token: ~4 chars for English, ~1.3 for Hangul."""
+    return (len(text.encode("utf-8")) + 3) // 4
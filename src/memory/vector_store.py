@@ -2,13 +2,70 @@
 
 from __future__ import annotations
 
+import os
+import threading
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Any
 
 import chromadb
 from chromadb.config import Settings
 
 from src.config import CHROMA_PERSIST_DIR
+from .retrieval import RecencyIndex
 from .schema import MemoryNote, KGTriplet
+from .temporal_decay import effective_alpha, to_epoch
+
+
+Query = str | Sequence[float]  # query text, or an embedding from BrandVectorStore.embed
+
+
+def _query_input(query: Query) -> dict[str, Any]:
+    return _queries_input([query])
+
+
+def _queries_input(queries: Sequence[Query]) -> dict[str, Any]:
+    """Chroma query kwargs for a batch (all texts or all embeddings)."""
+    if all(isinstance(q, str) for q in queries):
+        return {"query_texts": list(queries)}
+    return {"query_embeddings": list(queries)}
+
+
+def notes_collection(brand_namespace: str, cold: bool = False) -> str:
+    """Hot notes collection, or its cold tier (see src.memory.tiering)."""
+    return f"{brand_namespace}_notes_cold" if cold else f"{brand_namespace}_notes"
+
+
+class _StoreState:
+    """In-process state shared by every BrandVectorStore over one persist dir."""
+
+    def __init__(self) -> None:
+        self.recency: dict[str, RecencyIndex] = {}
+        self.writes: dict[str, int] = {}  # collection → in-process write/move count
+        self.lock = threading.Lock()
+
+    def bump(self, *collections: str) -> None:
+        with self.lock:
+            for name in collections:
+                self.writes[name] = self.writes.get(name, 0) + 1
+
+
+_states: dict[str, _StoreState] = {}
+_states_lock = threading.Lock()
+
+
+def _store_state(persist_dir: str) -> _StoreState:
+    key = os.path.realpath(persist_dir)
+    with _states_lock:
+        return _states.setdefault(key, _StoreState())
+
+
+def _where(*clauses: dict | None) -> dict | None:
+    present = [c for c in clauses if c]
+    if not present:
+        return None
+    return present[0] if len(present) == 1 else {"$and": present}
 
 
 class BrandVectorStore:
@@ -17,52 +74,111 @@ class BrandVectorStore:
     Each brand gets two collections:
       - {brand}_notes: MemoryNote embeddings
       - {brand}_triplets: KGTriplet text embeddings
+
+    created_at is stored twice: as an ISO string (display) and as epoch
+    seconds in created_at_ts, which as-of queries filter on inside Chroma.
+    decay_alpha holds the significance-adjusted decay rate, so re-ranking
+    scores a result batch without parsing dates or re-deriving alphas.
+
+    search_many() embeds several queries once and searches many brands'
+    collections concurrently. query_many() / query_ids_many() are the
+    batched primitives: one Chroma call per collection for any number of
+    queries.
+
+    recency_index() keeps an in-memory RecencyIndex per collection for exact
+    top-k retrieval (see src.memory.retrieval). It is shared by every store
+    opened on the same persist dir in this process and kept current by the
+    write paths; when the collection's row count no longer matches (rows
+    written by another process or directly through Chroma) it is reloaded.
     """
 
-    def __init__(self, persist_dir: str = CHROMA_PERSIST_DIR) -> None:
+    def __init__(self, persist_dir: str = CHROMA_PERSIST_DIR, embedding_function: Any = None) -> None:
+        self.persist_dir = persist_dir
         self._client = chromadb.Client(Settings(
             persist_directory=persist_dir,
             anonymized_telemetry=False,
             is_persistent=True,
         ))
+        self._embedding_function = embedding_function  # None → Chroma default (set on first embed())
         self._collections: dict[str, chromadb.Collection] = {}
+        self._epoch_ready: set[str] = set()
+        self._state = _store_state(persist_dir)
+        self._recency = self._state.recency  # shared per persist dir
 
     def _get_collection(self, name: str) -> chromadb.Collection:
         if name not in self._collections:
+            kwargs = {"embedding_function": self._embedding_function} if self._embedding_function else {}
             self._collections[name] = self._client.get_or_create_collection(
                 name=name,
                 metadata={"hnsw:space": "cosine"},
+                **kwargs,
             )
         return self._collections[name]
 
+    def _created_before(self, coll: chromadb.Collection, as_of: datetime | None) -> dict | None:
+        """Where-clause for created_at <= as_of, backfilling legacy rows once."""
+        if as_of is None:
+            return None
+        if coll.name not in self._epoch_ready:
+            self._backfill_epochs(coll)
+            self._epoch_ready.add(coll.name)
+        return {"created_at_ts": {"$lte": to_epoch(as_of)}}
+
+    @staticmethod
+    def _backfill_epochs(coll: chromadb.Collection) -> None:
+        """Add created_at_ts to rows written before it existed."""
+        rows = coll.get(include=["metadatas"])
+        ids, metadatas = [], []
+        for doc_id, meta in zip(rows["ids"], rows["metadatas"] or []):
+            if not meta or "created_at_ts" in meta or not meta.get("created_at"):
+                continue
+            try:
+                ts = to_epoch(datetime.fromisoformat(meta["created_at"]))
+            except ValueError:
+                continue
+            ids.append(doc_id)
+            metadatas.append({**meta, "created_at_ts": ts})
+        if ids:
+            coll.update(ids=ids, metadatas=metadatas)
+
+    def _upsert(self, name: str, doc_id: str, document: str, metadata: dict[str, Any]) -> None:
+        self._get_collection(name).upsert(ids=[doc_id], documents=[document], metadatas=[metadata])
+        self._state.bump(name)
+        if name in self._recency:
+            self._recency[name].upsert(doc_id, metadata)
+
     # ── Notes ──────────────────────────────────────────────────
 
     def add_note(self, note: MemoryNote) -> None:
-        coll = self._get_collection(f"{note.brand_namespace}_notes")
-        coll.upsert(
-            ids=[note.id],
-            documents=[note.content],
-            metadatas=[{
-                "category": note.category,
-                "tags": ",".join(note.tags),
-                "keywords": ",".join(note.keywords),
-                "created_at": note.created_at.isoformat(),
-                "brand_namespace": note.brand_namespace,
-                "significance": note.significance,
-            }],
-        )
+        self._upsert(f"{note.brand_namespace}_notes", note.id, note.content, {
+            "category": note.category,
+            "tags": ",".join(note.tags),
+            "keywords": ",".join(note.keywords),
+            "created_at": note.created_at.isoformat(),
+            "created_at_ts": to_epoch(note.created_at),
+            "brand_namespace": note.brand_namespace,
+            "significance": note.significance,
+            "decay_alpha": effective_alpha(note.significance),
+        })
 
     def search_notes(
         self,
         brand_namespace: str,
-        query: str,
+        query: Query,
         k: int = 10,
         category_filter: str | None = None,
+        as_of: datetime | None = None,
+        cold: bool = False,
     ) -> list[dict[str, Any]]:
-        coll = self._get_collection(f"{brand_namespace}_notes")
-        where = {"category": category_filter} if category_filter else None
+        """Nearest notes; with as_of, only notes created at or before it.
+
+        cold=True searches the brand's cold tier instead of the hot collection.
+        """
+        collection = notes_collection(brand_namespace, cold)
+        coll = self._get_collection(collection)
+        where = self.where_clause(collection, category_filter, as_of)
         results = coll.query(
-            query_texts=[query],
+            **_query_input(query),
             n_results=min(k, coll.count() or 1),
             where=where,
         )
@@ -71,32 +187,31 @@ class BrandVectorStore:
     # ── Triplets ───────────────────────────────────────────────
 
     def add_triplet(self, triplet: KGTriplet) -> None:
-        coll = self._get_collection(f"{triplet.brand_namespace}_triplets")
-        coll.upsert(
-            ids=[triplet.id],
-            documents=[triplet.text],
-            metadatas=[{
-                "subject": triplet.subject,
-                "predicate": triplet.predicate,
-                "object": triplet.object,
-                "created_at": triplet.created_at.isoformat(),
-                "confidence": triplet.confidence,
-                "brand_namespace": triplet.brand_namespace,
-            }],
-        )
+        self._upsert(f"{triplet.brand_namespace}_triplets", triplet.id, triplet.text, {
+            "subject": triplet.subject,
+            "predicate": triplet.predicate,
+            "object": triplet.object,
+            "created_at": triplet.created_at.isoformat(),
+            "created_at_ts": to_epoch(triplet.created_at),
+            "confidence": triplet.confidence,
+            "brand_namespace": triplet.brand_namespace,
+            "decay_alpha": effective_alpha(),
+        })
 
     def search_triplets(
         self,
         brand_namespace: str,
-        query: str,
+        query: Query,
         k: int = 20,
+        as_of: datetime | None = None,
     ) -> list[dict[str, Any]]:
         coll = self._get_collection(f"{brand_namespace}_triplets")
         if coll.count() == 0:
             return []
         results = coll.query(
-            query_texts=[query],
+            **_query_input(query),
             n_results=min(k, coll.count()),
+            where=self._created_before(coll, as_of),
         )
         return self._unpack_results(results)
 
@@ -104,43 +219,222 @@ class BrandVectorStore:
 
     def add_shared_note(self, note: MemoryNote) -> None:
         """Add a note to the shared (cross-brand) collection."""
-        coll = self._get_collection("shared_notes")
-        coll.upsert(
-            ids=[note.id],
-            documents=[note.content],
-            metadatas=[{
-                "category": note.category,
-                "tags": ",".join(note.tags),
-                "keywords": ",".join(note.keywords),
-                "created_at": note.created_at.isoformat(),
-                "brand_namespace": "shared",
-            }],
-        )
+        self._upsert("shared_notes", note.id, note.content, {
+            "category": note.category,
+            "tags": ",".join(note.tags),
+            "keywords": ",".join(note.keywords),
+            "created_at": note.created_at.isoformat(),
+            "created_at_ts": to_epoch(note.created_at),
+            "brand_namespace": "shared",
+            "decay_alpha": effective_alpha(note.significance),
+        })
 
-    def search_shared_notes(self, query: str, k: int = 5) -> list[dict[str, Any]]:
+    def search_shared_notes(self, query: Query, k: int = 5) -> list[dict[str, Any]]:
         coll = self._get_collection("shared_notes")
         if coll.count() == 0:
             return []
-        results = coll.query(query_texts=[query], n_results=min(k, coll.count()))
+        results = coll.query(**_query_input(query), n_results=min(k, coll.count()))
         return self._unpack_results(results)
 
+    # ── Multi-brand ────────────────────────────────────────────
+
+    def embed(self, texts: list[str]) -> list[Any]:
+        """Embed query texts with the same function the collections use."""
+        if self._embedding_function is None:
+            from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+            self._embedding_function = DefaultEmbeddingFunction()
+        return list(self._embedding_function(texts))
+
+    def search_many(
+        self,
+        queries: list[str],
+        brands: Sequence[str],
+        k: int = 10,
+        kind: str = "notes",
+        category_filter: str | None = None,
+        as_of: datetime | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Nearest rows for every query across every brand's {kind} collection.
+
+        Queries are embedded once; each collection gets one multi-query
+        Chroma call, and the calls run concurrently. Returns one list per
+        query, merged across brands by similarity (top k), each item tagged
+        with its "brand". category_filter applies to notes only.
+        """
+        if not queries or not brands:
+            return [[] for _ in queries]
+        embeddings = self.embed(queries)
+        if kind != "notes":
+            category_filter = None
+
+        def run(brand: str) -> list[list[dict[str, Any]]]:
+            collection = f"{brand}_{kind}"
+            return self.query_many(collection, embeddings, k=k, where=self.where_clause(collection, category_filter, as_of))
+
+        with ThreadPoolExecutor(max_workers=len(brands)) as pool:
+            per_brand = dict(zip(brands, pool.map(run, brands)))
+
+        merged: list[list[dict[str, Any]]] = []
+        for i in range(len(queries)):
+            items = [{**item, "brand": brand} for brand, rows in per_brand.items() for item in rows[i]]
+            items.sort(key=lambda x: x.get("similarity", 0.0), reverse=True)
+            merged.append(items[:k])
+        return merged
+
+    def where_clause(
+        self,
+        collection: str,
+        category_filter: str | None = None,
+        as_of: datetime | None = None,
+        *extra: dict | None,
+    ) -> dict | None:
+        """Where-filter for category and created_at <= as_of on *collection*, plus *extra* clauses."""
+        return _where(
+            {"category": category_filter} if category_filter else None,
+            self._created_before(self._get_collection(collection), as_of),
+            *extra,
+        )
+
+    def query_many(
+        self,
+        collection: str,
+        queries: Sequence[Query],
+        k: int,
+        where: dict | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """The k nearest rows for each query, in one Chroma call."""
+        coll = self._get_collection(collection)
+        count = coll.count()
+        if count == 0 or not queries:
+            return [[] for _ in queries]
+        results = coll.query(**_queries_input(queries), n_results=min(k, count), where=where)
+        return [self._unpack_results(results, i) for i in range(len(queries))]
+
+    def query_ids_many(
+        self,
+        collection: str,
+        queries: Sequence[Query],
+        ids: Sequence[list[str]],
+        where: dict | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Similarity of each query to its own rows (ids[i]) that match *where*, in one Chroma call."""
+        union = sorted({doc_id for group in ids for doc_id in group})
+        if not union:
+            return [[] for _ in queries]
+        results = self._get_collection(collection).query(
+            **_queries_input(queries), ids=union, n_results=len(union), where=where,
+        )
+        out: list[list[dict[str, Any]]] = []
+        for i, group in enumerate(ids):
+            wanted = set(group)
+            out.append([item for item in self._unpack_results(results, i) if item["id"] in wanted])
+        return out
+
+    # ── Row maintenance ────────────────────────────────────────
+
+    def get_rows(self, collection: str, ids: list[str], embeddings: bool = False) -> list[dict[str, Any]]:
+        """Stored rows by id (document, metadata and optionally embedding)."""
+        if not ids:
+            return []
+        include = ["documents", "metadatas", "embeddings"] if embeddings else ["documents", "metadatas"]
+        rows = self._get_collection(collection).get(ids=ids, include=include)
+        items: list[dict[str, Any]] = []
+        for i, doc_id in enumerate(rows["ids"]):
+            item: dict[str, Any] = {
+                "id": doc_id,
+                "document": rows["documents"][i],
+                "metadata": rows["metadatas"][i] or {},
+            }
+            if embeddings:
+                item["embedding"] = rows["embeddings"][i]
+            items.append(item)
+        return items
+
+    def move_rows(
+        self,
+        source: str,
+        target: str,
+        ids: list[str],
+        metadata: dict[str, Any] | None = None,
+        drop_metadata: Sequence[str] = (),
+    ) -> int:
+        """Move rows to another collection, keeping their embeddings.
+
+        *metadata* is merged into every moved row and the *drop_metadata*
+        keys are removed from it. Returns the number moved.
+        """
+        rows = self.get_rows(source, ids, embeddings=True)
+        if not rows:
+            return 0
+        moved_meta = [
+            {key: value for key, value in {**row["metadata"], **(metadata or {})}.items() if key not in drop_metadata}
+            for row in rows
+        ]
+        moved_ids = [row["id"] for row in rows]
+        self._get_collection(target).upsert(
+            ids=moved_ids,
+            documents=[row["document"] for row in rows],
+            embeddings=[row["embedding"] for row in rows],
+            metadatas=moved_meta,
+        )
+        self._get_collection(source).delete(ids=moved_ids)
+        self._state.bump(source, target)
+        for doc_id, meta in zip(moved_ids, moved_meta):
+            if source in self._recency:
+                self._recency[source].remove(doc_id)
+            if target in self._recency:
+                self._recency[target].upsert(doc_id, meta)
+        return len(rows)
+
     # ── Utilities ──────────────────────────────────────────────
 
+    def write_version(self, brand_namespace: str) -> tuple:
+        """Changes whenever what a present-time read of *brand_namespace* sees may have changed.
+
+        Combines the in-process write/move counters of the brand's hot notes,
+        triplets and the shared notes (every store on this persist dir bumps
+        them) with those collections' row counts, which also move when
+        another process writes.
+        """
+        names = (notes_collection(brand_namespace), f"{brand_namespace}_triplets", "shared_notes")
+        with self._state.lock:
+            writes = tuple(self._state.writes.get(name, 0) for name in names)
+        return writes, tuple(self.count(name) for name in names)
+
+    def count(self, collection: str) -> int:
+        """Row count of a collection, e.g. count("chamisul_notes")."""
+        return self._get_collection(collection).count()
+
+    def recency_index(self, collection: str) -> RecencyIndex:
+        """created_at/significance index of a collection, reloaded when its row count drifts."""
+        coll = self._get_collection(collection)
+        index = self._recency.get(collection)
+        if index is None or len(index) != coll.count():
+            rows = coll.get(include=["metadatas"])
+            index = self._recency[collection] = RecencyIndex.from_rows(rows["ids"], rows["metadatas"] or [])
+        return index
+
+    def query_ids(self, collection: str, query: Query, ids: list[str]) -> list[dict[str, Any]]:
+        """Similarity of *query* to the given rows (random access for top-k)."""
+        return self.query_ids_many(collection, [query], [ids])[0]
+
     @staticmethod
-    def _unpack_results(results: dict) -> list[dict[str, Any]]:
-        """Convert ChromaDB query results into a flat list of dicts."""
+    def _unpack_results(results: dict, query_index: int = 0) -> list[dict[str, Any]]:
+        """Convert one query's ChromaDB results into a flat list of dicts."""
         items: list[dict[str, Any]] = []
         if not results or not results.get("ids"):
             return items
-        for i, doc_id in enumerate(results["ids"][0]):
+        q = query_index
+        for i, doc_id in enumerate(results["ids"][q]):
             item: dict[str, Any] = {"id": doc_id}
             if results.get("documents"):
-                item["document"] = results["documents"][0][i]
+                item["document"] = results["documents"][q][i]
             if results.get("metadatas"):
-                item["metadata"] = results["metadatas"][0][i]
+                item["metadata"] = results["metadatas"][q][i]
             if results.get("distances"):
                 # ChromaDB cosine distance → similarity = 1 - distance
-                item["similarity"] = 1.0 - results["distances"][0][i]
+                item["similarity"] = 1.0 - results["distances"][q][i]
             items.append(item)
         return items
 
@@ -148,4 +442,7 @@ class BrandVectorStore:
         """Delete all collections. Use only in tests."""
         for name in list(self._collections):
             self._client.delete_collection(name)
+            self._state.bump(name)
         self._collections.clear()
+        self._epoch_ready.clear()
+        self._recency.clear()
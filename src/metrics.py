@@ -0,0 +1,126 @@
+"""In-process metrics: histograms, named stage timers, Prometheus text output.
+
+Dependency-free so any layer (timeline, memory, API) can time its internal
+stages:
+
+    with stage("kg_snapshot.graph"):
+        ...
+
+Stage durations land in the ``stage_duration_seconds{stage=...}``
+histogram. The API exposes everything at ``/metrics`` (see
+src.api.instrumentation).
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_le(bound: float) -> str:
+    return repr(float(bound)) if isinstance(bound, float) else str(bound)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a fixed tuple of label names."""
+
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...], buckets: tuple[float, ...]) -> None:
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: dict[tuple[str, ...], list] = {}  # labels → [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][idx] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self, *labels: str) -> tuple[list[int], float, int] | None:
+        """(per-bucket counts incl. +Inf, sum, count) for one label set."""
+        with self._lock:
+            series = self._series.get(labels)
+            return (list(series[0]), series[1], series[2]) if series else None
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, (list(s[0]), s[1], s[2])) for labels, s in self._series.items())
+        for labels, (counts, total, count) in items:
+            base = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(self.label_names, labels))
+            sep = "," if base else ""
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{_format_le(bound)}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {count}')
+            suffix = f"{{{base}}}" if base else ""
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {count}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size (as sent, after compression).",
+    ("method", "route"),
+    SIZE_BUCKETS,
+)
+STAGE_LATENCY = Histogram(
+    "stage_duration_seconds",
+    "Duration of named internal stages.",
+    ("stage",),
+    LATENCY_BUCKETS,
+)
+
+_HISTOGRAMS = [REQUEST_LATENCY, RESPONSE_SIZE, STAGE_LATENCY]
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the enclosed block into stage_duration_seconds{stage=name}."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.observe(time.perf_counter() - start, name)
+
+
+def render_prometheus() -> str:
+    """All metrics in Prometheus text exposition format (version 0.0.4)."""
+    lines: list[str] = []
+    for histogram in _HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    """Clear every series. Use only in tests."""
+    for histogram in _HISTOGRAMS:
+        histogram.reset()
@@ -1,3 +1,15 @@
-from .events import TimelineEvent
-from .event_data import TIMELINE_EVENTS
-from .kg_snapshot import build_kg_snapshot
+"""Timeline package. Heavy submodules load lazily on first attribute access."""
+
+_EXPORTS = {
+    "TimelineEvent": ".events",
+    "TIMELINE_EVENTS": ".event_data",
+    "build_kg_snapshot": ".kg_snapshot",
+}
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        from importlib import import_module
+
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
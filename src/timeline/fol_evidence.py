@@ -16,35 +16,7 @@ Edge types:
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-
-
-@dataclass
-class FOLNode:
-    id: str
-    label: str
-    label_ko: str
-    node_type: str  # fol_predicate, fol_rule, fol_conclusion
-    brand: str
-    event_id: str  # linked timeline event
-
-
-@dataclass
-class FOLEdge:
-    source: str
-    target: str
-    relation: str  # SUPPORTS, IMPLIES, EXPLAINS
-    brand: str
-    event_id: str
-
-
-@dataclass
-class FOLEvidence:
-    """A complete FOL reasoning chain for one brand success factor."""
-    event_id: str
-    brand: str
-    nodes: list[FOLNode] = field(default_factory=list)
-    edges: list[FOLEdge] = field(default_factory=list)
+from .fol_schema import FOLNode, FOLEdge, FOLEvidence
 
 
 # ── helpers ──────────────────────────────────────────────────────────────────
@@ -0,0 +1,86 @@
+"""Index over FOL evidence, built once per process.
+
+Evidence chains are grouped by event and by industry, with their rule,
+conclusion and predicate labels pulled out of the node lists and the linked
+event date resolved up front. Snapshot FOL layers and LIVE synthesis then
+touch only the chains of active events instead of scanning all evidence.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from .events import TimelineEvent
+from .fol_schema import FOLEvidence, FOLNode
+
+
+@dataclass
+class FOLChain:
+    """One FOLEvidence with its derived lookups."""
+    position: int  # order in FOL_EVIDENCE (output order is preserved)
+    evidence: FOLEvidence
+    event_date: datetime | None
+    industry: str | None
+    predicates: list[str] = field(default_factory=list)  # label_ko or label
+    rule: FOLNode | None = None
+    conclusion: FOLNode | None = None
+
+    @property
+    def brand(self) -> str:
+        return self.evidence.brand
+
+
+class FOLIndex:
+    """FOL evidence grouped by event_id, brand and industry."""
+
+    def __init__(self, evidence: list[FOLEvidence], events: list[TimelineEvent]) -> None:
+        events_by_id = {e.id: e for e in events}
+        self.chains: list[FOLChain] = []
+        self._by_event: dict[str, list[FOLChain]] = defaultdict(list)
+        self._by_brand: dict[str, list[FOLChain]] = defaultdict(list)
+        self._concluded_by_industry: dict[str, list[FOLChain]] = defaultdict(list)
+        self._concluded: list[FOLChain] = []
+
+        for pos, fol in enumerate(evidence):
+            event = events_by_id.get(fol.event_id)
+            chain = FOLChain(
+                position=pos,
+                evidence=fol,
+                event_date=event.date if event else None,
+                industry=event.industry if event else None,
+                predicates=[n.label_ko or n.label for n in fol.nodes if n.node_type == "fol_predicate"],
+                rule=next((n for n in fol.nodes if n.node_type == "fol_rule"), None),
+                conclusion=next((n for n in fol.nodes if n.node_type == "fol_conclusion"), None),
+            )
+            self.chains.append(chain)
+            self._by_event[fol.event_id].append(chain)
+            self._by_brand[fol.brand].append(chain)
+            if event is not None and chain.conclusion is not None:
+                self._concluded.append(chain)
+                self._concluded_by_industry[event.industry].append(chain)
+
+    def for_event(self, event_id: str) -> list[FOLChain]:
+        return self._by_event.get(event_id, [])
+
+    def for_brand(self, brand: str) -> list[FOLChain]:
+        return self._by_brand.get(brand, [])
+
+    def for_events(self, event_ids: Iterable[str], brand: str | None = None) -> list[FOLChain]:
+        """Chains of the given events in evidence order.
+
+        brand keeps only that brand's chains plus "multi" ones ("all"/None = no filter).
+        """
+        chains = [c for eid in event_ids for c in self._by_event.get(eid, ())]
+        if brand and brand != "all":
+            chains = [c for c in chains if c.brand == brand or c.brand == "multi"]
+        chains.sort(key=lambda c: c.position)
+        return chains
+
+    def concluded(self, industry: str | None = None) -> list[FOLChain]:
+        """Chains with a conclusion whose event exists (optionally in one industry)."""
+        if industry and industry != "all":
+            return self._concluded_by_industry.get(industry, [])
+        return self._concluded
@@ -0,0 +1,243 @@
+"""Forward-chaining inference over the FOL evidence layer.
+
+Rule labels such as ``NationalCapital ^ ColonialResistance -> HeritageAuth``
+or ``BambooCharcoal -> PurityPerception -> ConsumerTrust`` are compiled into
+propositional Horn clauses and tied to the evidence graph:
+
+  - every predicate node is a base fact, active from its event's date, and
+    also asserts the functors in its label (``NationalCapital(Jinro)`` →
+    ``NationalCapital``);
+  - a rule's supporting predicates (SUPPORTS edges) jointly assert the atoms
+    of its first body, and each ``->`` step becomes its own clause;
+  - the final head implies the rule's conclusion nodes (IMPLIES edges).
+
+Symbols are global, so a head derived in one chain can satisfy the body of
+another. Inference is semi-naive: each clause keeps a count of unmet body
+atoms and only clauses touching newly derived (or strengthened) facts are
+revisited, so a run is linear in the size of the rule base.
+
+Confidence is the temporal weight of the weakest premise. Since the weight
+decays monotonically with age, a derived fact only has to remember the
+oldest premise date on its best derivation ("effective date"). That keeps
+derivations valid as the timeline advances: ``advance()`` adds the newly
+active facts and propagates just those.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from src.memory.temporal_decay import compute_temporal_weight
+
+from .fol_index import FOLIndex
+
+_IMPLIES = re.compile(r"->|→")
+_AND = re.compile(r"\^|∧")
+
+
+def _symbol(atom: str) -> str:
+    """'EconomicBoom(Korea,1970s)' → 'sym:EconomicBoom'."""
+    return "sym:" + atom.split("(")[0].strip()
+
+
+def parse_rule(label: str) -> list[tuple[tuple[str, ...], str]]:
+    """Split a rule label into (body symbols, head symbol) steps.
+
+    ``A ^ B -> C -> D`` → ``[(("sym:A", "sym:B"), "sym:C"), (("sym:C",), "sym:D")]``.
+    Returns [] for labels without an implication.
+    """
+    parts = [p.strip() for p in _IMPLIES.split(label)]
+    if len(parts) < 2 or not all(parts):
+        return []
+    steps = []
+    for body, head in zip(parts, parts[1:]):
+        atoms = tuple(dict.fromkeys(_symbol(a) for a in _AND.split(body) if a.strip()))
+        heads = [_symbol(a) for a in _AND.split(head) if a.strip()]
+        steps.append((atoms, heads[0]))
+    return steps
+
+
+@dataclass(frozen=True)
+class HornClause:
+    body: tuple[str, ...]
+    head: str
+    rule_id: str  # rule node the clause was compiled from ("" for grounding clauses)
+
+
+@dataclass(frozen=True)
+class BaseFact:
+    fact_id: str  # predicate node id
+    date: datetime
+    event_id: str
+
+
+class FOLProgram:
+    """Horn clauses compiled from the evidence layer, indexed by body atom."""
+
+    def __init__(self, clauses: list[HornClause], facts: list[BaseFact], conclusions: dict[str, Any]) -> None:
+        self.clauses = clauses
+        self.facts = sorted(facts, key=lambda f: f.date)
+        self.conclusions = conclusions  # conclusion node id → FOLNode
+        self.by_atom: dict[str, list[int]] = defaultdict(list)
+        for i, clause in enumerate(clauses):
+            for atom in clause.body:
+                self.by_atom[atom].append(i)
+
+    @classmethod
+    def from_index(cls, index: FOLIndex) -> FOLProgram:
+        clauses: list[HornClause] = []
+        facts: list[BaseFact] = []
+        conclusions: dict[str, Any] = {}
+
+        for chain in index.chains:
+            fol = chain.evidence
+            nodes = {n.id: n for n in fol.nodes}
+            supports: dict[str, list[str]] = defaultdict(list)
+            implies: dict[str, list[str]] = defaultdict(list)
+            for edge in fol.edges:
+                if edge.relation == "SUPPORTS":
+                    supports[edge.target].append(edge.source)
+                elif edge.relation == "IMPLIES":
+                    implies[edge.source].append(edge.target)
+
+            for node in fol.nodes:
+                if node.node_type == "fol_predicate":
+                    if chain.event_date is not None:
+                        facts.append(BaseFact(node.id, chain.event_date, fol.event_id))
+                    for atom in _AND.split(node.label):
+                        if atom.strip():
+                            clauses.append(HornClause((node.id,), _symbol(atom), ""))
+                elif node.node_type == "fol_conclusion":
+                    conclusions[node.id] = node
+
+            for node in fol.nodes:
+                if node.node_type != "fol_rule":
+                    continue
+                steps = parse_rule(node.label)
+                premises = tuple(dict.fromkeys(p for p in supports.get(node.id, []) if p in nodes))
+                if steps and premises:
+                    for atom in steps[0][0]:
+                        clauses.append(HornClause(premises, atom, ""))
+                for body, head in steps:
+                    clauses.append(HornClause(body, head, node.id))
+                # Rules without a parseable label still link premises to conclusions.
+                final = steps[-1][1] if steps else None
+                for conc_id in implies.get(node.id, []):
+                    if final:
+                        clauses.append(HornClause((final,), conc_id, node.id))
+                    elif premises:
+                        clauses.append(HornClause(premises, conc_id, node.id))
+
+        return cls(list(dict.fromkeys(clauses)), facts, conclusions)
+
+
+@dataclass
+class Derivation:
+    fact_id: str
+    date: datetime  # effective date (oldest premise on the best derivation)
+    rule_id: str  # last rule applied ("" for base facts / grounding)
+
+
+class ForwardChainer:
+    """Incremental semi-naive forward chaining over a FOLProgram."""
+
+    def __init__(self, program: FOLProgram, event_ids: set[str] | None = None) -> None:
+        self.program = program
+        self.event_ids = event_ids  # restrict base facts to these events (None = all)
+        self.reset()
+
+    def reset(self) -> None:
+        self.known: dict[str, Derivation] = {}
+        self._missing = [len(c.body) for c in self.program.clauses]
+        self._cursor = 0
+        self.now: datetime | None = None
+
+    def advance(self, until: datetime) -> list[str]:
+        """Activate base facts dated <= until and propagate. Returns new/strengthened facts.
+
+        Moving backwards in time restarts from scratch.
+        """
+        if self.now is not None and until < self.now:
+            self.reset()
+        self.now = until
+        facts = self.program.facts
+        delta: list[str] = []
+        while self._cursor < len(facts) and facts[self._cursor].date <= until:
+            fact = facts[self._cursor]
+            self._cursor += 1
+            if self.event_ids is not None and fact.event_id not in self.event_ids:
+                continue
+            if self._assert(fact.fact_id, fact.date, ""):
+                delta.append(fact.fact_id)
+        return self._propagate(delta)
+
+    def _assert(self, fact_id: str, date: datetime, rule_id: str) -> bool:
+        current = self.known.get(fact_id)
+        if current is None:
+            self.known[fact_id] = Derivation(fact_id, date, rule_id)
+            for i in self.program.by_atom.get(fact_id, ()):
+                self._missing[i] -= 1
+            return True
+        if date > current.date:
+            current.date, current.rule_id = date, rule_id
+            return True
+        return False
+
+    def _propagate(self, delta: list[str]) -> list[str]:
+        changed = list(delta)
+        clauses, known = self.program.clauses, self.known
+        while delta:
+            next_delta: list[str] = []
+            for fact_id in delta:
+                for i in self.program.by_atom.get(fact_id, ()):
+                    if self._missing[i]:
+                        continue
+                    clause = clauses[i]
+                    date = min(known[a].date for a in clause.body)
+                    if self._assert(clause.head, date, clause.rule_id):
+                        next_delta.append(clause.head)
+            changed.extend(next_delta)
+            delta = next_delta
+        return list(dict.fromkeys(changed))
+
+    def confidence(self, fact_id: str, alpha: float) -> float:
+        d = self.known.get(fact_id)
+        if d is None or self.now is None:
+            return 0.0
+        return compute_temporal_weight(d.date, now=self.now, alpha=alpha)
+
+    def inferred_conclusions(self, alpha: float) -> list[dict[str, Any]]:
+        """Derived conclusion nodes, strongest first."""
+        out = []
+        for conc_id, node in self.program.conclusions.items():
+            d = self.known.get(conc_id)
+            if d is None:
+                continue
+            out.append({
+                "id": conc_id,
+                "label": node.label,
+                "label_ko": node.label_ko,
+                "brand": node.brand,
+                "event_id": node.event_id,
+                "rule_id": d.rule_id,
+                "confidence": round(self.confidence(conc_id, alpha), 4),
+                "effective_date": d.date.isoformat(),
+            })
+        out.sort(key=lambda c: c["confidence"], reverse=True)
+        return out
+
+
+def infer_at(
+    program: FOLProgram,
+    target_date: datetime,
+    alpha: float,
+    event_ids: set[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Run chaining to fixpoint for the facts active at target_date."""
+    chainer = ForwardChainer(program, event_ids)
+    chainer.advance(target_date)
+    return chainer.inferred_conclusions(alpha)
@@ -0,0 +1,157 @@
+"""Index of real celebrity images under generated_images/real.
+
+Files are bucketed by (product_id, year) from their ``{year}_...`` prefix,
+so a gallery lookup only ever touches the handful of files for one
+product-year, however large the library grows. Name matches are memoized
+per (product_id, year, normalized name).
+
+The directory listing is persisted to a JSON manifest together with each
+product directory's mtime. On the next load only directories whose mtime
+changed (files added, removed or renamed) are re-listed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from urllib.parse import quote
+
+MANIFEST_VERSION = 1
+
+
+def _normalize(model_name: str) -> str:
+    """'Sabrina Carpenter(사브리나 카펜터)' → 'sabrina carpenter'."""
+    return model_name.split("(")[0].strip().lower()
+
+
+class RealImageIndex:
+    """(product_id, year) → image files, refreshed incrementally from disk."""
+
+    def __init__(self, root: Path, manifest_path: Path | None = None) -> None:
+        self.root = root
+        self.manifest_path = manifest_path
+        self._dirs: dict[str, dict] = {}  # product_id → {"mtime_ns": int, "files": [...]}
+        self._root_mtime_ns = 0
+        self._buckets: dict[tuple[str, str], list[tuple[str, str]]] = {}  # → [(fname, fname_lower)]
+        self._matches: dict[tuple[str, str, str], str | None] = {}
+        self._load_manifest()
+
+    # ── Persistence ─────────────────────────────────────────
+
+    def _load_manifest(self) -> None:
+        if not self.manifest_path or not self.manifest_path.is_file():
+            return
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        if data.get("version") != MANIFEST_VERSION or data.get("root") != str(self.root):
+            return
+        self._root_mtime_ns = data.get("root_mtime_ns", 0)
+        self._dirs = data.get("dirs", {})
+        self._rebuild_buckets()
+
+    def _save_manifest(self) -> None:
+        if not self.manifest_path:
+            return
+        data = {
+            "version": MANIFEST_VERSION,
+            "root": str(self.root),
+            "root_mtime_ns": self._root_mtime_ns,
+            "dirs": self._dirs,
+        }
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.manifest_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.manifest_path)
+        except OSError:
+            pass  # read-only deployments just rescan next time
+
+    # ── Refresh ─────────────────────────────────────────────
+
+    def refresh(self) -> bool:
+        """Re-list only directories whose mtime changed. Returns True if anything did."""
+        try:
+            root_mtime = self.root.stat().st_mtime_ns
+        except OSError:
+            changed = bool(self._dirs)
+            self._dirs, self._root_mtime_ns = {}, 0
+            if changed:
+                self._rebuild_buckets()
+            return changed
+
+        if root_mtime != self._root_mtime_ns:
+            # Product directories were added/removed: re-list the root.
+            names = {p.name for p in self.root.iterdir() if p.is_dir()}
+        else:
+            names = set(self._dirs)
+
+        changed = root_mtime != self._root_mtime_ns
+        for name in set(self._dirs) - names:
+            del self._dirs[name]
+            changed = True
+        for name in names:
+            product_dir = self.root / name
+            try:
+                mtime = product_dir.stat().st_mtime_ns
+            except OSError:
+                self._dirs.pop(name, None)
+                changed = True
+                continue
+            cached = self._dirs.get(name)
+            if cached is None or cached["mtime_ns"] != mtime:
+                self._dirs[name] = {
+                    "mtime_ns": mtime,
+                    "files": sorted(f.name for f in product_dir.iterdir() if f.is_file()),
+                }
+                changed = True
+
+        self._root_mtime_ns = root_mtime
+        if changed:
+            self._rebuild_buckets()
+            self._save_manifest()
+        return changed
+
+    def _rebuild_buckets(self) -> None:
+        buckets: dict[tuple[str, str], list[tuple[str, str]]] = {}
+        for product_id, entry in self._dirs.items():
+            for fname in entry["files"]:
+                year = fname[:4]
+                if year.isdigit():
+                    buckets.setdefault((product_id, year), []).append((fname, fname.lower()))
+        self._buckets = buckets
+        self._matches.clear()
+
+    # ── Lookup ──────────────────────────────────────────────
+
+    def files(self, product_id: str) -> list[str]:
+        return list(self._dirs.get(product_id, {}).get("files", []))
+
+    def _match(self, product_id: str, year: str, name: str) -> str | None:
+        key = (product_id, year, name)
+        if key not in self._matches:
+            bucket = self._buckets.get((product_id, year), [])
+            self._matches[key] = next((f for f, lower in bucket if name in lower), None)
+        return self._matches[key]
+
+    def find(self, product_id: str, start_year: int, model_names: list[str]) -> str:
+        """Real image URL for a timeline entry, or "" if none.
+
+        Prefers a file from that year naming one of the models
+        (case-insensitive), then any file from that year.
+        """
+        year = str(start_year)
+        bucket = self._buckets.get((product_id, year))
+        if not bucket:
+            return ""
+        for model_name in model_names:
+            fname = self._match(product_id, year, _normalize(model_name))
+            if fname:
+                return _image_url(product_id, fname)
+        return _image_url(product_id, bucket[0][0])
+
+
+def _image_url(product_id: str, fname: str) -> str:
+    return f"/images/real/{quote(product_id, safe='')}/{quote(fname, safe='')}"
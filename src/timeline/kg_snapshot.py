@@ -10,25 +10,32 @@ from __future__ import annotations
 import math
 import re
 from collections import defaultdict
+from collections.abc import Iterator
 from datetime import datetime
-from typing import Any
-
-import networkx as nx
+from typing import TYPE_CHECKING, Any
 
 from src.memory.temporal_decay import compute_temporal_weight
-from .event_data import TIMELINE_EVENTS
-from .event_data_whisky import WHISKY_TIMELINE_EVENTS
+from src.metrics import stage
 from .events import TimelineEvent, KGMutation
-from .fol_evidence import FOL_EVIDENCE
-from .model_gallery import MODEL_GALLERY, SojuModel
+from .model_gallery import SojuModel
+from .fol_inference import infer_at
+from .registry import get_all_events, get_fol_index, get_fol_program, get_model_index
 
-ALL_EVENTS = TIMELINE_EVENTS + WHISKY_TIMELINE_EVENTS
+if TYPE_CHECKING:
+    import networkx as nx
 
 # Timeline-specific alpha: half-life ≈ 2310 days (~6.3 years).
 # Much gentler than the memory alpha (0.02) since we span 100+ years (1924-2026).
 TIMELINE_ALPHA = 0.0003
 
 
+def __getattr__(name: str):
+    # Backwards-compatible lazy alias for the combined event list.
+    if name == "ALL_EVENTS":
+        return get_all_events()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def _apply_mutation(G: nx.DiGraph, mut: KGMutation, event: TimelineEvent) -> None:
     """Apply a single KG mutation to the graph."""
     if mut.action == "add_node" and mut.node_id:
@@ -56,36 +63,19 @@ def _apply_mutation(G: nx.DiGraph, mut: KGMutation, event: TimelineEvent) -> Non
         )
 
 
-def build_kg_snapshot(
+def _snapshot_graph(
     target_date: datetime,
-    brand_filter: str | None = None,
-    alpha: float = TIMELINE_ALPHA,
-    include_fol: bool = False,
-    industry_filter: str | None = None,
-) -> dict[str, Any]:
-    """Build a KG snapshot at *target_date*.
-
-    Args:
-        target_date: The point in time to compute the snapshot for.
-        brand_filter: If set, only include events for this brand (+ "multi").
-        alpha: Temporal decay rate for weight computation.
-        include_fol: If True, include FOL evidence layer nodes/edges.
+    brand_filter: str | None,
+    industry_filter: str | None,
+) -> tuple[nx.DiGraph, list[TimelineEvent], set[str]]:
+    """Apply every matching event up to *target_date* onto a fresh graph."""
+    import networkx as nx
 
-    Returns:
-        {
-            "nodes": [...],
-            "edges": [...],
-            "fol_nodes": [...] (if include_fol),
-            "fol_edges": [...] (if include_fol),
-            "stats": {...},
-            "current_event": {...} | None
-        }
-    """
     G = nx.DiGraph()
     active_events: list[TimelineEvent] = []
     active_event_ids: set[str] = set()
 
-    for event in ALL_EVENTS:
+    for event in get_all_events():
         if event.date > target_date:
             continue
         if industry_filter and industry_filter != "all" and event.industry != industry_filter:
@@ -96,13 +86,14 @@ def build_kg_snapshot(
         active_event_ids.add(event.id)
         for mut in event.kg_mutations:
             _apply_mutation(G, mut, event)
+    return G, active_events, active_event_ids
+
 
-    # Annotate temporal weights
-    nodes_out: list[dict[str, Any]] = []
+def _iter_nodes(G: nx.DiGraph, target_date: datetime, alpha: float) -> Iterator[dict[str, Any]]:
     for nid, data in G.nodes(data=True):
         added = datetime.fromisoformat(data["added_date"])
         tw = compute_temporal_weight(added, now=target_date, alpha=alpha)
-        nodes_out.append({
+        yield {
             "id": nid,
             "label": data.get("label", nid),
             "type": data.get("node_type", "unknown"),
@@ -110,13 +101,14 @@ def build_kg_snapshot(
             "temporal_weight": round(tw, 4),
             "added_date": data["added_date"],
             "event_id": data.get("event_id", ""),
-        })
+        }
 
-    edges_out: list[dict[str, Any]] = []
+
+def _iter_edges(G: nx.DiGraph, target_date: datetime, alpha: float) -> Iterator[dict[str, Any]]:
     for src, tgt, data in G.edges(data=True):
         added = datetime.fromisoformat(data["added_date"])
         tw = compute_temporal_weight(added, now=target_date, alpha=alpha)
-        edges_out.append({
+        yield {
             "source": src,
             "target": tgt,
             "relation": data.get("relation", ""),
@@ -124,7 +116,40 @@ def build_kg_snapshot(
             "temporal_weight": round(tw, 4),
             "added_date": data["added_date"],
             "event_id": data.get("event_id", ""),
-        })
+        }
+
+
+def build_kg_snapshot(
+    target_date: datetime,
+    brand_filter: str | None = None,
+    alpha: float = TIMELINE_ALPHA,
+    include_fol: bool = False,
+    industry_filter: str | None = None,
+) -> dict[str, Any]:
+    """Build a KG snapshot at *target_date*.
+
+    Args:
+        target_date: The point in time to compute the snapshot for.
+        brand_filter: If set, only include events for this brand (+ "multi").
+        alpha: Temporal decay rate for weight computation.
+        include_fol: If True, include FOL evidence layer nodes/edges.
+
+    Returns:
+        {
+            "nodes": [...],
+            "edges": [...],
+            "fol_nodes": [...] (if include_fol),
+            "fol_edges": [...] (if include_fol),
+            "fol_inferences": [...] (if include_fol; derived conclusions),
+            "stats": {...},
+            "current_event": {...} | None
+        }
+    """
+    with stage("kg_snapshot.graph"):
+        G, active_events, active_event_ids = _snapshot_graph(target_date, brand_filter, industry_filter)
+    with stage("kg_snapshot.weights"):
+        nodes_out = list(_iter_nodes(G, target_date, alpha))
+        edges_out = list(_iter_edges(G, target_date, alpha))
 
     brands_present = {n["brand"] for n in nodes_out if n["brand"]}
     current_event = active_events[-1] if active_events else None
@@ -143,44 +168,73 @@ def build_kg_snapshot(
 
     # FOL evidence layer
     if include_fol:
-        fol_nodes, fol_edges = _build_fol_layer(
-            active_event_ids, target_date, brand_filter, alpha
-        )
+        with stage("kg_snapshot.fol"):
+            fol_nodes, fol_edges = _build_fol_layer(
+                active_event_ids, target_date, brand_filter, alpha
+            )
         result["fol_nodes"] = fol_nodes
         result["fol_edges"] = fol_edges
+        with stage("kg_snapshot.inference"):
+            result["fol_inferences"] = infer_at(get_fol_program(), target_date, alpha, active_event_ids)
 
     return result
 
 
-def _build_fol_layer(
+def iter_kg_snapshot(
+    target_date: datetime,
+    brand_filter: str | None = None,
+    alpha: float = TIMELINE_ALPHA,
+    include_fol: bool = False,
+    industry_filter: str | None = None,
+) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Stream the snapshot of build_kg_snapshot as (record type, record) pairs.
+
+    Yields "node" and "edge" records, then "fol_node" / "fol_edge" /
+    "fol_inference" when include_fol is set, and finally one "stats" record
+    (stats + current_event), without holding the output lists in memory.
+    """
+    G, active_events, active_event_ids = _snapshot_graph(target_date, brand_filter, industry_filter)
+    brands_present: set[str] = set()
+    for node in _iter_nodes(G, target_date, alpha):
+        if node["brand"]:
+            brands_present.add(node["brand"])
+        yield "node", node
+    for edge in _iter_edges(G, target_date, alpha):
+        yield "edge", edge
+
+    if include_fol:
+        yield from _iter_fol_layer(active_event_ids, target_date, brand_filter, alpha)
+        for inference in infer_at(get_fol_program(), target_date, alpha, active_event_ids):
+            yield "fol_inference", inference
+
+    current_event = active_events[-1] if active_events else None
+    yield "stats", {
+        "total_nodes": G.number_of_nodes(),
+        "total_edges": G.number_of_edges(),
+        "active_events": len(active_events),
+        "brands": sorted(brands_present),
+        "current_event": _serialize_event(current_event) if current_event else None,
+    }
+
+
+def _iter_fol_layer(
     active_event_ids: set[str],
     target_date: datetime,
     brand_filter: str | None,
     alpha: float,
-) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
-    """Build FOL evidence nodes/edges for active events."""
-    fol_nodes: list[dict[str, Any]] = []
-    fol_edges: list[dict[str, Any]] = []
+) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Yield ("fol_node" | "fol_edge", record) for active events."""
     seen_ids: set[str] = set()
 
-    # Find event dates for temporal weight computation
-    event_dates: dict[str, datetime] = {}
-    for evt in ALL_EVENTS:
-        event_dates[evt.id] = evt.date
-
-    for fol in FOL_EVIDENCE:
-        if fol.event_id not in active_event_ids:
-            continue
-        if brand_filter and brand_filter != "all" and fol.brand != brand_filter and fol.brand != "multi":
-            continue
-
-        evt_date = event_dates.get(fol.event_id, target_date)
+    for chain in get_fol_index().for_events(active_event_ids, brand_filter):
+        fol = chain.evidence
+        evt_date = chain.event_date or target_date
         tw = compute_temporal_weight(evt_date, now=target_date, alpha=alpha)
 
         for node in fol.nodes:
             if node.id not in seen_ids:
                 seen_ids.add(node.id)
-                fol_nodes.append({
+                yield "fol_node", {
                     "id": node.id,
                     "label": node.label,
                     "label_ko": node.label_ko,
@@ -189,10 +243,10 @@ def _build_fol_layer(
                     "temporal_weight": round(tw, 4),
                     "event_id": node.event_id,
                     "layer": "fol",
-                })
+                }
 
         for edge in fol.edges:
-            fol_edges.append({
+            yield "fol_edge", {
                 "source": edge.source,
                 "target": edge.target,
                 "relation": edge.relation,
@@ -200,8 +254,20 @@ def _build_fol_layer(
                 "temporal_weight": round(tw, 4),
                 "event_id": edge.event_id,
                 "layer": "fol",
-            })
+            }
+
 
+def _build_fol_layer(
+    active_event_ids: set[str],
+    target_date: datetime,
+    brand_filter: str | None,
+    alpha: float,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Build FOL evidence nodes/edges for active events."""
+    fol_nodes: list[dict[str, Any]] = []
+    fol_edges: list[dict[str, Any]] = []
+    for kind, record in _iter_fol_layer(active_event_ids, target_date, brand_filter, alpha):
+        (fol_nodes if kind == "fol_node" else fol_edges).append(record)
     return fol_nodes, fol_edges
 
 
@@ -274,64 +340,57 @@ def compute_live_recommendation(
     """
     now = datetime(2026, 2, 28)
 
-    # ── 1. filter models by industry ────────────────────────────────────────
-    models = MODEL_GALLERY
-    _whisky_types = {"scotch_whisky"}
-    if industry_filter and industry_filter != "all":
-        if industry_filter == "whisky":
-            models = [m for m in models if m.product_type in _whisky_types]
-        else:
-            models = [m for m in models if m.product_type not in _whisky_types]
-    if brand_filter and brand_filter != "all":
-        models = [m for m in models if m.brand == brand_filter]
-
-    # ── 2. build event lookup ───────────────────────────────────────────────
-    events_by_brand: dict[str, list[TimelineEvent]] = defaultdict(list)
-    for evt in ALL_EVENTS:
-        if industry_filter and industry_filter != "all" and evt.industry != industry_filter:
-            continue
-        events_by_brand[evt.brand].append(evt)
-        if evt.brand == "multi":
-            # multi-brand events count for all brands
-            pass  # already in "multi" bucket; we check both below
-
-    def _event_impact(model: SojuModel) -> float:
-        """Average impact_score of events matching this model's brand & era."""
-        matched: list[float] = []
-        for brand_key in (model.brand, "multi"):
-            for evt in events_by_brand.get(brand_key, []):
-                yr = evt.date.year
-                if model.start_year <= yr <= model.end_year:
-                    matched.append(evt.impact_score)
-        return sum(matched) / len(matched) if matched else 1.0
-
-    # ── 3. score each model entry ───────────────────────────────────────────
-    raw: dict[str, float] = defaultdict(float)  # name → aggregated score
-    meta: dict[str, dict[str, Any]] = {}  # name → first-seen metadata
-
-    for m in models:
-        midpoint_year = (m.start_year + m.end_year) / 2
-        mid_date = datetime(int(midpoint_year), 7, 1)
-        days = max(0, (now - mid_date).days)
-
-        temporal_weight = math.exp(-alpha * days)
-        event_impact = _event_impact(m)
-        duration_bonus = min(1.0, (m.end_year - m.start_year) / 10)
-        score = temporal_weight * event_impact * (1 + duration_bonus)
-
-        display = _en_name(m.name, industry_filter)
-        raw[display] += score
-        if display not in meta:
-            meta[display] = {
-                "brand": m.brand,
-                "start_year": m.start_year,
-                "end_year": m.end_year,
-                "events": [],
-            }
-        # widen year range if same name appears in multiple entries
-        info = meta[display]
-        info["start_year"] = min(info["start_year"], m.start_year)
-        info["end_year"] = max(info["end_year"], m.end_year)
+    with stage("live.score"):
+        # ── 1. filter models by industry ────────────────────────────────────
+        models = get_model_index().query(brand=brand_filter, industry=industry_filter)
+
+        # ── 2. build event lookup ───────────────────────────────────────────
+        events_by_brand: dict[str, list[TimelineEvent]] = defaultdict(list)
+        for evt in get_all_events():
+            if industry_filter and industry_filter != "all" and evt.industry != industry_filter:
+                continue
+            events_by_brand[evt.brand].append(evt)
+            if evt.brand == "multi":
+                # multi-brand events count for all brands
+                pass  # already in "multi" bucket; we check both below
+
+        def _event_impact(model: SojuModel) -> float:
+            """Average impact_score of events matching this model's brand & era."""
+            matched: list[float] = []
+            for brand_key in (model.brand, "multi"):
+                for evt in events_by_brand.get(brand_key, []):
+                    yr = evt.date.year
+                    if model.start_year <= yr <= model.end_year:
+                        matched.append(evt.impact_score)
+            return sum(matched) / len(matched) if matched else 1.0
+
+        # ── 3. score each model entry ───────────────────────────────────────
+        raw: dict[str, float] = defaultdict(float)  # name → aggregated score
+        meta: dict[str, dict[str, Any]] = {}  # name → first-seen metadata
+
+        for m in models:
+            midpoint_year = (m.start_year + m.end_year) / 2
+            mid_date = datetime(int(midpoint_year), 7, 1)
+            days = max(0, (now - mid_date).days)
+
+            temporal_weight = math.exp(-alpha * days)
+            event_impact = _event_impact(m)
+            duration_bonus = min(1.0, (m.end_year - m.start_year) / 10)
+            score = temporal_weight * event_impact * (1 + duration_bonus)
+
+            display = _en_name(m.name, industry_filter)
+            raw[display] += score
+            if display not in meta:
+                meta[display] = {
+                    "brand": m.brand,
+                    "start_year": m.start_year,
+                    "end_year": m.end_year,
+                    "events": [],
+                }
+            # widen year range if same name appears in multiple entries
+            info = meta[display]
+            info["start_year"] = min(info["start_year"], m.start_year)
+            info["end_year"] = max(info["end_year"], m.end_year)
 
     if not raw:
         return {"ambassadors": [], "synthesis": _empty_synthesis()}
@@ -355,7 +414,8 @@ def compute_live_recommendation(
         })
 
     # ── 5. synthesis from FOL conclusions ───────────────────────────────────
-    synthesis = _build_live_synthesis(ambassadors, industry_filter, now, alpha)
+    with stage("live.synthesis"):
+        synthesis = _build_live_synthesis(ambassadors, industry_filter, now, alpha)
 
     return {"ambassadors": ambassadors, "synthesis": synthesis}
 
@@ -367,33 +427,16 @@ def _build_live_synthesis(
     alpha: float,
 ) -> dict[str, Any]:
     """Extract FOL conclusions from top ambassadors and compose a narrative."""
-    # Collect all active event IDs for this industry
-    active_ids: set[str] = set()
-    for evt in ALL_EVENTS:
-        if industry_filter and industry_filter != "all" and evt.industry != industry_filter:
-            continue
-        active_ids.add(evt.id)
-
-    event_dates: dict[str, datetime] = {e.id: e.date for e in ALL_EVENTS}
-
     # Gather FOL conclusions weighted by temporal proximity
     fol_chains: list[dict[str, Any]] = []
-    for fol in FOL_EVIDENCE:
-        if fol.event_id not in active_ids:
-            continue
-        evt_date = event_dates.get(fol.event_id, now)
-        tw = compute_temporal_weight(evt_date, now=now, alpha=alpha)
-
-        predicates = [n.label_ko or n.label for n in fol.nodes if n.node_type == "fol_predicate"]
-        rule_node = next((n for n in fol.nodes if n.node_type == "fol_rule"), None)
-        conc_node = next((n for n in fol.nodes if n.node_type == "fol_conclusion"), None)
-        if not conc_node:
-            continue
+    for chain in get_fol_index().concluded(industry_filter):
+        tw = compute_temporal_weight(chain.event_date, now=now, alpha=alpha)
+        rule_node, conc_node = chain.rule, chain.conclusion
         fol_chains.append({
-            "predicates": predicates,
+            "predicates": list(chain.predicates),
             "rule": rule_node.label_ko or rule_node.label if rule_node else "",
-            "conclusion": conc_node.label_ko or conc_node.label if conc_node else "",
-            "brand": fol.brand,
+            "conclusion": conc_node.label_ko or conc_node.label,
+            "brand": chain.brand,
             "weight": round(tw, 4),
         })
 
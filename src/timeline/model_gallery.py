@@ -7,9 +7,11 @@ Real celebrity images are served when available; falls back to Imagen-generated
 from __future__ import annotations
 
 import json
+from collections import defaultdict
 from dataclasses import dataclass, field
 from pathlib import Path
-from urllib.parse import quote
+
+from .image_index import RealImageIndex
 
 
 @dataclass
@@ -69,52 +71,22 @@ _BRAND_MAP: dict[str, str] = {
     "whisky_jw_global": "jw_global",
 }
 
-_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
-
-
-# ── Real image scanning ──────────────────────────────────────────────────────
-
-def _scan_real_images() -> dict[str, list[str]]:
-    """Return {product_id: [filename, ...]} from generated_images/real/."""
-    real_dir = _PROJECT_ROOT / "generated_images" / "real"
-    result: dict[str, list[str]] = {}
-    if not real_dir.is_dir():
-        return result
-    for product_dir in real_dir.iterdir():
-        if product_dir.is_dir():
-            result[product_dir.name] = sorted(
-                f.name for f in product_dir.iterdir() if f.is_file()
-            )
-    return result
+WHISKY_PRODUCT_TYPES = frozenset({"scotch_whisky"})
 
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 
-def _find_real_image(
-    product_id: str,
-    start_year: int,
-    model_names: list[str],
-    image_index: dict[str, list[str]],
-) -> str:
-    """Find a real image URL for this timeline entry, or return empty string."""
-    files = image_index.get(product_id, [])
-    if not files:
-        return ""
 
-    year_str = str(start_year)
+# ── Real image index ─────────────────────────────────────────────────────────
 
-    # 1) year + model name match (case-insensitive for English names)
-    for model_name in model_names:
-        clean = model_name.split("(")[0].strip()
-        clean_lower = clean.lower()
-        for fname in files:
-            if fname.startswith(year_str) and (clean in fname or clean_lower in fname.lower()):
-                return f"/images/real/{quote(product_id, safe='')}/{quote(fname, safe='')}"
+REAL_IMAGES_DIR = _PROJECT_ROOT / "generated_images" / "real"
+REAL_IMAGES_MANIFEST = Path(__file__).resolve().parent / "data" / "real_images_manifest.json"
 
-    # 2) year-only match (fallback)
-    for fname in files:
-        if fname.startswith(year_str):
-            return f"/images/real/{quote(product_id, safe='')}/{quote(fname, safe='')}"
 
-    return ""
+def _real_image_index() -> RealImageIndex:
+    """Index of generated_images/real/, refreshed from the on-disk manifest."""
+    index = RealImageIndex(REAL_IMAGES_DIR, REAL_IMAGES_MANIFEST)
+    index.refresh()
+    return index
 
 
 # ── JSON → SojuModel conversion ─────────────────────────────────────────────
@@ -128,7 +100,7 @@ def _load_gallery() -> list[SojuModel]:
         data = json.load(f)
 
     celebrities = data.get("celebrities", {})
-    image_index = _scan_real_images()
+    image_index = _real_image_index()
     models: list[SojuModel] = []
     counter = 1
 
@@ -147,7 +119,7 @@ def _load_gallery() -> list[SojuModel]:
             confidence: str = entry.get("confidence", "medium")
 
             display_name = ", ".join(model_names) if model_names else product_name
-            real_image = _find_real_image(product_id, start_year, model_names, image_index)
+            real_image = image_index.find(product_id, start_year, model_names)
             first_model = model_names[0] if model_names else ""
             profile_url = celebrities.get(first_model, "")
 
@@ -173,26 +145,100 @@ def _load_gallery() -> list[SojuModel]:
     return models
 
 
-MODEL_GALLERY: list[SojuModel] = _load_gallery()
+def __getattr__(name: str):
+    # MODEL_GALLERY is built lazily by the registry on first access.
+    if name == "MODEL_GALLERY":
+        from .registry import get_model_gallery
+
+        return get_model_gallery()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ── Public helpers ───────────────────────────────────────────────────────────
 
+_Postings = tuple[tuple[int, ...], frozenset[int]]
+_NO_POSTINGS: _Postings = ((), frozenset())
+
+
+def _postings(groups: dict) -> dict:
+    return {key: (tuple(positions), frozenset(positions)) for key, positions in groups.items()}
+
+
+class ModelIndex:
+    """Year-bucketed index over the gallery with brand / product_type / industry indexes.
+
+    Each index maps a key to ascending gallery positions, so a query walks
+    only the smallest candidate list (cost ∝ matches, not gallery size) and
+    results keep gallery order.
+    """
+
+    def __init__(self, models: list[SojuModel]) -> None:
+        self.models = models
+        by_year: dict[int, list[int]] = defaultdict(list)
+        by_brand: dict[str, list[int]] = defaultdict(list)
+        by_type: dict[str, list[int]] = defaultdict(list)
+        by_industry: dict[str, list[int]] = defaultdict(list)
+        for pos, m in enumerate(models):
+            for year in range(m.start_year, m.end_year + 1):
+                by_year[year].append(pos)
+            by_brand[m.brand].append(pos)
+            by_type[m.product_type].append(pos)
+            by_industry[_model_industry(m)].append(pos)
+        self._by_year: dict[int, _Postings] = _postings(by_year)
+        self._by_brand: dict[str, _Postings] = _postings(by_brand)
+        self._by_type: dict[str, _Postings] = _postings(by_type)
+        self._by_industry: dict[str, _Postings] = _postings(by_industry)
+
+    @property
+    def brands(self) -> set[str]:
+        return set(self._by_brand)
+
+    @property
+    def product_types(self) -> set[str]:
+        return set(self._by_type)
+
+    def query(
+        self,
+        year: int | None = None,
+        brand: str | None = None,
+        product_type: str | None = None,
+        industry: str | None = None,
+    ) -> list[SojuModel]:
+        """Models matching every given filter ("all" / None means unfiltered).
+
+        industry is "whisky" or anything else (= every non-whisky product).
+        """
+        candidates: list[_Postings] = []
+        if year is not None:
+            candidates.append(self._by_year.get(year, _NO_POSTINGS))
+        if brand and brand != "all":
+            candidates.append(self._by_brand.get(brand, _NO_POSTINGS))
+        if product_type and product_type != "all":
+            candidates.append(self._by_type.get(product_type, _NO_POSTINGS))
+        if industry and industry != "all":
+            key = "whisky" if industry == "whisky" else "non_whisky"
+            candidates.append(self._by_industry.get(key, _NO_POSTINGS))
+        if not candidates:
+            return list(self.models)
+
+        candidates.sort(key=lambda c: len(c[0]))
+        (smallest, _), rest = candidates[0], [c[1] for c in candidates[1:]]
+        return [self.models[pos] for pos in smallest if all(pos in s for s in rest)]
+
+
+def _model_industry(m: SojuModel) -> str:
+    return "whisky" if m.product_type in WHISKY_PRODUCT_TYPES else "non_whisky"
+
+
 def get_models_at_year(
     year: int,
     brand: str | None = None,
     product_type: str | None = None,
 ) -> list[SojuModel]:
     """Return models active at a given year."""
-    result = []
-    for m in MODEL_GALLERY:
-        if m.start_year <= year <= m.end_year:
-            if brand and brand != "all" and m.brand != brand:
-                continue
-            if product_type and product_type != "all" and m.product_type != product_type:
-                continue
-            result.append(m)
-    return result
+    from .registry import get_model_index
+
+    return get_model_index().query(year=year, brand=brand, product_type=product_type)
 
 
 def serialize_model(m: SojuModel) -> dict:
@@ -0,0 +1,261 @@
+"""Lazy registry for the static timeline datasets.
+
+Nothing is built at import time. Each dataset (timeline events, FOL
+evidence, model gallery) is loaded on first access and then shared by every
+caller in the process.
+
+For serverless cold starts a pre-built pickle snapshot can be shipped with
+the deployment and selected via ``TIMELINE_SNAPSHOT=/path/to/file``; it
+replaces executing the data modules and scanning generated_images/real.
+Rebuild it whenever the data or real images change:
+
+    python -m src.timeline.registry build [path]
+
+Multi-worker servers attach a shared store instead (attach_shared_store,
+see src.api.shared_store). The yearly KG checkpoints are then served from
+columnar tables in the memory map without decoding, so every worker reads
+the same pages. Events, FOL evidence and the model gallery are stored as
+one pickled record per row and decoded once per worker on first use: this
+skips executing the data modules and scanning images, but the decoded
+lists, like the indexes derived from them (model_index, fol_index,
+fol_program), are ordinary per-worker objects.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+from .events import TimelineEvent
+from .fol_schema import FOLEvidence
+
+SNAPSHOT_VERSION = 1
+DEFAULT_SNAPSHOT_PATH = Path(__file__).resolve().parent / "data" / "timeline_snapshot.pickle"
+
+_datasets: dict[str, Any] = {}
+_snapshot: dict[str, Any] | None = None
+_snapshot_loaded = False
+_shared = None  # attached SharedBodyStore (src.api.shared_store)
+_lock = threading.RLock()
+
+
+def _build_events() -> list[TimelineEvent]:
+    from .event_data import TIMELINE_EVENTS
+    from .event_data_whisky import WHISKY_TIMELINE_EVENTS
+
+    return TIMELINE_EVENTS + WHISKY_TIMELINE_EVENTS
+
+
+def _build_fol_evidence() -> list[FOLEvidence]:
+    from .fol_evidence import FOL_EVIDENCE
+
+    return FOL_EVIDENCE
+
+
+def _build_model_gallery() -> list:
+    from .model_gallery import _load_gallery
+
+    return _load_gallery()
+
+
+def _build_yearly_snapshots():
+    from .yearly_snapshots import YearlySnapshots
+
+    return YearlySnapshots(get_all_events())
+
+
+_BUILDERS: dict[str, Callable[[], Any]] = {
+    "events": _build_events,
+    "fol_evidence": _build_fol_evidence,
+    "model_gallery": _build_model_gallery,
+    "yearly_snapshots": _build_yearly_snapshots,
+}
+
+
+# Indexes derived from the datasets above. Cheap to rebuild, so they are never
+# pickled into the snapshot (which keeps them pointing at the loaded objects).
+
+def _build_model_index():
+    from .model_gallery import ModelIndex
+
+    return ModelIndex(get_model_gallery())
+
+
+def _build_fol_index():
+    from .fol_index import FOLIndex
+
+    return FOLIndex(get_fol_evidence(), get_all_events())
+
+
+def _build_fol_program():
+    from .fol_inference import FOLProgram
+
+    return FOLProgram.from_index(get_fol_index())
+
+
+def _build_event_facets() -> dict[str, set[str]]:
+    events = get_all_events()
+    return {"industries": {e.industry for e in events}, "brands": {e.brand for e in events}}
+
+
+_DERIVED: dict[str, Callable[[], Any]] = {
+    "event_facets": _build_event_facets,
+    "model_index": _build_model_index,
+    "fol_index": _build_fol_index,
+    "fol_program": _build_fol_program,
+}
+
+
+# ── Shared store ─────────────────────────────────────────────────────────────
+
+# Datasets stored as one pickled record per row.
+_RECORD_DATASETS = ("events", "fol_evidence", "model_gallery")
+
+
+def _load_shared(name: str) -> Any:
+    if name in _RECORD_DATASETS:
+        return [pickle.loads(raw) for raw in _shared.table(f"dataset/{name}")["record"]]
+    if name == "yearly_snapshots":
+        from .yearly_snapshots import YearlySnapshots
+
+        return YearlySnapshots.mapped(_shared.meta["yearly_snapshots"], _shared.table)
+    raise KeyError(name)
+
+
+def attach_shared_store(store) -> None:
+    """Serve the datasets from *store* (a SharedBodyStore; None detaches)."""
+    global _shared
+    with _lock:
+        _shared = store
+        _datasets.clear()
+
+
+def shared_tables() -> tuple[dict[str, dict[str, tuple[str, list]]], dict[str, Any]]:
+    """(tables, meta) holding every dataset, for src.api.shared_store.write_store."""
+    tables: dict[str, dict[str, tuple[str, list]]] = {
+        f"dataset/{name}": {
+            "record": ("bytes", [pickle.dumps(r, protocol=pickle.HIGHEST_PROTOCOL) for r in _BUILDERS[name]()]),
+        }
+        for name in _RECORD_DATASETS
+    }
+    yearly_tables, yearly_meta = _build_yearly_snapshots().columns()
+    tables.update(yearly_tables)
+    return tables, {"yearly_snapshots": yearly_meta}
+
+
+def _load_snapshot() -> dict[str, Any] | None:
+    """Load the snapshot named by $TIMELINE_SNAPSHOT once (None if unset/invalid)."""
+    global _snapshot, _snapshot_loaded
+    if _snapshot_loaded:
+        return _snapshot
+    _snapshot_loaded = True
+    path = os.getenv("TIMELINE_SNAPSHOT")
+    if not path or not Path(path).is_file():
+        return None
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if isinstance(data, dict) and data.get("version") == SNAPSHOT_VERSION:
+        _snapshot = data
+    return _snapshot
+
+
+def _get(name: str) -> Any:
+    if name not in _datasets:
+        with _lock:
+            if name not in _datasets:
+                if name in _DERIVED:
+                    _datasets[name] = _DERIVED[name]()
+                    return _datasets[name]
+                if _shared is not None:
+                    _datasets[name] = _load_shared(name)
+                    return _datasets[name]
+                snapshot = _load_snapshot()
+                if snapshot is not None and name in snapshot:
+                    _datasets[name] = snapshot[name]
+                else:
+                    _datasets[name] = _BUILDERS[name]()
+    return _datasets[name]
+
+
+# ── Public accessors ─────────────────────────────────────────────────────────
+
+def get_all_events() -> list[TimelineEvent]:
+    """Soju + whisky timeline events, in chronological order per industry."""
+    return _get("events")
+
+
+def get_fol_evidence() -> list[FOLEvidence]:
+    return _get("fol_evidence")
+
+
+def get_model_gallery() -> list:
+    """All SojuModel entries from alcohol_models.json."""
+    return _get("model_gallery")
+
+
+def get_yearly_snapshots():
+    """YearlySnapshots materialized for every (industry, brand) variant."""
+    return _get("yearly_snapshots")
+
+
+def get_event_facets() -> dict[str, set[str]]:
+    """Distinct event industries and brands (filter vocabularies for the API)."""
+    return _get("event_facets")
+
+
+def get_model_index():
+    """ModelIndex over get_model_gallery() (year / brand / product_type / industry)."""
+    return _get("model_index")
+
+
+def get_fol_index():
+    """FOLIndex over get_fol_evidence() (by event, brand and industry)."""
+    return _get("fol_index")
+
+
+def get_fol_program():
+    """Horn clauses compiled from the FOL evidence (see fol_inference)."""
+    return _get("fol_program")
+
+
+def loaded_datasets() -> list[str]:
+    """Names of datasets materialized so far (for diagnostics / tests)."""
+    return sorted(_datasets)
+
+
+def build_snapshot(path: str | Path = DEFAULT_SNAPSHOT_PATH) -> Path:
+    """Build every dataset from source and pickle them to *path*."""
+    path = Path(path)
+    data = {"version": SNAPSHOT_VERSION}
+    data.update({name: build() for name, build in _BUILDERS.items()})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    return path
+
+
+def reset() -> None:
+    """Drop every loaded dataset (and the snapshot). Use only in tests."""
+    global _snapshot, _snapshot_loaded, _shared
+    with _lock:
+        _datasets.clear()
+        _snapshot = None
+        _snapshot_loaded = False
+        _shared = None
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "build":
+        out = build_snapshot(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_SNAPSHOT_PATH)
+        print(f"Wrote timeline snapshot to {out}")
+    else:
+        print("usage: python -m src.timeline.registry build [path]")
@@ -0,0 +1,296 @@
+"""Year-granular KG snapshots, materialized once for every filter variant.
+
+For each (industry, brand) variant the timeline is replayed with the same
+semantics as build_kg_snapshot at the end of every year. Every distinct
+node/edge version (its attributes at some point in time) becomes a row in a
+per-variant columnar table. A year's state is an ordered array of row ids,
+and years without new events share the previous state. Temporal weights are
+computed from each row's added_date for the requested alpha, so one
+materialization serves every alpha.
+
+Included in the registry pickle snapshot (``python -m src.timeline.registry
+build``), so deployments can ship it prebuilt. columns() flattens every
+variant into columnar tables for the shared store (src.api.shared_store);
+YearlySnapshots.mapped() serves them from the map through MappedYearlyTable
+without materializing the rows in each worker.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import accumulate
+from typing import Any
+
+from src.memory.temporal_decay import compute_temporal_weight
+
+from .events import TimelineEvent
+
+_ALL = "all"
+_UNKNOWN = "__unknown__"
+
+NODE_COLUMNS = ("id", "label", "type", "brand", "added_date", "event_id")
+EDGE_COLUMNS = ("source", "target", "relation", "brand", "added_date", "event_id")
+
+
+def table_name(industry: str, brand: str) -> str:
+    """Shared-store table holding one (industry, brand) variant."""
+    return f"yearly/{industry}/{brand}"
+
+
+def year_cutoff(year: int) -> datetime:
+    """The instant a yearly snapshot represents (events dated <= it are applied)."""
+    return datetime(year, 12, 31)
+
+
+def _replay(events: list[TimelineEvent]) -> tuple[dict[str, tuple], dict[str, dict[str, tuple]]]:
+    """Apply mutations like kg_snapshot._apply_mutation, on plain dicts.
+
+    Returns (nodes, successors) in the iteration order networkx would use.
+    """
+    nodes: dict[str, tuple] = {}
+    succ: dict[str, dict[str, tuple]] = {}
+    for event in events:
+        added = event.date.isoformat()
+        for mut in event.kg_mutations:
+            if mut.action == "add_node" and mut.node_id:
+                nodes[mut.node_id] = (
+                    mut.node_id, mut.label, mut.node_type, mut.brand or event.brand, added, event.id,
+                )
+            elif mut.action == "add_edge" and mut.source and mut.target:
+                for nid in (mut.source, mut.target):
+                    if nid not in nodes:
+                        nodes[nid] = (nid, nid, "unknown", event.brand, added, event.id)
+                succ.setdefault(mut.source, {})[mut.target] = (
+                    mut.source, mut.target, mut.relation, event.brand, added, event.id,
+                )
+    return nodes, succ
+
+
+@dataclass
+class YearlyTable:
+    """Columnar rows plus one ordered row-id array per distinct yearly state."""
+    first_year: int
+    node_rows: list[tuple] = field(default_factory=list)
+    edge_rows: list[tuple] = field(default_factory=list)
+    node_added: list[datetime] = field(default_factory=list)
+    edge_added: list[datetime] = field(default_factory=list)
+    states: list[tuple[array, array, int, str | None]] = field(default_factory=list)
+    year_state: list[int] = field(default_factory=list)  # year - first_year → state index
+
+    @classmethod
+    def materialize(cls, events: list[TimelineEvent], first_year: int, last_year: int) -> YearlyTable:
+        table = cls(first_year=first_year)
+        node_ids: dict[tuple, int] = {}
+        edge_ids: dict[tuple, int] = {}
+
+        def row_id(rows: list[tuple], added: list[datetime], ids: dict[tuple, int], row: tuple) -> int:
+            if row not in ids:
+                ids[row] = len(rows)
+                rows.append(row)
+                added.append(datetime.fromisoformat(row[4]))
+            return ids[row]
+
+        active_count = -1
+        for year in range(first_year, last_year + 1):
+            cutoff = year_cutoff(year)
+            active = [e for e in events if e.date <= cutoff]
+            if len(active) != active_count:
+                active_count = len(active)
+                nodes, succ = _replay(active)
+                node_state = array("I", (
+                    row_id(table.node_rows, table.node_added, node_ids, row) for row in nodes.values()
+                ))
+                edge_state = array("I", (
+                    row_id(table.edge_rows, table.edge_added, edge_ids, row)
+                    for nid in nodes for row in succ.get(nid, {}).values()
+                ))
+                table.states.append((node_state, edge_state, active_count, active[-1].id if active else None))
+            table.year_state.append(len(table.states) - 1)
+        return table
+
+    def frame(self, year: int) -> tuple[array, array, int, str | None]:
+        """(node rows, edge rows, active event count, current event id) for *year*."""
+        return self.states[self.year_state[year - self.first_year]]
+
+    def columns(self) -> dict[str, tuple[str, list]]:
+        """This table as flat (kind, values) columns for the shared store."""
+        cols: dict[str, tuple[str, list]] = {}
+        for prefix, names, rows in (("node", NODE_COLUMNS, self.node_rows), ("edge", EDGE_COLUMNS, self.edge_rows)):
+            for i, name in enumerate(names):
+                cols[f"{prefix}_{name}"] = ("str", [row[i] for row in rows])
+        for prefix, slot in (("node", 0), ("edge", 1)):
+            members = [state[slot] for state in self.states]
+            cols[f"{prefix}_members"] = ("u32", [r for m in members for r in m])
+            cols[f"{prefix}_bounds"] = ("i64", [0, *accumulate(len(m) for m in members)])
+        cols["state_active"] = ("i64", [state[2] for state in self.states])
+        cols["state_event"] = ("str", [state[3] or "" for state in self.states])
+        cols["year_state"] = ("i64", list(self.year_state))
+        return cols
+
+
+class _MappedRows(Sequence):
+    """Row tuples assembled from per-field columns on access."""
+
+    def __init__(self, columns: list[Sequence]) -> None:
+        self._columns = columns
+
+    def __len__(self) -> int:
+        return len(self._columns[0])
+
+    def __getitem__(self, r: int) -> tuple:
+        return tuple(column[r] for column in self._columns)
+
+
+class _MappedDates(Sequence):
+    def __init__(self, column: Sequence[str]) -> None:
+        self._column = column
+
+    def __len__(self) -> int:
+        return len(self._column)
+
+    def __getitem__(self, r: int) -> datetime:
+        return datetime.fromisoformat(self._column[r])
+
+
+class MappedYearlyTable:
+    """Read-only YearlyTable over columns() output held in a shared store."""
+
+    def __init__(self, first_year: int, columns: Mapping[str, Sequence]) -> None:
+        self.first_year = first_year
+        self.node_rows = _MappedRows([columns[f"node_{name}"] for name in NODE_COLUMNS])
+        self.edge_rows = _MappedRows([columns[f"edge_{name}"] for name in EDGE_COLUMNS])
+        self.node_added = _MappedDates(columns["node_added_date"])
+        self.edge_added = _MappedDates(columns["edge_added_date"])
+        self._columns = columns
+
+    def frame(self, year: int) -> tuple[Sequence[int], Sequence[int], int, str | None]:
+        c = self._columns
+        state = c["year_state"][year - self.first_year]
+        node_bounds, edge_bounds = c["node_bounds"], c["edge_bounds"]
+        return (
+            c["node_members"][node_bounds[state]:node_bounds[state + 1]],
+            c["edge_members"][edge_bounds[state]:edge_bounds[state + 1]],
+            c["state_active"][state],
+            c["state_event"][state] or None,
+        )
+
+
+class YearlySnapshots:
+    """YearlyTable per (industry, brand) filter variant over first_year..last_year."""
+
+    def __init__(self, events: list[TimelineEvent], last_year: int | None = None) -> None:
+        self.events = events
+        self.first_year = min(e.date.year for e in events) if events else datetime.now().year
+        self.last_year = last_year or max([datetime.now().year, *(e.date.year for e in events)])
+        self.industries = {e.industry for e in events}
+        self.brands = {e.brand for e in events}
+        self.tables: dict[tuple[str, str], YearlyTable] = {}
+        for industry in [_ALL, *sorted(self.industries)]:
+            for brand in [_ALL, *sorted(self.brands)]:
+                self.table(industry, brand)
+
+    @classmethod
+    def mapped(cls, meta: dict[str, Any], load: Callable[[str], Mapping[str, Sequence]]) -> YearlySnapshots:
+        """Serve the tables written by columns(); *load* returns a table's columns by name."""
+        self = cls.__new__(cls)
+        self.events = []  # columns() exported every variant, so nothing is materialized
+        self.first_year, self.last_year = meta["first_year"], meta["last_year"]
+        self.industries, self.brands = set(meta["industries"]), set(meta["brands"])
+        self.tables = {
+            (ind, br): MappedYearlyTable(self.first_year, load(table_name(ind, br)))
+            for ind, br in meta["variants"]
+        }
+        return self
+
+    def columns(self) -> tuple[dict[str, dict[str, tuple[str, list]]], dict[str, Any]]:
+        """(tables, meta) for the shared store; see mapped()."""
+        for industry in [_ALL, *sorted(self.industries), _UNKNOWN]:
+            for brand in [_ALL, *sorted(self.brands), _UNKNOWN]:
+                self.table(industry, brand)  # every variant _key() can map to
+        tables = {table_name(ind, br): table.columns() for (ind, br), table in self.tables.items()}
+        meta = {
+            "first_year": self.first_year,
+            "last_year": self.last_year,
+            "industries": sorted(self.industries),
+            "brands": sorted(self.brands),
+            "variants": sorted(self.tables),
+        }
+        return tables, meta
+
+    def _key(self, industry: str | None, brand: str | None) -> tuple[str, str]:
+        ind = _ALL if not industry or industry == _ALL else (industry if industry in self.industries else _UNKNOWN)
+        br = _ALL if not brand or brand == _ALL else (brand if brand in self.brands else _UNKNOWN)
+        return ind, br
+
+    def table(self, industry: str | None, brand: str | None) -> YearlyTable:
+        key = self._key(industry, brand)
+        if key not in self.tables:
+            ind, br = key
+            matching = [
+                e for e in self.events
+                if (ind == _ALL or e.industry == ind)
+                and (br == _ALL or e.brand == br or e.brand == "multi")
+            ]
+            self.tables[key] = YearlyTable.materialize(matching, self.first_year, self.last_year)
+        return self.tables[key]
+
+    def range_payload(
+        self,
+        year_from: int,
+        year_to: int,
+        alpha: float,
+        industry: str | None = None,
+        brand: str | None = None,
+    ) -> dict[str, Any]:
+        """Every yearly frame in [year_from, year_to] in one compact payload.
+
+        Rows used by any frame are returned once as columns; frames reference
+        them by index and carry the per-year temporal weights.
+        """
+        year_from = max(year_from, self.first_year)
+        year_to = min(year_to, self.last_year)
+        table = self.table(industry, brand)
+
+        node_index: dict[int, int] = {}
+        edge_index: dict[int, int] = {}
+        frames: list[dict[str, Any]] = []
+        for year in range(year_from, year_to + 1):
+            node_state, edge_state, active_events, current_event_id = table.frame(year)
+            cutoff = year_cutoff(year)
+            frames.append({
+                "year": year,
+                "date": cutoff.date().isoformat(),
+                "nodes": [node_index.setdefault(r, len(node_index)) for r in node_state],
+                "node_weights": [
+                    round(compute_temporal_weight(table.node_added[r], now=cutoff, alpha=alpha), 4)
+                    for r in node_state
+                ],
+                "edges": [edge_index.setdefault(r, len(edge_index)) for r in edge_state],
+                "edge_weights": [
+                    round(compute_temporal_weight(table.edge_added[r], now=cutoff, alpha=alpha), 4)
+                    for r in edge_state
+                ],
+                "stats": {
+                    "total_nodes": len(node_state),
+                    "total_edges": len(edge_state),
+                    "active_events": active_events,
+                    "brands": sorted({table.node_rows[r][3] for r in node_state} - {""}),
+                },
+                "current_event_id": current_event_id,
+            })
+
+        def columns(names: tuple[str, ...], rows: list[tuple], index: dict[int, int]) -> dict[str, list]:
+            ordered = [rows[r] for r in index]  # dicts keep insertion (= local index) order
+            return {name: [row[i] for row in ordered] for i, name in enumerate(names)}
+
+        return {
+            "from": year_from,
+            "to": year_to,
+            "alpha": alpha,
+            "nodes": columns(NODE_COLUMNS, table.node_rows, node_index),
+            "edges": columns(EDGE_COLUMNS, table.edge_rows, edge_index),
+            "frames": frames,
+        }
@@ -0,0 +1,44 @@
+"""Shared fixtures: an offline embedding so Chroma-backed tests need no model download."""
+
+import hashlib
+
+import numpy as np
+import pytest
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+
+from src.memory.memory_system import BrandMemorySystem
+from src.memory.vector_store import BrandVectorStore
+
+
+class HashEmbedding(EmbeddingFunction[Documents]):
+    """Bag-of-words hashed into 64 dims; deterministic and needs no model download."""
+
+    def __init__(self) -> None:
+        pass
+
+    def __call__(self, input: Documents) -> Embeddings:
+        vectors = []
+        for text in input:
+            v = np.zeros(64, dtype=np.float32)
+            for word in text.lower().split():
+                v[int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1
+            vectors.append(v / (np.linalg.norm(v) or 1.0))
+        return vectors
+
+    @staticmethod
+    def name() -> str:
+        return "test-hash"
+
+    def get_config(self) -> dict:
+        return {}
+
+    @staticmethod
+    def build_from_config(config: dict) -> "HashEmbedding":
+        return HashEmbedding()
+
+
+@pytest.fixture
+def memory(tmp_path):
+    store = BrandVectorStore(persist_dir=str(tmp_path / "chroma"), embedding_function=HashEmbedding())
+    yield BrandMemorySystem(vector_store=store)
+    store.reset()
@@ -1,6 +1,6 @@
 """Tests for brand guard tools — memory-backed verification."""
 
-from src.agents.brand_guard.tools import check_brand_alignment, check_ingredient_accuracy
+from src.agents.brand_guard.tools import check_brand_alignment, check_ingredient_accuracy, find_concept_owner
 from src.memory.memory_system import BrandMemorySystem
 from src.memory.schema import KGTriplet, MemoryNote
 from src.data.seed_loader import load_all
@@ -59,3 +59,14 @@ def test_check_ingredient_accuracy_chamisul():
         "Bamboo charcoal, purified water, rice",
     )
     assert "Bamboo charcoal" in result["claimed_ingredients"]
+
+
+def test_find_concept_owner_ignores_negated_facts(memory):
+    guard_tools._get_memory._instance = memory
+    memory.add_triplet(KGTriplet("Saero", "HAS_CLAIM", "Zero Sugar", "saero"))
+    for product in ("Chamisul Fresh", "Chamisul Original"):
+        memory.add_triplet(KGTriplet(product, "does_not_use", "Zero Sugar", "chamisul"))
+
+    result = find_concept_owner("Zero Sugar")
+    assert len(result["graph_facts"]["chamisul"]) == 2  # more neighbours, all negative
+    assert result["owner"] == "saero"
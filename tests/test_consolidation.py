@@ -0,0 +1,152 @@
+"""Tests for the background consolidation worker (offline embedding, fake summarizer)."""
+
+import asyncio
+
+from src.memory.consolidation import ConsolidationBudget, ConsolidationWorker, archive_collection
+
+
+def _fake_summarizer(calls):
+    async def summarize(brand, category, texts):
+        calls.append((brand, category, sorted(texts)))
+        return f"{len(texts)} merged notes"
+    return summarize
+
+
+def test_consolidates_near_duplicates_and_archives_originals(memory):
+    dupes = [
+        memory.add_note(f"saero zero sugar soju launch campaign {tail}", "saero", "product")
+        for tail in ("", "", "announced")
+    ]
+    other = memory.add_note("retro jinro bottle design", "saero", "product")
+    calls = []
+    worker = ConsolidationWorker(memory, brands=["saero"], summarize=_fake_summarizer(calls), similarity_threshold=0.85)
+
+    written = asyncio.run(worker.run_once())
+
+    assert len(written) == 1 and len(calls) == 1
+    assert written[0].content == "[CONSOLIDATED] 3 merged notes"
+    assert set(written[0].connections) == {n.id for n in dupes}
+    store = memory.vector_store
+    assert store.count("saero_notes") == 2  # summary + the unrelated note
+    archived = store.get_rows(archive_collection("saero"), [n.id for n in dupes])
+    assert {r["metadata"]["consolidated_into"] for r in archived} == {written[0].id}
+    assert other.id in store.recency_index("saero_notes")
+
+    # Incremental: nothing new → no work; a new duplicate only grows the cluster.
+    assert asyncio.run(worker.run_once()) == []
+    memory.add_note("saero zero sugar soju launch campaign", "saero", "product")
+    assert asyncio.run(worker.run_once()) == []
+    assert len(calls) == 1
+
+
+def test_budget_limits_llm_calls_per_pass(memory):
+    for topic in ("alpha", "beta", "gamma"):
+        for _ in range(3):
+            memory.add_note(f"chamisul {topic} note", "chamisul", "marketing")
+    calls = []
+    worker = ConsolidationWorker(
+        memory,
+        brands=["chamisul"],
+        summarize=_fake_summarizer(calls),
+        budget=ConsolidationBudget(max_llm_calls=2),
+    )
+    assert len(asyncio.run(worker.run_once())) == 2
+    assert len(asyncio.run(worker.run_once())) == 1
+    assert memory.vector_store.count("chamisul_notes") == 3
+
+
+def test_consolidate_memories_covers_the_whole_category(memory, monkeypatch):
+    import src.llm.gemini_client as gemini
+
+    topics = ("alpha", "beta", "gamma", "delta")  # more clusters than the default budget's LLM calls
+    for topic in topics:
+        for _ in range(3):
+            memory.add_note(f"chumchurum {topic} alkaline water soft taste", "chumchurum", "product")
+    memory.add_note("chumchurum alkaline water soft taste", "chumchurum", "marketing")
+
+    monkeypatch.setattr(gemini, "summarize_memories", _fake_summarizer([]))
+    notes = asyncio.run(memory.consolidate_memories("chumchurum", "product"))
+    assert len(notes) == len(topics) and all(n.category == "product" for n in notes)
+    assert memory.vector_store.count("chumchurum_notes") == len(topics) + 1
+
+
+def test_server_lifespan_runs_worker_when_enabled(memory, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import src.api.server as server
+    from src.agents import root_tools
+    from src.memory.consolidation import ConsolidationWorker
+
+    started = []
+    real_start = ConsolidationWorker.start
+
+    def start(self):
+        started.append(self)
+        return real_start(self)
+
+    monkeypatch.setattr(ConsolidationWorker, "start", start)
+    monkeypatch.setattr(server, "MEMORY_CONSOLIDATION_ENABLED", True)
+    monkeypatch.setattr(root_tools, "_memory", memory)
+    with TestClient(server.app):
+        assert len(started) == 1 and started[0].memory is memory
+        assert started[0]._task is not None and started[0].tiering is not None
+    assert started[0]._task is None  # stopped on shutdown
+
+
+def test_as_of_search_still_sees_consolidated_originals(memory):
+    from datetime import datetime
+
+    from src.memory.schema import MemoryNote
+
+    dates = [datetime(2010, 3, 1), datetime(2010, 6, 1), datetime(2010, 9, 1)]
+    originals = []
+    for created in dates:
+        note = MemoryNote(
+            content="chamisul fresh bamboo charcoal relaunch", brand_namespace="chamisul",
+            category="product", created_at=created,
+        )
+        memory.vector_store.add_note(note)
+        originals.append(note)
+    query = "chamisul bamboo charcoal relaunch"
+    assert len(memory.search(query, "chamisul", k=5, as_of=datetime(2011, 1, 1))) == 3
+
+    worker = ConsolidationWorker(memory, brands=["chamisul"], summarize=_fake_summarizer([]))
+    [summary] = asyncio.run(worker.run_once())
+    assert summary.created_at == dates[-1]  # dated like its newest member, not the pass
+
+    # Before the summary existed, the archived originals answer the as-of query ...
+    then = memory.search(query, "chamisul", k=5, as_of=datetime(2010, 7, 1))
+    assert {r["id"] for r in then} == {originals[0].id, originals[1].id}
+    # ... afterwards the summary stands in for them.
+    later = memory.search(query, "chamisul", k=5, as_of=datetime(2011, 1, 1))
+    assert [r["id"] for r in later] == [summary.id]
+
+
+def test_pass_runs_off_the_event_loop_and_one_process_holds_the_lock(memory, tmp_path):
+    import threading
+
+    threads = []
+
+    class RecordingPolicy:
+        def sweep(self, store, brand):
+            threads.append(threading.get_ident())
+            return []
+
+    for _ in range(3):
+        memory.add_note("saero zero sugar soju launch campaign", "saero", "product")
+    lock = tmp_path / "consolidation.lock"
+    leader = ConsolidationWorker(
+        memory, brands=["saero"], summarize=_fake_summarizer([]), tiering=RecordingPolicy(), lock_path=lock,
+    )
+    standby = ConsolidationWorker(memory, brands=["saero"], summarize=_fake_summarizer([]), lock_path=lock)
+
+    async def scenario():
+        written = await leader.run_once()
+        assert threads and threading.get_ident() not in threads
+        assert await standby.run_once() == []  # leader keeps the lock between passes
+        await leader.stop()
+        return written
+
+    assert len(asyncio.run(scenario())) == 1
+    assert standby._acquire_lock()
+    standby._release_lock()
@@ -0,0 +1,78 @@
+"""Tests for token-budgeted context assembly."""
+
+from datetime import datetime
+
+from src.memory.context_packer import (
+    EMPTY_CONTEXT,
+    EXPANSION,
+    FACTS,
+    NOTES,
+    ContextItem,
+    pack_context,
+)
+from src.memory.schema import KGTriplet, MemoryNote
+from src.memory.tokens import estimate_tokens
+
+
+def test_dedupes_by_triplet_id_and_text():
+    items = [
+        ContextItem(FACTS, "Chamisul → uses → bamboo charcoal", 0.9, "t1"),
+        ContextItem(EXPANSION, "Chamisul → uses → bamboo charcoal", 0.5, "t1"),
+        ContextItem(EXPANSION, "renamed but same triplet", 0.4, "t1"),
+        ContextItem(NOTES, "  chamisul   USES bamboo charcoal ", 0.8),
+        ContextItem(NOTES, "Chamisul uses bamboo charcoal", 0.7),
+    ]
+    context = pack_context(items, token_budget=1000)
+    assert context.count("bamboo charcoal") == 2  # the fact once, the note once
+    assert "renamed but same triplet" not in context
+    assert EXPANSION not in context
+
+
+def test_direct_hit_stays_a_fact_when_expansion_scores_higher():
+    items = [
+        ContextItem(EXPANSION, "Saero → launched → Zero Sugar", 0.8, "t1"),
+        ContextItem(FACTS, "Saero → launched → Zero Sugar", 0.6, "t1"),
+        ContextItem(FACTS, "Saero → targets → MZ generation", 0.7, "t2"),
+    ]
+    context = pack_context(items, token_budget=1000)
+    assert EXPANSION not in context
+    facts = [line for line in context.splitlines() if line.startswith("- ")]
+    assert facts == ["- Saero → launched → Zero Sugar", "- Saero → targets → MZ generation"]  # keeps the 0.8
+
+
+def test_greedy_fill_respects_budget_and_keeps_best():
+    items = [ContextItem(NOTES, f"note {i} " + "detail " * 10, score=i / 100) for i in range(100)]
+    context = pack_context(items, token_budget=200)
+    assert estimate_tokens(context) <= 200
+    kept = [line for line in context.splitlines() if line.startswith("- ")]
+    assert 0 < len(kept) < 100
+    assert kept[0].startswith("- [0.99] note 99")
+    assert "note 0 " not in context
+
+
+def test_oversized_item_is_skipped_not_truncating():
+    items = [
+        ContextItem(NOTES, "huge " * 500, 0.9),
+        ContextItem(NOTES, "small note", 0.1),
+    ]
+    context = pack_context(items, token_budget=50)
+    assert "small note" in context and "huge" not in context
+    assert pack_context([], token_budget=50) == EMPTY_CONTEXT
+
+
+def test_build_context_injection_dedupes_expansion_and_fits_budget(memory):
+    now = datetime(2025, 1, 1)
+    for i in range(30):
+        memory.vector_store.add_note(MemoryNote(
+            content=f"chamisul bamboo charcoal campaign note {i} " + "with supporting detail " * 5,
+            brand_namespace="chamisul", category="campaign", created_at=now,
+        ))
+    triplet = KGTriplet("Chamisul", "uses", "bamboo charcoal", "chamisul", created_at=now)
+    memory.add_triplet(triplet)
+    memory.add_triplet(KGTriplet("bamboo charcoal", "improves", "smoothness", "chamisul", created_at=now))
+
+    context = memory.build_context_injection("chamisul bamboo charcoal", "chamisul", now=now, token_budget=300)
+
+    assert estimate_tokens(context) <= 300
+    assert context.count(triplet.text) == 1  # vector hit and graph neighbor collapse
+    assert "## Brand Memory Notes" in context
@@ -0,0 +1,85 @@
+"""Tests for forward-chaining inference over the FOL evidence layer."""
+
+import time
+from datetime import datetime
+
+from src.timeline import registry
+from src.timeline.fol_inference import (
+    BaseFact,
+    FOLProgram,
+    ForwardChainer,
+    HornClause,
+    infer_at,
+    parse_rule,
+)
+
+
+def test_parse_rule_chains_and_conjunctions():
+    assert parse_rule("NationalCapital ^ ColonialResistance -> HeritageAuth") == [
+        (("sym:NationalCapital", "sym:ColonialResistance"), "sym:HeritageAuth"),
+    ]
+    assert parse_rule("A -> B(x) -> C") == [(("sym:A",), "sym:B"), (("sym:B",), "sym:C")]
+    assert parse_rule("not a rule") == []
+
+
+def test_confidence_follows_weakest_premise():
+    program = FOLProgram(
+        clauses=[
+            HornClause(("p", "q"), "r", "rule_r"),
+            HornClause(("r",), "s", "rule_s"),
+        ],
+        facts=[
+            BaseFact("p", datetime(2000, 1, 1), "e1"),
+            BaseFact("q", datetime(2010, 1, 1), "e2"),
+        ],
+        conclusions={},
+    )
+    chainer = ForwardChainer(program)
+    assert chainer.advance(datetime(2005, 1, 1)) == ["p"]
+    assert "s" not in chainer.known
+
+    assert chainer.advance(datetime(2020, 1, 1)) == ["q", "r", "s"]
+    assert chainer.known["s"].date == datetime(2000, 1, 1)
+    assert chainer.known["s"].rule_id == "rule_s"
+    assert chainer.confidence("s", 0.0001) == chainer.confidence("p", 0.0001)
+
+
+def test_incremental_advance_matches_fresh_run():
+    program = registry.get_fol_program()
+    chainer = ForwardChainer(program)
+    for year in range(1900, 2027, 7):
+        date = datetime(year, 6, 1)
+        chainer.advance(date)
+        fresh = ForwardChainer(program)
+        fresh.advance(date)
+        assert {k: v.date for k, v in chainer.known.items()} == {
+            k: v.date for k, v in fresh.known.items()
+        }
+
+
+def test_snapshot_derives_conclusions_of_active_events():
+    date = datetime(2026, 2, 1)
+    program = registry.get_fol_program()
+    event_ids = {e.id for e in registry.get_all_events() if e.date <= date}
+    derived = {c["id"] for c in infer_at(program, date, 0.0001, event_ids)}
+
+    expected = {
+        chain.conclusion.id
+        for chain in registry.get_fol_index().concluded()
+        if chain.evidence.event_id in event_ids
+    }
+    assert expected <= derived
+
+
+def test_thousands_of_rules_run_quickly():
+    n = 5000
+    clauses = [HornClause((f"a{i}", f"b{i}"), f"a{i + 1}", f"r{i}") for i in range(n)]
+    facts = [BaseFact(f"b{i}", datetime(2000, 1, 1), "e") for i in range(n)]
+    facts.append(BaseFact("a0", datetime(2001, 1, 1), "e"))
+    program = FOLProgram(clauses, facts, {})
+
+    start = time.perf_counter()
+    chainer = ForwardChainer(program)
+    chainer.advance(datetime(2002, 1, 1))
+    assert time.perf_counter() - start < 1.0
+    assert chainer.known[f"a{n}"].date == datetime(2000, 1, 1)
@@ -0,0 +1,73 @@
+"""Tests for the real-image index behind the model gallery."""
+
+import os
+
+from src.timeline.image_index import RealImageIndex
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+
+
+def _bump_mtime(path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_find_prefers_model_name_then_year(tmp_path):
+    root = tmp_path / "real"
+    _touch(root / "jinro" / "2019_공유_01.jpg")
+    _touch(root / "jinro" / "2019_Sabrina Carpenter.webp")
+    _touch(root / "jinro" / "insight_05.jpg")
+    index = RealImageIndex(root)
+    index.refresh()
+
+    url = index.find("jinro", 2019, ["sabrina carpenter(사브리나 카펜터)"])
+    assert url.endswith("/2019_Sabrina%20Carpenter.webp")
+    assert index.find("jinro", 2019, ["공유"]).endswith("/2019_%EA%B3%B5%EC%9C%A0_01.jpg")
+    # no name match: first file of that year in sorted order
+    assert index.find("jinro", 2019, ["아이유"]) == url
+    assert index.find("jinro", 2020, ["공유"]) == ""
+    assert index.find("missing", 2019, ["공유"]) == ""
+
+
+def test_manifest_skips_unchanged_dirs(tmp_path, monkeypatch):
+    root = tmp_path / "real"
+    manifest = tmp_path / "manifest.json"
+    _touch(root / "a" / "2010_x.jpg")
+    _touch(root / "b" / "2011_y.jpg")
+    RealImageIndex(root, manifest).refresh()
+
+    listed = []
+    real_iterdir = type(root).iterdir
+
+    def tracking_iterdir(self):
+        listed.append(self.name)
+        return real_iterdir(self)
+
+    monkeypatch.setattr(type(root), "iterdir", tracking_iterdir)
+
+    index = RealImageIndex(root, manifest)
+    assert index.refresh() is False
+    assert listed == []
+    assert index.find("a", 2010, []).endswith("/2010_x.jpg")
+
+    _touch(root / "b" / "2012_z.jpg")
+    _bump_mtime(root / "b")
+    assert index.refresh() is True
+    assert listed == ["b"]
+    assert index.find("b", 2012, ["z"]).endswith("/2012_z.jpg")
+
+
+def test_removed_product_dir_is_dropped(tmp_path):
+    root = tmp_path / "real"
+    _touch(root / "a" / "2010_x.jpg")
+    index = RealImageIndex(root)
+    index.refresh()
+
+    (root / "a" / "2010_x.jpg").unlink()
+    (root / "a").rmdir()
+    _bump_mtime(root)
+    assert index.refresh() is True
+    assert index.find("a", 2010, []) == ""
@@ -0,0 +1,77 @@
+"""Tests for the KG snapshot API, including the NDJSON stream."""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from src.api.server import app
+
+client = TestClient(app)
+
+
+def _stream(**params):
+    resp = client.get("/api/kg/snapshot/stream", params=params)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in resp.text.splitlines()]
+
+
+def test_stream_matches_snapshot():
+    params = {"date": "2005-06-01", "include_fol": "true"}
+    snapshot = client.get("/api/kg/snapshot", params=params).json()
+    records = _stream(**params)
+
+    def of(kind):
+        return [{k: v for k, v in r.items() if k != "kind"} for r in records if r["kind"] == kind]
+
+    assert of("node") == snapshot["nodes"]
+    assert of("edge") == snapshot["edges"]
+    assert of("fol_node") == snapshot["fol_nodes"]
+    assert of("fol_edge") == snapshot["fol_edges"]
+    assert of("fol_inference") == snapshot["fol_inferences"]
+
+    stats = records[-1]
+    assert stats["kind"] == "stats"
+    assert stats["current_event"] == snapshot["current_event"]
+    assert {k: stats[k] for k in snapshot["stats"]} == snapshot["stats"]
+
+
+def test_stream_field_projection():
+    records = _stream(date="2020-01-01", fields="id,temporal_weight")
+    nodes = [r for r in records if r["kind"] == "node"]
+    assert nodes
+    assert all(set(n) == {"kind", "id", "temporal_weight"} for n in nodes)
+    assert records[-1]["kind"] == "stats"
+
+
+def test_stream_projection_keeps_identity_keys():
+    records = _stream(date="2020-01-01", fields="id,label")
+    edges = [r for r in records if r["kind"] == "edge"]
+    assert edges
+    assert all(set(e) == {"kind", "source", "target"} for e in edges)
+    assert all(set(n) == {"kind", "id", "label"} for n in records if n["kind"] == "node")
+
+
+def test_yearly_snapshots_match_point_snapshots():
+    data = client.get(
+        "/api/kg/snapshots",
+        params={"from": 1995, "to": 2000, "brand": "chamisul", "industry": "soju"},
+    ).json()
+    assert [f["year"] for f in data["frames"]] == list(range(1995, 2001))
+
+    for frame in data["frames"]:
+        snapshot = client.get(
+            "/api/kg/snapshot",
+            params={"date": frame["date"], "brand": "chamisul", "industry": "soju"},
+        ).json()
+        assert [data["nodes"]["id"][i] for i in frame["nodes"]] == [n["id"] for n in snapshot["nodes"]]
+        assert frame["node_weights"] == [n["temporal_weight"] for n in snapshot["nodes"]]
+        assert [
+            (data["edges"]["source"][i], data["edges"]["target"][i]) for i in frame["edges"]
+        ] == [(e["source"], e["target"]) for e in snapshot["edges"]]
+        assert frame["stats"] == snapshot["stats"]
+
+
+def test_yearly_snapshots_reject_inverted_range():
+    resp = client.get("/api/kg/snapshots", params={"from": 2010, "to": 1990})
+    assert resp.status_code == 400
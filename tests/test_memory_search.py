@@ -0,0 +1,183 @@
+"""Tests for memory search modes, using an offline hashing embedding."""
+
+from datetime import datetime, timedelta
+
+from src.memory.retrieval import RecencyIndex
+from src.memory.schema import KGTriplet, MemoryNote
+from src.memory.temporal_decay import compute_combined_score
+from src.memory.vector_store import to_epoch
+
+
+def _add(memory, content, created_at, brand="saero"):
+    note = MemoryNote(content=content, brand_namespace=brand, category="product", created_at=created_at)
+    memory._notes_cache[note.id] = note
+    memory.vector_store.add_note(note)
+    return note
+
+
+def test_as_of_excludes_future_notes(memory):
+    base = datetime(2010, 1, 1)
+    old = _add(memory, "zero sugar soju launch", base)
+    for year in range(1, 6):
+        _add(memory, f"zero sugar soju update {year}", base + timedelta(days=365 * year))
+
+    results = memory.search("zero sugar soju", "saero", k=3, as_of=base + timedelta(days=10))
+    assert [r["id"] for r in results] == [old.id]
+
+    results = memory.search("zero sugar soju", "saero", k=3, as_of=base + timedelta(days=365 * 2 + 1))
+    assert len(results) == 3
+    cutoff = (base + timedelta(days=365 * 2 + 1)).isoformat()
+    assert all(r["metadata"]["created_at"] <= cutoff for r in results)
+
+
+def test_as_of_widens_until_k_survive(memory, monkeypatch):
+    base = datetime(2015, 6, 1)
+    for i in range(12):
+        _add(memory, f"soju note {i}", base + timedelta(days=i))
+
+    calls = []
+    real_query = memory.vector_store.query_many
+
+    def short_query(*args, **kwargs):
+        calls.append(kwargs["k"])
+        # Simulate a selective filtered HNSW query returning only half of n.
+        return [rows[: max(1, kwargs["k"] // 2)] for rows in real_query(*args, **kwargs)]
+
+    monkeypatch.setattr(memory.vector_store, "query_many", short_query)
+    results = memory.search("soju note", "saero", k=3, as_of=base + timedelta(days=30))
+    assert calls[:2] == [6, 12]
+    assert len(results) == 3
+
+
+def test_as_of_backfills_legacy_rows(memory):
+    note = _add(memory, "legacy chamisul note", datetime(2005, 5, 5), brand="chamisul")
+    coll = memory.vector_store._get_collection("chamisul_notes")
+    meta = coll.get(ids=[note.id])["metadatas"][0]
+    legacy = {k: v for k, v in meta.items() if k != "created_at_ts"}
+    coll.delete(ids=[note.id])
+    coll.add(ids=[note.id], documents=[note.content], metadatas=[legacy])
+
+    results = memory.search("legacy chamisul", "chamisul", k=1, as_of=datetime(2006, 1, 1))
+    assert [r["id"] for r in results] == [note.id]
+    assert "created_at_ts" in coll.get(ids=[note.id])["metadatas"][0]
+
+
+def test_weighted_triplets_as_of(memory):
+    early = KGTriplet("Saero", "LAUNCHED", "Zero Sugar", "saero", created_at=datetime(2022, 9, 1))
+    late = KGTriplet("Saero", "EXPANDED_TO", "Zero Sugar Export", "saero", created_at=datetime(2025, 1, 1))
+    memory.add_triplet(early)
+    memory.add_triplet(late)
+
+    results = memory.get_weighted_triplets("Saero Zero Sugar", "saero", k=5, as_of=datetime(2023, 1, 1))
+    assert [r["id"] for r in results] == [early.id]
+
+
+def test_search_finds_recent_note_beyond_similarity_prefix(memory):
+    now = datetime(2024, 6, 1)
+    for i in range(20):
+        _add(memory, f"chamisul fresh soju bottle {i}", now - timedelta(days=3000 + i))
+    recent = _add(memory, "fresh bottle design", now - timedelta(days=1))
+
+    ranked = memory.vector_store.search_notes("saero", "chamisul fresh soju bottle", k=21)
+    assert [r["id"] for r in ranked].index(recent.id) >= 6  # outside the old k * 2 over-fetch
+
+    results = memory.search("chamisul fresh soju bottle", "saero", k=3, now=now)
+    assert results[0]["id"] == recent.id
+
+    brute = sorted(
+        ranked,
+        key=lambda r: compute_combined_score(
+            r["similarity"], datetime.fromisoformat(r["metadata"]["created_at"]), now=now,
+        ),
+        reverse=True,
+    )
+    assert [r["id"] for r in results] == [r["id"] for r in brute[:3]]
+
+
+def test_recency_index_streams_by_weight():
+    now = datetime(2024, 1, 1)
+    index = RecencyIndex.from_rows(
+        ["old_core", "mid", "new", "undated", "future"],
+        [
+            {"created_at": (now - timedelta(days=400)).isoformat(), "significance": 1.0},
+            {"created_at": (now - timedelta(days=30)).isoformat(), "significance": 0.5},
+            {"created_at": (now - timedelta(days=2)).isoformat(), "significance": 0.0},
+            {},
+            {"created_at": (now + timedelta(days=5)).isoformat(), "significance": 0.5},
+        ],
+    )
+    streamed = list(index.stream(to_epoch(now)))
+    weights = [w for _, w in streamed]
+    assert weights == sorted(weights, reverse=True)
+    assert {doc_id for doc_id, _ in streamed[:2]} == {"undated", "future"}
+    assert [doc_id for doc_id, _ in streamed[2:]] == ["new", "mid", "old_core"]
+
+    as_of = [doc_id for doc_id, _ in index.stream(to_epoch(now), as_of_ts=to_epoch(now - timedelta(days=10)))]
+    assert as_of == ["mid", "old_core"]
+
+
+def test_search_many_merges_brand_tagged_results(memory):
+    now = datetime(2024, 6, 1)
+    _add(memory, "zero sugar soju for the MZ generation", now - timedelta(days=20), brand="saero")
+    _add(memory, "bamboo charcoal filtered soju", now - timedelta(days=20), brand="chamisul")
+    _add(memory, "alkaline water soft soju", now - timedelta(days=20), brand="chumchurum")
+    brands = ["chamisul", "chumchurum", "saero"]
+    queries = ["zero sugar soju", "bamboo charcoal soju"]
+
+    merged = memory.search_many(queries, brands, k=3, now=now)
+    assert [r["brand"] for r in merged[0]][0] == "saero"
+    assert [r["brand"] for r in merged[1]][0] == "chamisul"
+
+    for query, results in zip(queries, merged):
+        expected = sorted(
+            (r["combined_score"] for b in brands for r in memory.search(query, b, k=3, now=now)),
+            reverse=True,
+        )[:3]
+        assert [round(r["combined_score"], 9) for r in results] == [round(x, 9) for x in expected]
+
+    calls = []
+    real_query = memory.vector_store.query_many
+
+    def counting_query(collection, batch, **kwargs):
+        calls.append((collection, len(batch)))
+        return real_query(collection, batch, **kwargs)
+
+    memory.vector_store.query_many = counting_query
+    memory.search_many(queries, brands, k=3, now=now)
+    assert sorted(calls)[:3] == [(f"{b}_notes", 2) for b in brands]  # both queries per call
+    del memory.vector_store.query_many
+
+    raw = memory.vector_store.search_many(queries, brands, k=2)
+    assert raw[0][0]["brand"] == "saero" and len(raw[0]) == 2
+    assert raw[0][0]["similarity"] >= raw[0][1]["similarity"]
+
+
+def test_graph_neighbors_many_skips_brands_without_entity(memory):
+    memory.add_triplet(KGTriplet("Saero", "HAS_CLAIM", "Zero Sugar", "saero"))
+    found = memory.graph_store.get_neighbors_many(["chamisul", "saero"], "Zero Sugar")
+    assert list(found) == ["saero"]
+    assert found["saero"][0].subject == "Saero"
+
+
+def test_recency_index_sees_writes_from_other_instances(memory, tmp_path):
+    from src.memory.memory_system import BrandMemorySystem
+    from src.memory.vector_store import BrandVectorStore
+
+    from tests.conftest import HashEmbedding
+
+    now = datetime(2024, 6, 1)
+    for i in range(6):
+        _add(memory, f"chamisul fresh soju bottle {i}", now - timedelta(days=3000 + i))
+    assert len(memory.search("chamisul fresh soju bottle", "saero", k=3, now=now)) == 3  # index loaded
+
+    other = BrandMemorySystem(vector_store=BrandVectorStore(
+        persist_dir=str(tmp_path / "chroma"), embedding_function=HashEmbedding(),
+    ))
+    recent = _add(other, "fresh bottle design", now - timedelta(days=1))
+    assert memory.search("chamisul fresh soju bottle", "saero", k=3, now=now)[0]["id"] == recent.id
+
+    # A row written straight through Chroma (e.g. by another process) triggers a reload.
+    raw = MemoryNote(content="fresh bottle relaunch", brand_namespace="saero", category="product", created_at=now)
+    coll = memory.vector_store._get_collection("saero_notes")
+    coll.add(ids=[raw.id], documents=[raw.content], metadatas=[{"created_at": now.isoformat(), "category": "product"}])
+    assert raw.id in memory.vector_store.recency_index("saero_notes")
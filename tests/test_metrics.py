@@ -0,0 +1,53 @@
+"""Tests for request metrics, stage timers and the /metrics endpoint."""
+
+from fastapi.testclient import TestClient
+
+from src.api.server import app
+from src.metrics import REQUEST_LATENCY, RESPONSE_SIZE, STAGE_LATENCY, reset_metrics, stage
+
+client = TestClient(app)
+
+
+def test_stage_timer_records_duration():
+    reset_metrics()
+    with stage("unit.test"):
+        pass
+    counts, total, count = STAGE_LATENCY.snapshot("unit.test")
+    assert count == 1
+    assert sum(counts) == 1
+    assert total >= 0
+
+
+def test_requests_are_labelled_by_route_template():
+    reset_metrics()
+    resp = client.get("/api/kg/snapshot", params={"date": "2000-01-01", "include_fol": "true"})
+    assert resp.status_code == 200
+
+    _, _, count = REQUEST_LATENCY.snapshot("GET", "/api/kg/snapshot", "200")
+    assert count == 1
+    _, size, _ = RESPONSE_SIZE.snapshot("GET", "/api/kg/snapshot")
+    assert size == len(resp.content)
+    for name in ("kg_snapshot.graph", "kg_snapshot.weights", "kg_snapshot.fol", "kg_snapshot.encode"):
+        assert STAGE_LATENCY.snapshot(name) is not None
+
+
+def test_metrics_endpoint_prometheus_format():
+    reset_metrics()
+    client.get("/api/timeline/range")
+    body = client.get("/metrics").text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/timeline/range",status="200",le="+Inf"} 1' in body
+    assert 'http_response_size_bytes_count{method="GET",route="/api/timeline/range"} 1' in body
+
+
+def test_profiler_is_opt_in(monkeypatch):
+    assert client.get("/debug/profile", params={"seconds": 0.01}).status_code == 404
+    for off in ("0", "false"):
+        monkeypatch.setenv("ENABLE_PROFILER", off)
+        assert client.get("/debug/profile", params={"seconds": 0.01}).status_code == 404
+
+    monkeypatch.setenv("ENABLE_PROFILER", "1")
+    resp = client.get("/debug/profile", params={"seconds": 0.05, "interval": 0.01})
+    assert resp.status_code == 200
+    line = resp.text.strip().splitlines()[0]
+    assert line.rsplit(" ", 1)[1].isdigit()
@@ -0,0 +1,106 @@
+"""Tests for the get_memory_context semantic cache."""
+
+from datetime import datetime, timedelta
+
+from src.memory.semantic_cache import SemanticCache
+
+NOW = datetime(2025, 1, 1, 12, 0)
+
+
+def test_hit_requires_similarity_brand_and_bucket():
+    cache = SemanticCache(threshold=0.95, bucket_seconds=3600)
+    cache.store("chamisul", [1.0, 0.0, 0.0], "ctx", now=NOW)
+
+    assert cache.lookup("chamisul", [0.99, 0.05, 0.0], now=NOW) == "ctx"
+    assert cache.lookup("chamisul", [0.6, 0.8, 0.0], now=NOW) is None
+    assert cache.lookup("saero", [1.0, 0.0, 0.0], now=NOW) is None
+    assert cache.lookup("chamisul", [1.0, 0.0, 0.0], now=NOW + timedelta(hours=1)) is None
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = SemanticCache(max_entries=2)
+    cache.store("chamisul", [1.0, 0.0, 0.0], "a", now=NOW)
+    cache.store("chamisul", [0.0, 1.0, 0.0], "b", now=NOW)
+    assert cache.lookup("chamisul", [1.0, 0.0, 0.0], now=NOW) == "a"
+    cache.store("chamisul", [0.0, 0.0, 1.0], "c", now=NOW)
+
+    assert len(cache) == 2
+    assert cache.lookup("chamisul", [0.0, 1.0, 0.0], now=NOW) is None
+    assert cache.lookup("chamisul", [1.0, 0.0, 0.0], now=NOW) == "a"
+
+
+def test_invalidate_drops_brand_and_rejects_in_flight_store():
+    cache = SemanticCache()
+    cache.store("chamisul", [1.0, 0.0], "old", now=NOW)
+    cache.store("saero", [1.0, 0.0], "other", now=NOW)
+    generation = cache.generation("chamisul")
+
+    assert cache.invalidate("chamisul") == 1
+    cache.store("chamisul", [1.0, 0.0], "stale", now=NOW, generation=generation)
+
+    assert cache.lookup("chamisul", [1.0, 0.0], now=NOW) is None
+    assert cache.lookup("saero", [1.0, 0.0], now=NOW) == "other"
+
+
+def test_get_memory_context_reuses_until_save(memory, monkeypatch):
+    import src.agents.root_tools as root_tools
+
+    monkeypatch.setattr(root_tools, "_memory", memory)
+    monkeypatch.setattr(root_tools, "_context_cache", SemanticCache(threshold=0.95))
+    builds = []
+    build = memory.build_context_injection
+
+    def counting_build(*args, **kwargs):
+        builds.append(args)
+        return build(*args, **kwargs)
+
+    monkeypatch.setattr(memory, "build_context_injection", counting_build)
+
+    root_tools.save_to_memory("chamisul bamboo charcoal filtration", "chamisul")
+    first = root_tools.get_memory_context("bamboo charcoal filtration", "chamisul")
+    again = root_tools.get_memory_context("Bamboo charcoal  filtration", "chamisul")
+    assert again == first and len(builds) == 1
+
+    root_tools.save_to_memory("chamisul fresh label redesign", "chamisul")
+    root_tools.get_memory_context("bamboo charcoal filtration", "chamisul")
+    assert len(builds) == 2
+
+
+def test_get_memory_context_sees_writes_from_other_instances_and_moves(memory, monkeypatch):
+    import src.agents.root_tools as root_tools
+    from src.memory.memory_system import BrandMemorySystem
+    from src.memory.vector_store import BrandVectorStore, notes_collection
+
+    monkeypatch.setattr(root_tools, "_memory", memory)
+    monkeypatch.setattr(root_tools, "_context_cache", SemanticCache(threshold=0.95))
+    builds = []
+    build = memory.build_context_injection
+
+    def counting_build(*args, **kwargs):
+        builds.append(args)
+        return build(*args, **kwargs)
+
+    monkeypatch.setattr(memory, "build_context_injection", counting_build)
+
+    # e.g. the brand_guard agent's own memory instance on the same store
+    other = BrandMemorySystem(
+        vector_store=BrandVectorStore(
+            persist_dir=memory.vector_store.persist_dir,
+            embedding_function=memory.vector_store._embedding_function,
+        )
+    )
+    note = other.add_note("chamisul bamboo charcoal filtration", "chamisul", "product")
+    root_tools.get_memory_context("bamboo charcoal filtration", "chamisul")
+    root_tools.get_memory_context("bamboo charcoal filtration", "chamisul")
+    assert len(builds) == 1
+
+    other.add_note("chamisul bamboo charcoal taste notes", "chamisul", "product")
+    root_tools.get_memory_context("bamboo charcoal filtration", "chamisul")
+    assert len(builds) == 2
+
+    # a cold-tier sweep or consolidation archive moves rows out of the hot tier
+    hot = notes_collection("chamisul")
+    other.vector_store.move_rows(hot, notes_collection("chamisul", cold=True), [note.id])
+    root_tools.get_memory_context("bamboo charcoal filtration", "chamisul")
+    assert len(builds) == 3
@@ -0,0 +1,235 @@
+"""Tests for multi-user session management and persistence."""
+
+import asyncio
+from types import SimpleNamespace
+
+from src.memory.session_manager import SessionManager, SqliteSessionStore
+from src.memory.tokens import estimate_tokens
+
+
+class FakeLLM:
+    """Records calls and prompt tokens; echoes a fixed summary block."""
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.prompts = []
+
+    async def __call__(self, prompt, **kwargs):
+        self.calls += 1
+        self.prompt_tokens += estimate_tokens(prompt)
+        self.prompts.append(prompt)
+        return f"SUMMARY: summary {self.calls}\nDECISIONS: d{self.calls}\nTOPICS: t{self.calls}"
+
+
+def test_sessions_are_isolated_per_user():
+    manager = SessionManager()
+    manager.start_session("chamisul", user_id="alice")
+    manager.start_session("saero", user_id="bob")
+    manager.add_message("user", "hi from alice", user_id="alice")
+
+    assert manager.get_active_brand("alice") == "chamisul"
+    assert manager.get_active_brand("bob") == "saero"
+    assert [m["content"] for m in manager.get_messages("alice")] == ["hi from alice"]
+    assert manager.get_messages("bob") == []
+
+
+def test_message_window_is_bounded():
+    manager = SessionManager(window=5)
+    manager.start_session("saero")
+    for i in range(12):
+        manager.add_message("user", f"m{i}")
+    assert [m["content"] for m in manager.get_messages()] == [f"m{i}" for i in range(7, 12)]
+
+
+def test_default_user_api_still_works():
+    manager = SessionManager()
+    assert manager.active_brand is None
+    manager.active_brand = "chumchurum"
+    assert manager.active_brand == "chumchurum"
+    assert manager.get_current_session().brand_namespace == "chumchurum"
+    assert manager.end_session() is not None
+    assert manager.active_brand is None
+
+
+def test_recent_session_context_newest_first():
+    manager = SessionManager()
+    for i in range(5):
+        sid = manager.start_session("saero", user_id="u")
+        manager.get_current_session("u").summary = f"summary {i}"
+        assert sid == manager.get_current_session("u").session_id
+    context = manager.get_session_context("u")
+    assert [line.split(": ", 1)[1] for line in context.splitlines()[1:]] == ["summary 4", "summary 3", "summary 2"]
+
+
+def test_sqlite_store_round_trip(tmp_path):
+    path = tmp_path / "sessions.db"
+    store = SqliteSessionStore(path)
+    manager = SessionManager(store=store)
+    sid = manager.start_session("chamisul", user_id="alice")
+    manager.add_message("user", "remember the bamboo charcoal angle", user_id="alice")
+    manager.get_current_session("alice").summary = "Bamboo charcoal campaign"
+    manager.flush()
+    store.close()
+
+    reopened = SessionManager(store=SqliteSessionStore(path))
+    assert "Bamboo charcoal campaign" in reopened.get_session_context("alice")
+    assert reopened.get_messages("alice", session_id=sid)[0]["content"] == "remember the bamboo charcoal angle"
+    assert reopened.get_session_context("bob") == ""
+
+
+def test_new_sessions_and_brand_changes_survive_a_restart_without_flush(tmp_path):
+    path = tmp_path / "sessions.db"
+    manager = SessionManager(store=SqliteSessionStore(path))
+    first = manager.start_session("chamisul", user_id="alice")
+    second = manager.start_session(None, user_id="alice", session_id="adk-2")
+    manager.set_active_brand("saero", user_id="alice", session_id=second)
+    # no flush / end_session: the process just dies
+
+    reopened = SessionManager(store=SqliteSessionStore(path))
+    assert list(reopened._recent_ids("alice")) == [first, second]
+    assert reopened.get_active_brand("alice", session_id=second) == "saero"
+
+
+def test_lru_eviction_persists_to_store(tmp_path):
+    manager = SessionManager(store=SqliteSessionStore(tmp_path / "s.db"), max_cached=2)
+    first = manager.start_session("saero", user_id="a")
+    manager.start_session("saero", user_id="b")
+    manager.start_session("saero", user_id="c")
+    assert first not in manager._cache
+    assert manager.get_active_brand("a") == "saero"  # reloaded from sqlite
+
+
+def test_root_tools_keep_active_brand_per_conversation(memory, monkeypatch):
+    import src.agents.root_tools as root_tools
+
+    monkeypatch.setattr(root_tools, "_memory", memory)
+    monkeypatch.setattr(root_tools, "_session", SessionManager())
+
+    def ctx(user_id, session_id):
+        session = SimpleNamespace(user_id=user_id, id=session_id)
+        return SimpleNamespace(_invocation_context=SimpleNamespace(session=session))
+
+    root_tools.set_active_brand("saero", tool_context=ctx("alice", "s1"))
+    root_tools.set_active_brand("chamisul", tool_context=ctx("bob", "s2"))
+    manager = root_tools._get_session()
+    assert manager.get_active_brand("alice", "s1") == "saero"
+    assert manager.get_active_brand("bob", "s2") == "chamisul"
+
+
+def test_incremental_summary_folds_only_new_messages():
+    llm = FakeLLM()
+    manager = SessionManager(generate=llm)
+    manager.start_session("saero")
+    manager.add_message("user", "first message")
+    manager.add_message("assistant", "second message")
+    asyncio.run(manager.summarize_session())
+    manager.add_message("user", "third message")
+    session = asyncio.run(manager.summarize_session())
+
+    assert llm.calls == 2
+    assert "first message" not in llm.prompts[1]
+    assert "third message" in llm.prompts[1]
+    assert "SUMMARY: summary 1" in llm.prompts[1]  # prior state carried forward
+    assert session.summary == "summary 2"
+    assert session.key_decisions == ["d2"]
+
+    asyncio.run(manager.summarize_session())
+    assert llm.calls == 2  # nothing pending → no LLM call
+
+
+def test_maybe_summarize_saves_calls_and_tokens_over_per_turn_summaries():
+    turns = [f"turn {i}: " + "soju campaign detail " * 20 for i in range(60)]
+
+    legacy = FakeLLM()
+    per_turn = SessionManager(generate=legacy)
+    per_turn.start_session("chamisul")
+    for text in turns:
+        per_turn.add_message("user", text)
+        recent = per_turn.get_messages()[-20:]
+        asyncio.run(legacy("\n".join(f"[{m['role']}]: {m['content']}" for m in recent)))
+
+    incremental = FakeLLM()
+    manager = SessionManager(generate=incremental, summary_token_threshold=1000)
+    manager.start_session("chamisul")
+    for text in turns:
+        manager.add_message("user", text)
+        asyncio.run(manager.maybe_summarize())
+
+    assert 0 < incremental.calls < legacy.calls / 5
+    assert incremental.prompt_tokens < legacy.prompt_tokens / 5
+    for prompt in incremental.prompts:  # every turn folded exactly once
+        assert sum(prompt.count(f"turn {i}:") for i in range(60)) <= 10
+    assert manager.get_current_session().summary == f"summary {incremental.calls}"
+
+
+def test_pending_counters_survive_store_round_trip(tmp_path):
+    store = SqliteSessionStore(tmp_path / "sessions.db")
+    manager = SessionManager(store=store)
+    session_id = manager.start_session("saero", user_id="alice")
+    manager.add_message("user", "unfolded", user_id="alice")
+    manager.flush()
+
+    restored = SessionManager(store=SqliteSessionStore(tmp_path / "sessions.db"))
+    llm = FakeLLM()
+    restored._generate = llm
+    asyncio.run(restored.summarize_session(user_id="alice", session_id=session_id))
+    assert llm.calls == 1 and "unfolded" in llm.prompts[0]
+
+
+def test_summaries_never_resend_messages_that_left_the_window():
+    llm = FakeLLM()
+    manager = SessionManager(window=5, generate=llm)
+    manager.start_session("saero")
+    for i in range(8):
+        manager.add_message("user", f"m{i}")
+
+    asyncio.run(manager.summarize_session())
+    assert [line for line in llm.prompts[0].splitlines() if line.startswith("[user]")] == [
+        f"[user]: m{i}" for i in range(3, 8)
+    ]
+    asyncio.run(manager.summarize_session())
+    assert llm.calls == 1  # nothing left pending
+
+
+def test_root_agent_callbacks_feed_the_rolling_summary(monkeypatch):
+    import src.agents.root_tools as root_tools
+
+    llm = FakeLLM()
+    monkeypatch.setattr(root_tools, "_session", SessionManager(summary_token_threshold=20, generate=llm))
+    session = SimpleNamespace(user_id="alice", id="s1")
+    ctx = SimpleNamespace(
+        _invocation_context=SimpleNamespace(session=session),
+        user_content=SimpleNamespace(parts=[SimpleNamespace(text="what did saero launch in 2022?")]),
+    )
+    reply = SimpleNamespace(content=SimpleNamespace(parts=[SimpleNamespace(text="Zero sugar soju " * 10)]), partial=False)
+
+    asyncio.run(root_tools.record_user_message(ctx))
+    assert root_tools._get_session().get_messages("alice", "s1")[0]["role"] == "user"
+    assert llm.calls == 0
+    asyncio.run(root_tools.record_model_response(ctx, reply))
+    assert llm.calls == 1
+    assert root_tools._get_session().get_current_session("alice").summary == "summary 1"
+
+
+def test_concurrent_folds_never_summarize_a_message_twice():
+    class SlowLLM(FakeLLM):
+        async def __call__(self, prompt, **kwargs):
+            await asyncio.sleep(0.01)
+            return await super().__call__(prompt, **kwargs)
+
+    llm = SlowLLM()
+    manager = SessionManager(summary_token_threshold=1, generate=llm)
+    manager.start_session("saero", user_id="u", session_id="s")
+
+    async def conversation():
+        await asyncio.gather(
+            manager.record_message("user", "launch zero sugar in busan", user_id="u", session_id="s"),
+            manager.record_message("assistant", "noted: busan launch", user_id="u", session_id="s"),
+        )
+        await manager.summarize_session("u", "s")
+
+    asyncio.run(conversation())
+    folded = [line for prompt in llm.prompts for line in prompt.splitlines() if line.startswith("[")]
+    assert sorted(folded) == ["[assistant]: noted: busan launch", "[user]: launch zero sugar in busan"]
+    assert manager._state("s").pending == 0
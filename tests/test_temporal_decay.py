@@ -6,7 +6,10 @@ from datetime import datetime, timedelta
 from src.memory.temporal_decay import (
     compute_temporal_weight,
     compute_combined_score,
+    effective_alpha,
     half_life_days,
+    score_batch,
+    to_epoch,
 )
 
 
@@ -79,3 +82,27 @@ def test_custom_alpha():
     assert abs(hl - math.log(2) / 0.1) < 0.01
     # ~6.93 days
     assert 6 < hl < 7
+
+
+def test_effective_alpha_mapping():
+    assert effective_alpha(0.0, alpha=0.02) == 0.04
+    assert effective_alpha(0.5, alpha=0.02) == 0.02
+    assert abs(effective_alpha(1.0, alpha=0.02) - 0.002) < 1e-12
+
+
+def test_score_batch_matches_per_item():
+    now = datetime(2026, 1, 1)
+    created = [now - timedelta(days=d) for d in (0, 3.5, 40, 400)] + [now + timedelta(days=2)]
+    significance = [0.5, 0.0, 1.0, 0.7, 0.5]
+    similarity = [0.9, 0.4, 0.75, 0.2, 0.5]
+
+    combined, weights = score_batch(
+        similarity,
+        [to_epoch(c) for c in created],
+        [effective_alpha(s) for s in significance],
+        to_epoch(now),
+    )
+    for i in range(len(created)):
+        expected = compute_combined_score(similarity[i], created[i], now=now, significance=significance[i])
+        assert abs(combined[i] - expected) < 1e-9
+        assert abs(weights[i] - compute_temporal_weight(created[i], now=now, significance=significance[i])) < 1e-9
@@ -0,0 +1,64 @@
+"""Tests for hot/cold note tiering."""
+
+from datetime import datetime, timedelta
+
+from src.memory.retrieval import RecencyIndex
+from src.memory.schema import MemoryNote
+from src.memory.tiering import TieringPolicy
+from src.memory.vector_store import notes_collection, to_epoch
+
+
+def _add(memory, content, created_at, significance=0.5, brand="chamisul"):
+    note = MemoryNote(
+        content=content, brand_namespace=brand, category="product",
+        created_at=created_at, significance=significance,
+    )
+    memory.vector_store.add_note(note)
+    return note
+
+
+def test_sweep_demotes_decayed_notes_but_keeps_foundational(memory):
+    now = datetime(2025, 1, 1)
+    stale = _add(memory, "chamisul fresh 2019 summer promo", now - timedelta(days=800))
+    core = _add(memory, "chamisul bamboo charcoal filtration", now - timedelta(days=3000), significance=1.0)
+    fresh = _add(memory, "chamisul fresh new label", now - timedelta(days=10))
+
+    moved = TieringPolicy(weight_threshold=0.01).sweep(memory.vector_store, "chamisul", now=now)
+
+    store = memory.vector_store
+    assert moved == [stale.id]
+    assert store.count(notes_collection("chamisul")) == 2
+    cold = store.get_rows(notes_collection("chamisul", cold=True), [stale.id])
+    assert cold[0]["metadata"]["tiered_at"] == now.isoformat()
+    assert {core.id, fresh.id} <= set(store.recency_index(notes_collection("chamisul")).ids())
+
+    # Present-time search reads the hot tier only ...
+    present = memory.search("chamisul summer promo", "chamisul", k=3, now=now)
+    assert stale.id not in {r["id"] for r in present}
+    # ... while an as-of query also reaches the cold tier.
+    then = memory.search("chamisul summer promo", "chamisul", k=3, as_of=stale.created_at + timedelta(days=1))
+    assert then[0]["id"] == stale.id
+
+    assert TieringPolicy.restore(store, "chamisul", [stale.id]) == 1
+    assert store.count(notes_collection("chamisul", cold=True)) == 0
+    assert stale.id in {r["id"] for r in memory.search("chamisul summer promo", "chamisul", k=3, now=now)}
+
+    # A restored note is pinned hot: no tiered_at, and the next sweep keeps it.
+    restored = store.get_rows(notes_collection("chamisul"), [stale.id])[0]["metadata"]
+    assert "tiered_at" not in restored and "restored_at" in restored
+    assert TieringPolicy(weight_threshold=0.01).sweep(store, "chamisul", now=now) == []
+    assert stale.id in store.recency_index(notes_collection("chamisul"))
+
+
+def test_sweep_is_noop_when_nothing_decayed(memory):
+    now = datetime(2025, 1, 1)
+    _add(memory, "saero zero sugar", now - timedelta(days=5), brand="saero")
+    assert TieringPolicy().sweep(memory.vector_store, "saero", now=now) == []
+
+
+def test_decayed_with_non_positive_threshold_is_empty():
+    now = datetime(2025, 1, 1)
+    index = RecencyIndex.from_rows(["old"], [{"created_at": (now - timedelta(days=5000)).isoformat()}])
+    assert index.decayed(to_epoch(now), 0.0) == []
+    assert index.decayed(to_epoch(now), -1.0) == []
+    assert index.decayed(to_epoch(now), 0.01) == ["old"]
@@ -0,0 +1,163 @@
+"""Tests for the precomputed timeline API responses."""
+
+import gzip
+
+import orjson
+from fastapi.testclient import TestClient
+
+from src.api.server import app
+from src.timeline.registry import get_all_events, get_model_gallery
+from src.timeline.kg_snapshot import _serialize_event
+from src.timeline.model_gallery import serialize_model
+
+client = TestClient(app)
+ALL_EVENTS = get_all_events()
+
+
+def test_events_match_serialized_events():
+    resp = client.get("/api/timeline/events", params={"industry": "soju", "brand": "chamisul"})
+    assert resp.status_code == 200
+    expected = [
+        _serialize_event(e) for e in ALL_EVENTS
+        if e.industry == "soju" and e.brand in ("chamisul", "multi")
+    ]
+    assert resp.json() == expected
+
+
+def test_models_filter_by_industry():
+    resp = client.get("/api/timeline/models", params={"industry": "whisky"})
+    expected = [serialize_model(m) for m in get_model_gallery() if m.product_type == "scotch_whisky"]
+    assert resp.json() == expected
+
+
+def test_unknown_brand_returns_empty_models():
+    resp = client.get("/api/timeline/models", params={"brand": "no_such_brand"})
+    assert resp.status_code == 200
+    assert resp.json() == []
+
+
+def test_range_reports_all_events():
+    data = client.get("/api/timeline/range").json()
+    assert data["total_events"] == len(ALL_EVENTS)
+
+
+def test_range_unknown_industry_is_404():
+    resp = client.get("/api/timeline/range", params={"industry": "no_such_industry"})
+    assert resp.status_code == 404
+
+
+def test_gzip_body_is_precompressed():
+    resp = client.get(
+        "/api/timeline/events",
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    # TestClient transparently decodes; the payload must round-trip
+    assert len(resp.json()) == len(ALL_EVENTS)
+
+
+def test_identity_when_no_encoding_accepted():
+    resp = client.get("/api/timeline/range", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in resp.headers
+    assert orjson.loads(resp.content)["total_events"] == len(ALL_EVENTS)
+
+
+def test_etag_not_modified():
+    first = client.get("/api/timeline/events", params={"industry": "whisky"})
+    etag = first.headers["etag"]
+    assert etag.startswith('"')
+
+    second = client.get(
+        "/api/timeline/events",
+        params={"industry": "whisky"},
+        headers={"If-None-Match": etag},
+    )
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+
+def test_etag_differs_per_variant():
+    soju = client.get("/api/timeline/events", params={"industry": "soju"}).headers["etag"]
+    whisky = client.get("/api/timeline/events", params={"industry": "whisky"}).headers["etag"]
+    assert soju != whisky
+
+
+def test_gzip_bytes_decode_to_identity():
+    from src.api.routes.timeline import _events_body
+
+    body = _events_body(None, None)
+    assert gzip.decompress(body.gzip) == body.identity
+
+
+def test_shared_store_serves_mapped_bodies(tmp_path):
+    from src.api.precomputed import PrecomputedCache
+    from src.api.routes.timeline import _events_body
+    from src.api.shared_store import SharedBodyStore, write_store
+
+    body = _events_body("soju", None)
+    path = write_store(tmp_path / "bodies.bin", [(("events", "soju", "all"), body)])
+
+    store = SharedBodyStore(path)
+    cache = PrecomputedCache()
+    cache.attach(store)
+
+    def build():
+        raise AssertionError("body should come from the store")
+
+    mapped = cache.get(("events", "soju", "all"), build)
+    assert isinstance(mapped.identity, memoryview)
+    assert bytes(mapped.identity) == body.identity
+    assert bytes(mapped.gzip) == body.gzip
+    assert mapped.etag == body.etag
+    assert ("events", "whisky", "all") not in store
+
+
+def test_shared_store_tables_round_trip(tmp_path):
+    from src.api.shared_store import SharedBodyStore, write_store
+
+    tables = {"t": {
+        "ids": ("u32", [3, 1, 2]),
+        "ts": ("f64", [0.5, 1.5]),
+        "name": ("str", ["참이슬", "", "saero"]),
+        "blob": ("bytes", [b"\x00\x01", b"z"]),
+    }}
+    store = SharedBodyStore(write_store(tmp_path / "tables.bin", [], tables, meta={"v": 1}))
+    t = store.table("t")
+
+    assert isinstance(t["ids"], memoryview) and list(t["ids"]) == [3, 1, 2]
+    assert list(t["ts"]) == [0.5, 1.5]
+    assert list(t["name"]) == ["참이슬", "", "saero"]
+    assert [bytes(b) for b in t["blob"]] == [b"\x00\x01", b"z"]
+    assert store.meta == {"v": 1} and not store.has_table("missing")
+
+
+def test_routes_use_attached_store(tmp_path):
+    from src.api.routes import timeline
+    from src.api.shared_store import SharedBodyStore, write_store
+
+    timeline.warm_timeline_cache()
+    path = write_store(tmp_path / "bodies.bin", timeline._cache.items())
+    expected = client.get("/api/timeline/events", params={"industry": "whisky"}).json()
+
+    timeline.attach_shared_store(SharedBodyStore(path))
+    try:
+        resp = client.get("/api/timeline/events", params={"industry": "whisky"})
+        assert resp.json() == expected
+    finally:
+        timeline.attach_shared_store(None)
+
+
+def test_startup_warming_is_opt_in(monkeypatch):
+    import src.api.server as server
+    from src.api.routes import timeline
+
+    warmed = []
+    monkeypatch.setattr(timeline, "warm_timeline_cache", lambda: warmed.append(1))
+    monkeypatch.delenv("TIMELINE_SHARED_STORE", raising=False)
+    with TestClient(server.app):
+        assert warmed == []
+    monkeypatch.setattr(server, "TIMELINE_WARM_CACHE", True)
+    with TestClient(server.app):
+        assert warmed == [1]
@@ -0,0 +1,119 @@
+"""Tests for lazy timeline dataset loading and the pickle snapshot."""
+
+import subprocess
+import sys
+
+from src.timeline import registry
+
+
+def test_api_import_does_not_load_datasets():
+    code = (
+        "import sys, src.api.server\n"
+        "from src.timeline import registry\n"
+        "heavy = [m for m in ('chromadb', 'networkx', 'src.timeline.event_data',"
+        " 'src.timeline.fol_evidence') if m in sys.modules]\n"
+        "assert not heavy, heavy\n"
+        "assert registry.loaded_datasets() == [], registry.loaded_datasets()\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_datasets_load_once():
+    events = registry.get_all_events()
+    assert registry.get_all_events() is events
+    assert {e.industry for e in events} == {"soju", "whisky"}
+    assert "events" in registry.loaded_datasets()
+
+
+def test_snapshot_round_trip(tmp_path, monkeypatch):
+    path = registry.build_snapshot(tmp_path / "timeline.pickle")
+    expected_events = [e.id for e in registry.get_all_events()]
+    expected_models = [m.id for m in registry.get_model_gallery()]
+
+    monkeypatch.setenv("TIMELINE_SNAPSHOT", str(path))
+    registry.reset()
+    try:
+        assert [e.id for e in registry.get_all_events()] == expected_events
+        assert [m.id for m in registry.get_model_gallery()] == expected_models
+        assert len(registry.get_fol_evidence()) > 0
+        assert registry._snapshot is not None
+    finally:
+        monkeypatch.delenv("TIMELINE_SNAPSHOT")
+        registry.reset()
+
+
+def test_invalid_snapshot_falls_back_to_source(tmp_path, monkeypatch):
+    bad = tmp_path / "bad.pickle"
+    bad.write_bytes(b"not a pickle")
+    monkeypatch.setenv("TIMELINE_SNAPSHOT", str(bad))
+    registry.reset()
+    try:
+        assert len(registry.get_all_events()) > 0
+    finally:
+        monkeypatch.delenv("TIMELINE_SNAPSHOT")
+        registry.reset()
+
+
+def test_model_index_matches_linear_scan():
+    models = registry.get_model_gallery()
+    index = registry.get_model_index()
+    assert index.models is models
+
+    for year in range(1955, 2030):
+        for brand in (None, "chamisul", "jw_black", "no_such_brand"):
+            expected = [
+                m for m in models
+                if m.start_year <= year <= m.end_year and (brand is None or m.brand == brand)
+            ]
+            assert index.query(year=year, brand=brand) == expected
+
+    whisky = [m for m in models if m.product_type == "scotch_whisky"]
+    assert index.query(industry="whisky") == whisky
+    assert index.query(industry="soju") == [m for m in models if m not in whisky]
+    assert index.query(brand="all", product_type="all") == models
+
+
+def test_fol_index_groups_evidence():
+    evidence = registry.get_fol_evidence()
+    index = registry.get_fol_index()
+    assert [c.evidence for c in index.chains] == evidence
+
+    event_ids = {e.id for e in registry.get_all_events()}
+    chains = index.for_events(event_ids, brand="chamisul")
+    assert [c.evidence for c in chains] == [
+        f for f in evidence
+        if f.event_id in event_ids and f.brand in ("chamisul", "multi")
+    ]
+    for chain in index.concluded("whisky"):
+        assert chain.industry == "whisky"
+        assert chain.conclusion.node_type == "fol_conclusion"
+
+
+def test_shared_store_serves_datasets_from_the_map(tmp_path):
+    from datetime import datetime
+
+    import orjson
+
+    from src.api.shared_store import SharedBodyStore, build_timeline_store
+    from src.timeline.kg_snapshot import build_kg_snapshot
+
+    path = build_timeline_store(tmp_path / "shared.bin")
+    target = datetime(2010, 5, 1)
+    expected_snapshot = orjson.dumps(build_kg_snapshot(target, include_fol=True))
+    yearly = registry.get_yearly_snapshots()
+    variants = [(None, None), ("soju", "chamisul"), ("whisky", "no_such_brand")]
+    expected_ranges = [orjson.dumps(yearly.range_payload(1950, 2026, 0.0003, i, b)) for i, b in variants]
+    expected_models = [m.id for m in registry.get_model_gallery()]
+
+    registry.reset()
+    registry.attach_shared_store(SharedBodyStore(path))
+    try:
+        assert registry.get_all_events() is registry.get_all_events()  # decoded once
+        assert [m.id for m in registry.get_model_gallery()] == expected_models
+        assert orjson.dumps(build_kg_snapshot(target, include_fol=True)) == expected_snapshot
+        mapped = registry.get_yearly_snapshots()
+        assert [
+            orjson.dumps(mapped.range_payload(1950, 2026, 0.0003, i, b)) for i, b in variants
+        ] == expected_ranges
+    finally:
+        registry.reset()